@@ -2,7 +2,29 @@
 
 __version__ = "0.1.0"
 
-from evomind.agent.controller import AgentController
-from evomind.agent.state import AgentState
-
 __all__ = ["AgentController", "AgentState"]
+
+# Exports are imported on first access (PEP 562) so that importing the
+# package, e.g. for __version__, does not load the whole agent stack.
+_LAZY_EXPORTS = {
+    "AgentController": "evomind.agent.controller",
+    "AgentState": "evomind.agent.state",
+}
+
+
+def __getattr__(name):
+    """Import lazily exported names on first access."""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    import importlib
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """List module attributes including lazy exports."""
+    return sorted(list(globals()) + __all__)
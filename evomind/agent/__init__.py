@@ -1,7 +1,30 @@
 """Agent module initialization."""
 
-from evomind.agent.controller import AgentController
-from evomind.agent.planner import ReActPlanner, ToTPlanner
-from evomind.agent.state import AgentState, StateTransition
-
 __all__ = ["AgentController", "ReActPlanner", "ToTPlanner", "AgentState", "StateTransition"]
+
+# Exports are imported on first access (PEP 562)
+_LAZY_EXPORTS = {
+    "AgentController": "evomind.agent.controller",
+    "ReActPlanner": "evomind.agent.planner",
+    "ToTPlanner": "evomind.agent.planner",
+    "AgentState": "evomind.agent.state",
+    "StateTransition": "evomind.agent.state",
+}
+
+
+def __getattr__(name):
+    """Import lazily exported names on first access."""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    import importlib
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """List module attributes including lazy exports."""
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,64 @@
+"""Numeric helpers for planner scoring.
+
+The kernels are plain Python over indexable sequences. When numba is
+installed they are compiled with ``njit`` and run over NumPy arrays;
+otherwise they run as-is over lists.
+"""
+
+from typing import Any, MutableSequence, Sequence
+
+try:
+    import numpy as np
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _weighted_sums(
+    features: Sequence[Sequence[float]],
+    weights: Sequence[float],
+    out: MutableSequence[float]
+) -> None:
+    """Store the weighted sum of each feature row in ``out``."""
+    for i in range(len(out)):
+        acc = 0.0
+        for j in range(len(weights)):
+            acc += features[i][j] * weights[j]
+        out[i] = acc
+
+
+def _argmax(values: Sequence[float]) -> int:
+    """Index of the first maximum value."""
+    best = 0
+    for i in range(1, len(values)):
+        if values[i] > values[best]:
+            best = i
+    return best
+
+
+_weighted_sums_kernel: Any = njit(cache=True)(_weighted_sums) if NUMBA_AVAILABLE else _weighted_sums
+argmax_f64: Any = njit(cache=True)(_argmax) if NUMBA_AVAILABLE else _argmax
+
+
+def as_vector(values: Sequence[float]) -> MutableSequence[float]:
+    """Convert values to the vector type used by the scoring kernels."""
+    if NUMBA_AVAILABLE:
+        vector: MutableSequence[float] = np.asarray(values, dtype=np.float64)
+        return vector
+    return [float(v) for v in values]
+
+
+def as_matrix(rows: Sequence[Sequence[float]]) -> Sequence[Sequence[float]]:
+    """Convert rows to the matrix type used by the scoring kernels."""
+    if NUMBA_AVAILABLE:
+        matrix: Sequence[Sequence[float]] = np.asarray(rows, dtype=np.float64)
+        return matrix
+    return [[float(v) for v in row] for row in rows]
+
+
+def score_candidates(features: Sequence[Sequence[float]], weights: Sequence[float]) -> MutableSequence[float]:
+    """Score each candidate row as the weighted sum of its features."""
+    out = as_vector([0.0] * len(features))
+    _weighted_sums_kernel(features, weights, out)
+    return out
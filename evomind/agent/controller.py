@@ -1,9 +1,13 @@
 """Main agent controller orchestrating the AI agent system."""
 
-from typing import Any, Dict, Optional
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from typing import Any, Dict, Hashable, Iterable, List, Mapping, Optional, Tuple
 import logging
+import os
 
-from evomind.agent.state import AgentState, StateType, ContextManager
+from evomind.agent.state import AgentState, StateType, ContextManager, FeedbackEntry
 from evomind.agent.planner import ReActPlanner, ToTPlanner, ReflexionMemory
 from evomind.registry.tool_registry import ToolRegistry
 from evomind.codegen.generator import CodeGenerator
@@ -13,6 +17,30 @@ from evomind.utils.validators import ResultValidator
 logger = logging.getLogger(__name__)
 
 
+# Maximum number of synthesized tool specs cached per controller
+_TOOL_SPEC_CACHE_SIZE = 256
+
+# Characters in an intent that cannot appear in a tool name
+_SLUG_TABLE = str.maketrans({" ": "_", "/": "_", "\\": "_", ":": "_"})
+
+
+def _freeze(value: Any) -> Hashable:
+    """Convert nested mappings and sequences into a hashable cache key."""
+    if isinstance(value, Mapping):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, set):
+        return frozenset(value)
+    hashable: Hashable = value
+    return hashable
+
+
+def _iso(timestamp_ns: int) -> str:
+    """Format a nanosecond epoch timestamp as an ISO 8601 UTC string."""
+    return datetime.fromtimestamp(timestamp_ns / 1e9, tz=timezone.utc).isoformat()
+
+
 class AgentController:
     """Main agent controller implementing the core decision loop.
     
@@ -24,7 +52,9 @@ class AgentController:
         tool_registry: Optional[ToolRegistry] = None,
         code_generator: Optional[CodeGenerator] = None,
         sandbox_executor: Optional[SandboxExecutor] = None,
-        confidence_threshold: float = 0.7
+        confidence_threshold: float = 0.7,
+        max_parallel_tools: Optional[int] = None,
+        aggregate_feedback: bool = False
     ):
         self.tool_registry = tool_registry or ToolRegistry()
         self.code_generator = code_generator or CodeGenerator()
@@ -37,86 +67,78 @@ class AgentController:
         self.context_manager = ContextManager()
         self.validator = ResultValidator()
 
-        self.state = AgentState()
+        # With aggregate_feedback only per-category feedback counts are kept
+        self.state = AgentState(aggregate_only=aggregate_feedback)
+
+        # Context is rebuilt into this dict for every plan; planners consume
+        # it synchronously within handle_request
+        self._ctx_scratch: Dict[str, Any] = {}
+
+        # Tool specs keyed by plan intent and io_spec
+        self._tool_spec_cache: Dict[Hashable, Dict[str, Any]] = {}
+
+        # Independent tool calls from a plan are dispatched through this pool.
+        # The default of one worker keeps execution sequential.
+        if max_parallel_tools is None:
+            max_parallel_tools = int(os.environ.get("TOOL_CONCURRENCY_LIMIT", "1"))
+        self._pool = ThreadPoolExecutor(max_workers=max(1, max_parallel_tools))
 
     def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Handle incoming request.
         
-        Main entry point implementing the agent decision loop.
+        Main entry point implementing the agent decision loop. Failed attempts
+        are retried in place, reusing the plan and tool unless reflexion
+        reports that the plan itself is invalid.
         """
-        logger.info(f"Handling request: {request.get('task', 'unknown')}")
-
-        # Prevent infinite recursion
-        if self.state.retry_count >= self.state.max_retries:
-            return self._graceful_degrade(self.state.feedback)
-
-        # Only reset on first attempt
-        if self.state.retry_count == 0:
-            self.state.reset()
+        logger.info("Handling request: %s", request.get("task", "unknown"))
 
+        self.state.reset()
         self.state.request = request
-        self.state.transition(StateType.PLAN)
 
         try:
-            # Build context
-            ctx = self.context_manager.build(request)
-
-            # Plan
-            plan = self._plan(ctx)
-            self.state.plan = plan
-
-            # Search for existing tools
-            candidate_tools = self.tool_registry.search(
-                plan.get("intent", ""),
-                plan.get("io_spec", {})
-            )
-
-            # Decide: use existing or create new tool
-            if self._match_found(candidate_tools, plan):
-                self.state.transition(StateType.SELECT_TOOL)
-                tool = self._rank_and_select(candidate_tools, plan)
-                self.state.selected_tool = tool.get("id")
-
-                # Execute existing tool
-                result = self._execute_tool(tool, plan)
-
-            else:
-                self.state.transition(StateType.DESIGN_TOOL)
-                # Create new tool
-                tool_spec = self._synthesize_tool_spec(plan)
-                tool = self._create_tool(tool_spec)
-
-                if tool.get("status") == "READY":
-                    self.state.selected_tool = tool.get("tool_id")
-                    result = self._execute_tool(tool, plan)
-                else:
-                    self.state.add_feedback("tool_creation_failed", tool)
-                    result = None
-
-            # Validate result
-            self.state.transition(StateType.VERIFY)
-            if result and self.validator.validate_result(result, plan.get("success_criteria", {})):
-                self.state.execution_result = result
-                self.state.transition(StateType.RESPOND)
-                return self._respond(result)
-            else:
+            # max_retries caps the number of attempts, including the first
+            retry_budget = self.state.max_retries - 1
+            attempt_start = Counter(self.state.feedback_counts)
+            plan, tool = self._prepare(request)
+
+            while True:
+                result = self._attempt(plan, tool)
+
+                # Validate result
+                self.state.transition(StateType.VERIFY)
+                if result and self.validator.validate_result(result, plan.get("success_criteria", {})):
+                    self.state.execution_result = result
+                    self.state.transition(StateType.RESPOND)
+                    return self._respond(result)
+
                 self.state.add_feedback("bad_result", {"result": result})
 
                 # Handle failures with reflexion
-                if self.reflexion.should_reflect(self.state.feedback):
-                    self.state.transition(StateType.LEARN)
-                    self._learn_from_feedback()
+                if not self.reflexion.should_reflect(self.state):
+                    break
+
+                self.state.transition(StateType.LEARN)
+                self._learn_from_feedback()
+
+                if retry_budget <= 0:
+                    break
 
-                    if self.state.can_retry():
-                        self.state.increment_retry()
-                        logger.info(f"Retrying request (attempt {self.state.retry_count})")
-                        return self.handle_request(request)
+                retry_budget -= 1
+                self.state.increment_retry()
+                logger.info("Retrying request (attempt %d)", self.state.retry_count)
+
+                # Context is rebuilt and the request re-planned only when
+                # reflexion says so; otherwise the same tool runs again
+                attempt_counts = self.state.feedback_counts - attempt_start
+                attempt_start = Counter(self.state.feedback_counts)
+                if self.reflexion.should_replan(attempt_counts):
+                    plan, tool = self._prepare(request)
 
             # Graceful degradation
             return self._graceful_degrade(self.state.feedback)
 
         except Exception as e:
-            logger.error(f"Error handling request: {e}", exc_info=True)
+            logger.error("Error handling request: %s", e, exc_info=True)
             self.state.transition(StateType.ERROR)
             return {
                 "status": "error",
@@ -124,6 +146,52 @@ class AgentController:
                 "message": "An unexpected error occurred"
             }
 
+    def _prepare(self, request: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        """Plan the request and select or create the tool to run.
+
+        Returns:
+            The plan and the tool, or None for the tool if creation failed
+        """
+        self.state.transition(StateType.PLAN)
+
+        # Build context
+        ctx = self.context_manager.build_into(request, self._ctx_scratch)
+
+        # Plan
+        plan = self._plan(ctx)
+        self.state.plan = plan
+
+        # Search for existing tools
+        candidate_tools = self.tool_registry.search(
+            plan.get("intent", ""),
+            plan.get("io_spec", {})
+        )
+
+        # Decide: use existing or create new tool
+        if self._match_found(candidate_tools, plan):
+            self.state.transition(StateType.SELECT_TOOL)
+            tool = self._rank_and_select(candidate_tools, plan)
+            self.state.selected_tool = tool.get("id")
+            return plan, tool
+
+        self.state.transition(StateType.DESIGN_TOOL)
+        # Create new tool
+        tool_spec = self._synthesize_tool_spec(plan)
+        tool = self._create_tool(tool_spec)
+
+        if tool.get("status") != "READY":
+            self.state.add_feedback("tool_creation_failed", tool)
+            return plan, None
+
+        self.state.selected_tool = tool.get("tool_id")
+        return plan, tool
+
+    def _attempt(self, plan: Dict[str, Any], tool: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Run one execution attempt of the prepared tool."""
+        if tool is None:
+            return None
+        return self._run_plan_calls(tool, plan)
+
     def _plan(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """Generate execution plan."""
         # Use ReAct by default, escalate to ToT for low confidence
@@ -148,11 +216,27 @@ class AgentController:
         return candidates[0]
 
     def _synthesize_tool_spec(self, plan: Dict[str, Any]) -> Dict[str, Any]:
-        """Synthesize tool specification from plan."""
+        """Synthesize tool specification from plan.
+
+        Specs depend only on the plan's intent and io_spec, so they are cached
+        on that key. Callers receive a shallow copy.
+        """
+        key = (plan.get("intent", "generic"), _freeze(plan.get("io_spec", {})))
+        spec = self._tool_spec_cache.get(key)
+        if spec is None:
+            spec = self._build_tool_spec(plan)
+            if len(self._tool_spec_cache) >= _TOOL_SPEC_CACHE_SIZE:
+                # Evict the oldest entry
+                del self._tool_spec_cache[next(iter(self._tool_spec_cache))]
+            self._tool_spec_cache[key] = spec
+        return dict(spec)
+
+    def _build_tool_spec(self, plan: Dict[str, Any]) -> Dict[str, Any]:
+        """Build tool specification from plan."""
         return {
-            "name": f"tool_{plan.get('intent', 'generic').replace(' ', '_')}",
+            "name": f"tool_{plan.get('intent', 'generic').translate(_SLUG_TABLE)}",
             "description": plan.get("intent", ""),
-            "io_spec": plan.get("io_spec", {}),
+            "io_spec": dict(plan.get("io_spec", {})),
             "constraints": {
                 "timeout": 30,
                 "memory_mb": 512,
@@ -173,25 +257,88 @@ class AgentController:
         result = self.code_generator.create_tool(spec)
         return result
 
-    def _execute_tool(self, tool: Dict[str, Any], plan: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Execute tool in sandbox."""
+    def _run_plan_calls(self, tool: Dict[str, Any], plan: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Execute the tool once per independent plan action and merge results."""
+        calls = self._independent_calls(tool, plan)
+        results = self._execute_tool(calls)
+
+        if len(results) == 1:
+            return results[0]
+        return self._merge_results(results)
+
+    def _independent_calls(
+        self,
+        tool: Dict[str, Any],
+        plan: Dict[str, Any]
+    ) -> List[Tuple[Dict[str, Any], Dict[str, Any]]]:
+        """Collect (tool, args) pairs for plan actions that can run concurrently.
+
+        An action is independent when it carries its own ``args`` and has no
+        ``depends_on``. Plans without at least two such actions fall back to a
+        single call with the plan-level args.
+        """
+        actions = plan.get("actions", [])
+        independent = [
+            a for a in actions
+            if isinstance(a, dict) and "args" in a and not a.get("depends_on")
+        ]
+        if len(independent) < 2:
+            return [(tool, plan.get("args", {}))]
+        return [(tool, a.get("args") or {}) for a in independent]
+
+    def _execute_tool(
+        self,
+        calls: List[Tuple[Dict[str, Any], Dict[str, Any]]]
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Execute tool calls in sandbox.
+
+        Calls are submitted to the controller's thread pool and results are
+        returned in submission order. Feedback is recorded on the calling
+        thread once all calls have completed.
+        """
         self.state.transition(StateType.EXECUTE)
 
-        try:
-            args = plan.get("args", {})
-            result = self.sandbox_executor.execute(tool, args)
-            return result
-        except Exception as e:
-            logger.error(f"Tool execution failed: {e}")
-            self.state.add_feedback("execution_error", {"error": str(e)})
+        futures = {
+            self._pool.submit(self.sandbox_executor.execute, tool, args): i
+            for i, (tool, args) in enumerate(calls)
+        }
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(calls)
+        errors: List[Exception] = []
+        for future in as_completed(futures):
+            try:
+                results[futures[future]] = future.result()
+            except Exception as e:
+                errors.append(e)
+
+        for error in errors:
+            logger.error("Tool execution failed: %s", error)
+            self.state.add_feedback("execution_error", {"error": str(error)})
+
+        return results
+
+    def _merge_results(self, results: List[Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        """Merge results of a batched execution into a single result."""
+        finished = [r for r in results if r is not None]
+        if len(finished) < len(results):
             return None
 
+        errors = [r["error"] for r in finished if r.get("status") != "success" and "error" in r]
+        merged = {
+            "status": "error" if errors else "success",
+            "result": [r.get("result") for r in finished]
+        }
+        if errors:
+            merged["error"] = "; ".join(str(e) for e in errors)
+        return merged
+
     def _learn_from_feedback(self) -> None:
         """Learn from feedback using Reflexion."""
         task = self.state.request.get("task", "")
         feedback_summary = {
-            "errors": [f for f in self.state.feedback if f.get("category") in ["error", "bad_result"]],
-            "count": len(self.state.feedback)
+            "errors": list(self.state.error_feedback),
+            "count": sum(self.state.feedback_counts.values()),
+            "counts": dict(self.state.feedback_counts)
         }
 
         self.reflexion.add(task, "failure", feedback_summary)
@@ -200,7 +347,7 @@ class AgentController:
         self.context_manager.add_episodic({
             "task": task,
             "outcome": "failure",
-            "feedback": self.state.feedback
+            "feedback": [{"category": e.category, "details": e.details} for e in self.state.feedback]
         })
 
     def _respond(self, result: Dict[str, Any]) -> Dict[str, Any]:
@@ -211,15 +358,23 @@ class AgentController:
             "tool_used": self.state.selected_tool,
             "metadata": {
                 "retries": self.state.retry_count,
-                "state_history": [s.to_state.value for s in self.state.history]
+                "state_history": self.state.history_values
             }
         }
 
-    def _graceful_degrade(self, feedback: list) -> Dict[str, Any]:
+    def _serialize_feedback(self, entry: FeedbackEntry) -> Dict[str, Any]:
+        """Convert a feedback entry for output, formatting its timestamp."""
+        return {
+            "category": entry.category,
+            "details": entry.details,
+            "timestamp": _iso(entry.timestamp_ns)
+        }
+
+    def _graceful_degrade(self, feedback: Iterable[FeedbackEntry]) -> Dict[str, Any]:
         """Gracefully degrade on failure."""
         return {
             "status": "degraded",
             "message": "Unable to complete request fully",
-            "feedback": feedback,
+            "feedback": [self._serialize_feedback(f) for f in feedback],
             "partial_result": self.state.execution_result
         }
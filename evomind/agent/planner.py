@@ -1,13 +1,50 @@
 """Planning modules for agent decision-making."""
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from collections import deque
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Deque, Dict, FrozenSet, Iterable, List, Mapping, Optional, Sequence, Tuple
+import functools
+import heapq
 import logging
+import math
+import re
+import sys
 
-from evomind.llm.gemini_client import GeminiClient
+from evomind.agent._scoring import argmax_f64, as_matrix, as_vector, score_candidates
+from evomind.agent.state import FAILURE_CATEGORIES, tail
+from evomind.utils.compat import DATACLASS_SLOTS
+
+if TYPE_CHECKING:
+    from evomind.llm.gemini_client import GeminiClient
 
 logger = logging.getLogger(__name__)
 
+# Read-only plan defaults shared by every plan. Copy before mutating.
+_DEFAULT_IO_SPEC = MappingProxyType({
+    "input_type": "generic",
+    "output_type": "generic",
+    "constraints": ()
+})
+_DEFAULT_SUCCESS_CRITERIA = MappingProxyType({
+    "has_result": True,
+    "no_errors": True,
+    "valid_schema": True
+})
+
+
+def _copy_plan(value: Any) -> Any:
+    """Copy the nested dicts and lists of a plan so callers never share them.
+
+    Read-only mappings such as the shared plan defaults are returned as is.
+    """
+    if isinstance(value, dict):
+        return {k: _copy_plan(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy_plan(v) for v in value]
+    return value
+
 
 class Planner(ABC):
     """Base planner interface."""
@@ -25,10 +62,17 @@ class ReActPlanner(Planner):
     This is the default planner for most tasks.
     """
 
-    def __init__(self, llm_client: Optional[GeminiClient] = None, use_llm: bool = False):
-        self.llm_client = llm_client or (GeminiClient() if use_llm else None)
+    def __init__(self, llm_client: Optional["GeminiClient"] = None, use_llm: bool = False):
+        # The Gemini client is only imported when LLM planning is requested
+        if use_llm and llm_client is None:
+            from evomind.llm.gemini_client import GeminiClient
+            llm_client = GeminiClient()
+        self.llm_client = llm_client
         self.use_llm = use_llm and self.llm_client is not None
 
+        # Rule-based plans depend only on the task and whether history exists
+        self._rule_based_plan = functools.lru_cache(maxsize=1024)(self._build_rule_based_plan)
+
         if self.use_llm:
             logger.info("ReActPlanner initialized with Gemini LLM")
         else:
@@ -47,53 +91,49 @@ class ReActPlanner(Planner):
                 plan["strategy"] = "react"
                 return plan
             except Exception as e:
-                logger.warning(f"LLM planning failed, using rule-based: {e}")
+                logger.warning("LLM planning failed, using rule-based: %s", e)
 
         # Fallback to rule-based planning
-        plan = {
+        has_history = bool(context.get("relevant_history"))
+        rule_plan: Dict[str, Any] = _copy_plan(self._rule_based_plan(task, has_history))
+
+        logger.info("Generated ReAct plan with confidence: %s", rule_plan["confidence"])
+        return rule_plan
+
+    def _build_rule_based_plan(self, task: str, has_history: bool) -> Dict[str, Any]:
+        """Build the rule-based plan for a task (memoized per planner)."""
+        return {
             "strategy": "react",
             "intent": self._extract_intent(task),
             "io_spec": self._infer_io_spec(task),
-            "actions": self._generate_actions(task, context),
+            "actions": self._generate_actions(task),
             "success_criteria": self._define_success_criteria(task),
-            "confidence": self._estimate_confidence(task, context)
+            "confidence": self._estimate_confidence(task, has_history)
         }
 
-        logger.info(f"Generated ReAct plan with confidence: {plan['confidence']}")
-        return plan
-
     def _extract_intent(self, task: str) -> str:
         """Extract task intent."""
         # Simplified: in production, use LLM
-        return task.lower().strip()
+        return sys.intern(task.lower().strip())
 
-    def _infer_io_spec(self, task: str) -> Dict[str, Any]:
+    def _infer_io_spec(self, task: str) -> Mapping[str, Any]:
         """Infer input/output specification."""
-        return {
-            "input_type": "generic",
-            "output_type": "generic",
-            "constraints": []
-        }
+        return _DEFAULT_IO_SPEC
 
-    def _generate_actions(self, task: str, context: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _generate_actions(self, task: str) -> List[Dict[str, Any]]:
         """Generate action sequence."""
         return [
             {"type": "search_tools", "query": task},
             {"type": "execute_or_create", "depends_on": "search_tools"}
         ]
 
-    def _define_success_criteria(self, task: str) -> Dict[str, Any]:
+    def _define_success_criteria(self, task: str) -> Mapping[str, Any]:
         """Define success criteria."""
-        return {
-            "has_result": True,
-            "no_errors": True,
-            "valid_schema": True
-        }
+        return _DEFAULT_SUCCESS_CRITERIA
 
-    def _estimate_confidence(self, task: str, context: Dict[str, Any]) -> float:
+    def _estimate_confidence(self, task: str, has_history: bool) -> float:
         """Estimate confidence in plan."""
         # Simplified heuristic
-        has_history = len(context.get("relevant_history", [])) > 0
         return 0.8 if has_history else 0.6
 
 
@@ -104,10 +144,15 @@ class ToTPlanner(Planner):
     More expensive than ReAct, use only for hard tasks.
     """
 
+    # Placeholder scoring: weights over per-candidate (bias, variant) features
+    _SCORE_WEIGHTS = as_vector([0.5, 0.1])
+
     def __init__(self, llm_client: Optional[Any] = None, breadth: int = 3, depth: int = 2):
         self.llm_client = llm_client
         self.breadth = breadth
         self.depth = depth
+        # Candidate scores and the best index, for the breadth they were computed at
+        self._scored: Optional[Tuple[int, Sequence[float], int]] = None
 
     def plan(self, context: Dict[str, Any]) -> Dict[str, Any]:
         """Generate ToT plan with exploration."""
@@ -115,14 +160,14 @@ class ToTPlanner(Planner):
         task = request.get("task", "")
 
         # Generate multiple candidate approaches
-        candidates = self._generate_candidates(task, context)
+        candidates, scores = self._generate_candidates(task, context)
 
         # Evaluate and select best path
-        best_path = self._select_best_path(candidates, context)
+        best_path = self._select_best_path(candidates, scores)
 
         plan = {
             "strategy": "tot",
-            "intent": task.lower().strip(),
+            "intent": sys.intern(task.lower().strip()),
             "io_spec": self._infer_io_spec(task),
             "actions": best_path.get("actions", []),
             "success_criteria": self._define_success_criteria(task),
@@ -130,20 +175,42 @@ class ToTPlanner(Planner):
             "explored_paths": len(candidates)
         }
 
-        logger.info(f"Generated ToT plan exploring {len(candidates)} paths")
+        logger.info("Generated ToT plan exploring %d paths", len(candidates))
         return plan
 
-    def _generate_candidates(self, task: str, context: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Generate candidate reasoning paths."""
+    def _generate_candidates(
+        self,
+        task: str,
+        context: Dict[str, Any]
+    ) -> Tuple[List[Dict[str, Any]], Sequence[float]]:
+        """Generate candidate reasoning paths.
+
+        Returns:
+            Candidates and their scores as parallel lists
+        """
         # Simplified: generate multiple approaches
+        scores = self._candidate_scores()[0]
+
         candidates = []
         for i in range(self.breadth):
             candidates.append({
                 "approach": f"approach_{i}",
                 "actions": self._generate_actions(task, i),
-                "score": 0.5 + (i * 0.1)  # Placeholder scoring
+                "score": float(scores[i])
             })
-        return candidates
+        return candidates, scores
+
+    def _candidate_scores(self) -> Tuple[Sequence[float], int]:
+        """Scores of the candidates and the index of the best one.
+
+        The placeholder features depend on nothing but the breadth, so the
+        kernels run once per breadth rather than on every plan.
+        """
+        if self._scored is None or self._scored[0] != self.breadth:
+            features = as_matrix([[1.0, i] for i in range(self.breadth)])
+            scores = score_candidates(features, self._SCORE_WEIGHTS)
+            self._scored = (self.breadth, scores, int(argmax_f64(scores)))
+        return self._scored[1], self._scored[2]
 
     def _generate_actions(self, task: str, variant: int) -> List[Dict[str, Any]]:
         """Generate action sequence for a specific approach."""
@@ -152,26 +219,42 @@ class ToTPlanner(Planner):
             {"type": "execute_steps", "parallel": variant % 2 == 0}
         ]
 
-    def _select_best_path(self, candidates: List[Dict[str, Any]], context: Dict[str, Any]) -> Dict[str, Any]:
+    def _select_best_path(self, candidates: List[Dict[str, Any]], scores: Sequence[float]) -> Dict[str, Any]:
         """Select best reasoning path."""
         # Select highest scoring candidate
-        return max(candidates, key=lambda c: c.get("score", 0))
+        if self._scored is not None and scores is self._scored[1]:
+            return candidates[self._scored[2]]
+        return candidates[int(argmax_f64(scores))]
 
-    def _infer_io_spec(self, task: str) -> Dict[str, Any]:
+    def _infer_io_spec(self, task: str) -> Mapping[str, Any]:
         """Infer input/output specification."""
-        return {
-            "input_type": "generic",
-            "output_type": "generic",
-            "constraints": []
-        }
+        return _DEFAULT_IO_SPEC
 
-    def _define_success_criteria(self, task: str) -> Dict[str, Any]:
+    def _define_success_criteria(self, task: str) -> Mapping[str, Any]:
         """Define success criteria."""
-        return {
-            "has_result": True,
-            "no_errors": True,
-            "valid_schema": True
-        }
+        return _DEFAULT_SUCCESS_CRITERIA
+
+
+# Words compared between tasks by ReflexionMemory.get_relevant
+_TERM_RE = re.compile(r"[a-z0-9]+")
+
+
+def _task_terms(task: str) -> FrozenSet[str]:
+    """Distinct lowercased words of a task."""
+    return frozenset(_TERM_RE.findall(task.lower()))
+
+
+# Feedback categories indicating the plan itself must be rebuilt before retrying
+_REPLAN_CATEGORIES = frozenset({"tool_creation_failed"})
+
+
+@dataclass(**DATACLASS_SLOTS)
+class Episode:
+    """Reflexion episode describing the outcome of a task."""
+    task: str
+    outcome: str
+    feedback: Dict[str, Any]
+    lessons: List[str] = field(default_factory=list)
 
 
 class ReflexionMemory:
@@ -180,19 +263,23 @@ class ReflexionMemory:
     Stores feedback about what worked and what failed to improve future attempts.
     """
 
-    def __init__(self):
-        self.episodes: List[Dict[str, Any]] = []
+    def __init__(self, max_episodes: int = 1000):
+        self.episodes: Deque[Episode] = deque(maxlen=max_episodes)
+        # Words of each episode's task and their weight, evicted with it
+        self._terms: Deque[Tuple[FrozenSet[str], float]] = deque(maxlen=max_episodes)
 
     def add(self, task: str, outcome: str, feedback: Dict[str, Any]) -> None:
         """Add reflexion episode."""
-        episode = {
-            "task": task,
-            "outcome": outcome,
-            "feedback": feedback,
-            "lessons": self._extract_lessons(outcome, feedback)
-        }
+        episode = Episode(
+            task=task,
+            outcome=outcome,
+            feedback=feedback,
+            lessons=self._extract_lessons(outcome, feedback)
+        )
         self.episodes.append(episode)
-        logger.info(f"Added reflexion episode: {outcome}")
+        terms = _task_terms(task)
+        self._terms.append((terms, 1 / math.sqrt(len(terms)) if terms else 0.0))
+        logger.info("Added reflexion episode: %s", outcome)
 
     def _extract_lessons(self, outcome: str, feedback: Dict[str, Any]) -> List[str]:
         """Extract lessons from feedback."""
@@ -202,13 +289,49 @@ class ReflexionMemory:
             lessons.append(f"Avoid {error_type} in similar tasks")
         return lessons
 
-    def get_relevant(self, task: str, limit: int = 5) -> List[Dict[str, Any]]:
-        """Get relevant reflexion episodes."""
-        # Simplified: return recent episodes
-        return self.episodes[-limit:]
+    def get_relevant(self, task: str, limit: int = 5) -> List[Episode]:
+        """Get relevant reflexion episodes, oldest first.
+
+        Episodes are ranked by the cosine similarity of their task's words
+        to ``task``, more recent ones first on ties, so without any shared
+        words this returns the most recent episodes.
+        """
+        query = _task_terms(task)
+        if limit <= 0:
+            return []
+        if not query:
+            return tail(self.episodes, limit)
+
+        scored = [
+            (len(query & terms) * weight, i)
+            for i, (terms, weight) in enumerate(self._terms)
+        ]
+        indices = sorted(i for _, i in heapq.nlargest(limit, scored))
+        episodes = list(self.episodes)
+        return [episodes[i] for i in indices]
+
+    def should_reflect(self, feedback: Any) -> bool:
+        """Determine if reflection is needed.
+
+        Args:
+            feedback: Agent state tracking failures, or a list of feedback entries
+        """
+        # Agent state keeps a running failure count, avoiding a scan per retry
+        failure_count: Optional[int] = getattr(feedback, "failure_count", None)
+        if failure_count is not None:
+            return failure_count > 0
 
-    def should_reflect(self, feedback: List[Dict[str, Any]]) -> bool:
-        """Determine if reflection is needed."""
         # Reflect on failures or after multiple retries
-        has_failures = any(f.get("category") in ["bad_result", "error"] for f in feedback)
+        has_failures = any(f.get("category") in FAILURE_CATEGORIES for f in feedback)
         return has_failures
+
+    def should_replan(self, categories: Iterable[str]) -> bool:
+        """Determine if the feedback of a failed attempt requires a new plan.
+
+        Plans whose tool could not be created are rebuilt; other failures
+        retry execution with the same plan and tool.
+
+        Args:
+            categories: Feedback categories recorded during the attempt
+        """
+        return not _REPLAN_CATEGORIES.isdisjoint(categories)
@@ -1,9 +1,26 @@
 """Agent state management and state machine."""
 
+import time
+from array import array
+from collections import Counter, deque
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from itertools import islice
+from typing import Any, Deque, Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
+
+from evomind.utils.compat import DATACLASS_SLOTS
+
+# Feedback categories that count as failures for reflexion
+FAILURE_CATEGORIES = frozenset({"bad_result", "error"})
+
+# Most recent transitions and feedback entries an AgentState keeps; counts
+# by category cover everything recorded
+HISTORY_LIMIT = 1024
+FEEDBACK_LIMIT = 256
+
+# Transitions dropped at once when the history is full, so trimming the
+# arrays is amortized over many transitions
+_HISTORY_TRIM = HISTORY_LIMIT // 8
 
 
 class StateType(str, Enum):
@@ -20,16 +37,64 @@ class StateType(str, Enum):
     ERROR = "error"
 
 
-@dataclass
+# Ordinal of each state, used as its bit position in the transition table
+# and as its code in the columnar transition history
+_ORD: Dict[StateType, int] = {state: i for i, state in enumerate(StateType)}
+_STATES: Tuple[StateType, ...] = tuple(StateType)
+_STATE_NAMES: Tuple[str, ...] = tuple(state.value for state in StateType)
+
+# Legal state machine edges. Any state may move to ERROR.
+_EDGES = (
+    (StateType.IDLE, StateType.PLAN),
+    (StateType.PLAN, StateType.SELECT_TOOL),
+    (StateType.PLAN, StateType.DESIGN_TOOL),
+    (StateType.SELECT_TOOL, StateType.EXECUTE),
+    (StateType.DESIGN_TOOL, StateType.VALIDATE),
+    (StateType.VALIDATE, StateType.EXECUTE),
+    (StateType.VALIDATE, StateType.VERIFY),
+    (StateType.EXECUTE, StateType.VERIFY),
+    (StateType.VERIFY, StateType.RESPOND),
+    (StateType.VERIFY, StateType.LEARN),
+    (StateType.LEARN, StateType.PLAN),
+    (StateType.LEARN, StateType.EXECUTE),
+    (StateType.LEARN, StateType.VERIFY),
+)
+
+
+def _build_transition_table() -> List[int]:
+    """Build a bitmask of legal target states for each state."""
+    table = [1 << _ORD[StateType.ERROR]] * len(_ORD)
+    for from_state, to_state in _EDGES:
+        table[_ORD[from_state]] |= 1 << _ORD[to_state]
+    return table
+
+
+_LEGAL: List[int] = _build_transition_table()
+
+
+def is_legal_transition(from_state: StateType, to_state: StateType) -> bool:
+    """Check whether the state machine allows a transition."""
+    return bool(_LEGAL[_ORD[from_state]] & (1 << _ORD[to_state]))
+
+
+@dataclass(**DATACLASS_SLOTS)
 class StateTransition:
     """Represents a state transition."""
     from_state: StateType
     to_state: StateType
-    timestamp: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+    timestamp_ns: int = field(default_factory=time.time_ns)
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
+class FeedbackEntry:
+    """Feedback recorded during request handling."""
+    category: str
+    details: Dict[str, Any]
+    timestamp_ns: int = field(default_factory=time.time_ns)
+
+
+@dataclass(**DATACLASS_SLOTS)
 class AgentState:
     """Agent state container."""
     current_state: StateType = StateType.IDLE
@@ -37,28 +102,88 @@ class AgentState:
     plan: Optional[Dict[str, Any]] = None
     selected_tool: Optional[str] = None
     execution_result: Optional[Any] = None
-    feedback: List[Dict[str, Any]] = field(default_factory=list)
-    history: List[StateTransition] = field(default_factory=list)
+    feedback: Deque[FeedbackEntry] = field(default_factory=lambda: deque(maxlen=FEEDBACK_LIMIT))
+    # Transition history stored column-wise as state ordinals and timestamps
+    history_from: array = field(default_factory=lambda: array("b"), repr=False)
+    history_to: array = field(default_factory=lambda: array("b"), repr=False)
+    history_ts: array = field(default_factory=lambda: array("q"), repr=False)
+    _history_meta: List[Optional[Dict[str, Any]]] = field(default_factory=list, init=False, repr=False)
     retry_count: int = 0
     max_retries: int = 3
+    # Only count feedback by category, without keeping the entries
+    aggregate_only: bool = False
+    _feedback_by_category: Counter = field(default_factory=Counter, init=False, repr=False)
+    _failure_count: int = field(default=0, init=False, repr=False)
+    _error_feedback: Deque[FeedbackEntry] = field(
+        default_factory=lambda: deque(maxlen=FEEDBACK_LIMIT), init=False, repr=False
+    )
 
     def transition(self, to_state: StateType, metadata: Optional[Dict[str, Any]] = None) -> None:
         """Transition to a new state."""
-        transition = StateTransition(
-            from_state=self.current_state,
-            to_state=to_state,
-            metadata=metadata or {}
-        )
-        self.history.append(transition)
+        assert _LEGAL[_ORD[self.current_state]] & (1 << _ORD[to_state]), \
+            f"illegal transition {self.current_state.value} -> {to_state.value}"
+
+        self.history_from.append(_ORD[self.current_state])
+        self.history_to.append(_ORD[to_state])
+        self.history_ts.append(time.time_ns())
+        self._history_meta.append(metadata)
         self.current_state = to_state
 
+        if len(self.history_to) > HISTORY_LIMIT:
+            for column in (self.history_from, self.history_to, self.history_ts, self._history_meta):
+                del column[:_HISTORY_TRIM]
+
+    @property
+    def history(self) -> List[StateTransition]:
+        """Transition history, materialized as StateTransition objects."""
+        return [
+            StateTransition(
+                from_state=_STATES[f],
+                to_state=_STATES[t],
+                timestamp_ns=ts,
+                metadata=meta or {}
+            )
+            for f, t, ts, meta in zip(self.history_from, self.history_to, self.history_ts, self._history_meta)
+        ]
+
+    @property
+    def history_values(self) -> List[str]:
+        """Values of the states transitioned to, in order."""
+        return [_STATE_NAMES[i] for i in self.history_to]
+
     def add_feedback(self, category: str, details: Dict[str, Any]) -> None:
         """Add feedback entry."""
-        self.feedback.append({
-            "category": category,
-            "details": details,
-            "timestamp": datetime.now(timezone.utc).isoformat()
-        })
+        self._feedback_by_category[category] += 1
+        is_failure = category in FAILURE_CATEGORIES
+        if is_failure:
+            self._failure_count += 1
+
+        if self.aggregate_only:
+            return
+
+        entry = FeedbackEntry(category, details)
+        self.feedback.append(entry)
+        if is_failure:
+            self._error_feedback.append(entry)
+
+    @property
+    def failure_count(self) -> int:
+        """Number of failure feedback entries recorded."""
+        return self._failure_count
+
+    @property
+    def error_feedback(self) -> Deque[FeedbackEntry]:
+        """Feedback entries whose category is a failure."""
+        return self._error_feedback
+
+    @property
+    def feedback_counts(self) -> Counter:
+        """Number of feedback entries recorded per category."""
+        return self._feedback_by_category
+
+    def feedback_count(self, category: str) -> int:
+        """Number of feedback entries recorded for a category."""
+        return self._feedback_by_category[category]
 
     def can_retry(self) -> bool:
         """Check if retry is allowed."""
@@ -75,17 +200,31 @@ class AgentState:
         self.plan = None
         self.selected_tool = None
         self.execution_result = None
-        self.feedback = []
+        self.feedback = deque(maxlen=FEEDBACK_LIMIT)
+        self.history_from = array("b")
+        self.history_to = array("b")
+        self.history_ts = array("q")
+        self._history_meta = []
         self.retry_count = 0
+        self._feedback_by_category = Counter()
+        self._failure_count = 0
+        self._error_feedback = deque(maxlen=FEEDBACK_LIMIT)
+
+
+def tail(items: Deque[Any], limit: int) -> List[Any]:
+    """Return the last ``limit`` items of a deque, oldest first."""
+    recent = list(islice(reversed(items), limit))
+    recent.reverse()
+    return recent
 
 
 class ContextManager:
     """Manages agent context including short-term and long-term memory."""
 
-    def __init__(self):
+    def __init__(self, max_episodes: int = 256):
         self.short_term: Dict[str, Any] = {}
         self.long_term: Dict[str, Any] = {}
-        self.episodic: List[Dict[str, Any]] = []
+        self.episodic: Deque[Dict[str, Any]] = deque(maxlen=max_episodes)
 
     def build(self, request: Dict[str, Any]) -> Dict[str, Any]:
         """Build context from request."""
@@ -95,10 +234,23 @@ class ContextManager:
             "relevant_history": self._get_relevant_history(request)
         }
 
+    def build_into(self, request: Dict[str, Any], out: Dict[str, Any]) -> Dict[str, Any]:
+        """Build context from request into an existing dict.
+
+        The dict is cleared and refilled, so callers can reuse one scratch
+        dict across requests as long as each context is consumed before the
+        next build.
+        """
+        out.clear()
+        out["request"] = request
+        out["short_term"] = self.short_term
+        out["relevant_history"] = self._get_relevant_history(request)
+        return out
+
     def _get_relevant_history(self, request: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Retrieve relevant historical context."""
         # Simplified: return recent episodic memories
-        return self.episodic[-5:] if self.episodic else []
+        return tail(self.episodic, 5)
 
     def update_short_term(self, key: str, value: Any) -> None:
         """Update short-term memory."""
@@ -106,7 +258,7 @@ class ContextManager:
 
     def add_episodic(self, episode: Dict[str, Any]) -> None:
         """Add episodic memory."""
-        episode["timestamp"] = datetime.now(timezone.utc).isoformat()
+        episode["timestamp_ns"] = time.time_ns()
         self.episodic.append(episode)
 
     def clear_short_term(self) -> None:
@@ -3,6 +3,7 @@
 from typing import Dict, Any, Optional
 from datetime import datetime, timezone
 import logging
+import time
 
 try:
     from fastapi import FastAPI, HTTPException
@@ -60,6 +61,7 @@ def create_app(config: Optional[Config] = None) -> Any:
     agent = AgentController()
     registry = ToolRegistry()
     metrics = get_metrics_collector()
+    record_request = metrics.record_request
 
     @app.get("/")
     def root():
@@ -81,7 +83,7 @@ def create_app(config: Optional[Config] = None) -> Any:
     @app.post("/agent/request")
     def submit_request(request: AgentRequest):
         """Submit a request to the agent."""
-        start_time = datetime.now(timezone.utc)
+        start_ns = time.perf_counter_ns()
 
         try:
             result = agent.handle_request({
@@ -89,15 +91,15 @@ def create_app(config: Optional[Config] = None) -> Any:
                 "args": request.args or {}
             })
 
-            duration_ms = (datetime.now(timezone.utc) - start_time).total_seconds() * 1000
-            metrics.record_request(result.get("status", "unknown"), duration_ms)
+            duration_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
+            record_request(result.get("status", "unknown"), duration_ms)
 
             return JSONResponse(content=result)
 
         except Exception as e:
             logger.error(f"Request failed: {e}", exc_info=True)
-            duration_ms = (datetime.now(timezone.utc) - start_time).total_seconds() * 1000
-            metrics.record_request("error", duration_ms)
+            duration_ms = (time.perf_counter_ns() - start_ns) / 1_000_000
+            record_request("error", duration_ms)
 
             raise HTTPException(status_code=500, detail=str(e))
 
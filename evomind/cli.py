@@ -5,14 +5,13 @@ import argparse
 import sys
 import json
 
-from evomind.agent.controller import AgentController
-from evomind.utils.config import Config
-from evomind.observability.logging import setup_logging
-from evomind.observability.metrics import get_metrics_collector
-
 
 def cmd_submit(args):
     """Submit a request to the agent."""
+    from evomind.agent.controller import AgentController
+    from evomind.utils.config import Config
+    from evomind.observability.logging import setup_logging
+
     config = Config.from_env()
     setup_logging(level=config.log_level, structured=config.log_structured)
 
@@ -75,6 +74,8 @@ def cmd_inspect_tool(args):
 
 def cmd_metrics(args):
     """Show metrics."""
+    from evomind.observability.metrics import get_metrics_collector
+
     metrics = get_metrics_collector()
     data = metrics.get_metrics()
 
@@ -107,8 +108,17 @@ def cmd_dry_run(args):
     return 0 if result.get("status") == "success" else 1
 
 
-def main():
-    """Main CLI entry point."""
+COMMANDS = {
+    "submit": cmd_submit,
+    "list-tools": cmd_list_tools,
+    "inspect": cmd_inspect_tool,
+    "metrics": cmd_metrics,
+    "dry-run": cmd_dry_run,
+}
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the CLI argument parser."""
     parser = argparse.ArgumentParser(
         description="EvoMind - AI Agent System CLI"
     )
@@ -119,36 +129,41 @@ def main():
     submit_parser = subparsers.add_parser("submit", help="Submit a request")
     submit_parser.add_argument("task", help="Task description")
     submit_parser.add_argument("--args", help="Task arguments as JSON")
-    submit_parser.set_defaults(func=cmd_submit)
 
     # List tools command
     list_parser = subparsers.add_parser("list-tools", help="List available tools")
     list_parser.add_argument("--include-deprecated", action="store_true", help="Include deprecated tools")
-    list_parser.set_defaults(func=cmd_list_tools)
 
     # Inspect tool command
     inspect_parser = subparsers.add_parser("inspect", help="Inspect a tool")
     inspect_parser.add_argument("tool_id", help="Tool ID")
     inspect_parser.add_argument("--show-code", action="store_true", help="Show tool code")
-    inspect_parser.set_defaults(func=cmd_inspect_tool)
 
     # Metrics command
-    metrics_parser = subparsers.add_parser("metrics", help="Show metrics")
-    metrics_parser.set_defaults(func=cmd_metrics)
+    subparsers.add_parser("metrics", help="Show metrics")
 
     # Dry run command
     dryrun_parser = subparsers.add_parser("dry-run", help="Dry run a tool")
     dryrun_parser.add_argument("tool_id", help="Tool ID")
     dryrun_parser.add_argument("--args", help="Tool arguments as JSON")
-    dryrun_parser.set_defaults(func=cmd_dry_run)
 
+    return parser
+
+
+def main():
+    """Main CLI entry point.
+
+    Commands import the components they need themselves, so help output
+    and argument errors return before any agent component is loaded.
+    """
+    parser = _build_parser()
     args = parser.parse_args()
 
     if not args.command:
         parser.print_help()
         return 1
 
-    return args.func(args)
+    return COMMANDS[args.command](args)
 
 
 if __name__ == "__main__":
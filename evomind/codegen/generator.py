@@ -1,14 +1,69 @@
 """Code generation module using PAL (Program-Aided Language) approach."""
 
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import ast
+import hashlib
+import json
 import logging
-from typing import Dict, Any, Optional
+import os
+from pathlib import Path
+import threading
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
 import textwrap
 
-from evomind.codegen.validators import StaticValidator, TypeChecker
-from evomind.llm.gemini_client import GeminiClient
+from evomind.codegen.validators import StaticValidator, TypeChecker, parse_code
+from evomind.observability.metrics import get_metrics_collector
+from evomind.utils.serialization import dumps, loads
+
+if TYPE_CHECKING:
+    from evomind.llm.gemini_client import GeminiClient
 
 logger = logging.getLogger(__name__)
 
+# Created tools kept in memory by CodeGenerator.create_tool
+_TOOL_CACHE_SIZE = 256
+
+
+def _compile_tool(source: Any, name: Optional[str]):
+    """Compile tool source or a parsed tree into a code object."""
+    return compile(source, f"<tool:{name}>", "exec", dont_inherit=True, optimize=2)
+
+
+def _copy_tool(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a create_tool result that callers may modify."""
+    return {**result, "artifact": dict(result["artifact"])}
+
+
+def _split_template(template: str, *fields: str) -> Tuple[str, ...]:
+    """Split a format template into literal segments around its fields.
+
+    Fields must appear once each, in the given order. Escaped braces in the
+    segments are unescaped, so joining the segments with the field values
+    matches ``template.format(...)``.
+    """
+    segments = []
+    rest = template
+    for field in fields:
+        head, rest = rest.split("{" + field + "}", 1)
+        segments.append(head)
+    segments.append(rest)
+    return tuple(seg.replace("{{", "{").replace("}}", "}") for seg in segments)
+
+
+def _find_entrypoint(tree: Optional[ast.Module], name: Optional[str]) -> Optional[str]:
+    """Name of the function a tool is called through.
+
+    That is the top-level function named after the tool, or else the first
+    public top-level function.
+    """
+    if tree is None:
+        return None
+    functions = [node.name for node in tree.body if isinstance(node, ast.FunctionDef)]
+    if name in functions:
+        return name
+    return next((f for f in functions if not f.startswith("_")), None)
+
 
 class CodeGenerator:
     """Code generator implementing PAL-style tool creation.
@@ -17,14 +72,31 @@ class CodeGenerator:
     This reduces hallucinated math/logic errors.
     """
 
-    def __init__(self, llm_client: Optional[GeminiClient] = None, use_llm: bool = False, allow_network: bool = False):
-        self.llm_client = llm_client or (GeminiClient() if use_llm else None)
+    def __init__(
+        self,
+        llm_client: Optional["GeminiClient"] = None,
+        use_llm: bool = False,
+        allow_network: bool = False,
+        cache_dir: Optional[Path] = None
+    ):
+        # The Gemini SDK is only imported when LLM generation is requested
+        if use_llm and llm_client is None:
+            from evomind.llm.gemini_client import GeminiClient
+            llm_client = GeminiClient()
+        self.llm_client = llm_client
         self.use_llm = use_llm and self.llm_client is not None
         self.allow_network = allow_network
         self.validator = StaticValidator(allow_network=allow_network)
         self.type_checker = TypeChecker()
         self.templates = CodeTemplates()
 
+        # Tools created by create_tool, by spec hash, and optionally on disk
+        self.cache_dir = cache_dir
+        if cache_dir is not None:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+        self._tool_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._tool_cache_lock = threading.Lock()
+
         if self.use_llm:
             logger.info("CodeGenerator initialized with Gemini LLM")
         else:
@@ -33,22 +105,133 @@ class CodeGenerator:
         if self.allow_network:
             logger.warning("⚠️  Network access enabled - use with caution!")
 
-    def create_tool(self, spec: Dict[str, Any]) -> Dict[str, Any]:
+    def create_tool(self, spec: Dict[str, Any], cache: bool = True) -> Dict[str, Any]:
         """Create a new tool from specification.
         
         Pipeline: Generate → Validate → Test → Register
+
+        Tools created successfully are cached by spec, in memory and, with
+        a ``cache_dir``, on disk, so an identical spec returns the same tool
+        without generating it again.
+
+        Args:
+            spec: Tool specification
+            cache: Whether to use and fill the cache
         """
-        logger.info(f"Creating tool: {spec.get('name', 'unknown')}")
+        logger.info("Creating tool: %s", spec.get("name", "unknown"))
+
+        if not cache:
+            return self._build_tool(spec, self._generate_code(spec))
+
+        key = self._spec_key(spec)
+        metrics = get_metrics_collector()
+        cached = self._cached_tool(key, spec)
+        if cached is not None:
+            metrics.increment_counter("codegen_cache_hits_total")
+            logger.info("Reusing cached tool for %s", spec.get("name", "unknown"))
+            return cached
+        metrics.increment_counter("codegen_cache_misses_total")
 
         # Generate code
         code = self._generate_code(spec)
+        result = self._build_tool(spec, code)
+        if result["status"] == "READY":
+            self._store_tool(key, result)
+        return result
+
+    def _spec_key(self, spec: Dict[str, Any]) -> str:
+        """Hash of a spec and the settings that change the generated tool."""
+        canonical = json.dumps(
+            {"spec": spec, "use_llm": self.use_llm, "allow_network": self.allow_network},
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str
+        )
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+    def _cached_tool(self, key: str, spec: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Copy of the cached tool for a spec key, if any."""
+        with self._tool_cache_lock:
+            result = self._tool_cache.get(key)
+            if result is not None:
+                self._tool_cache.move_to_end(key)
+                return _copy_tool(result)
+
+        if self.cache_dir is None:
+            return None
+        try:
+            result = loads((self.cache_dir / f"{key}.json").read_bytes())
+            artifact = result["artifact"]
+            # Code objects are not stored, so recompile from the source
+            artifact["code_obj"] = _compile_tool(artifact["code"], spec.get("name"))
+        except (OSError, ValueError, KeyError, TypeError, SyntaxError):
+            return None
+
+        self._remember_tool(key, result)
+        return _copy_tool(result)
+
+    def _store_tool(self, key: str, result: Dict[str, Any]) -> None:
+        """Cache a created tool in memory and, if configured, on disk."""
+        self._remember_tool(key, _copy_tool(result))
+        if self.cache_dir is None:
+            return
+
+        artifact = {k: v for k, v in result["artifact"].items() if k != "code_obj"}
+        entry_path = self.cache_dir / f"{key}.json"
+        tmp_path = entry_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            tmp_path.write_bytes(dumps({**result, "artifact": artifact}, default=str))
+            os.replace(tmp_path, entry_path)
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning("Could not cache tool on disk: %s", e)
+
+    def _remember_tool(self, key: str, result: Dict[str, Any]) -> None:
+        """Keep a tool in the in-memory cache, evicting the oldest if full."""
+        with self._tool_cache_lock:
+            self._tool_cache[key] = result
+            self._tool_cache.move_to_end(key)
+            if len(self._tool_cache) > _TOOL_CACHE_SIZE:
+                self._tool_cache.popitem(last=False)
+
+    def clear_cache(self) -> None:
+        """Forget the tools cached in memory."""
+        with self._tool_cache_lock:
+            self._tool_cache.clear()
+
+    def create_tools(self, specs: List[Dict[str, Any]], max_workers: int = 4) -> List[Dict[str, Any]]:
+        """Create several tools from specifications.
+
+        With LLM generation the code for all specs is requested in a single
+        call. Validation, repair and packaging then run concurrently.
+
+        Args:
+            specs: Tool specifications
+            max_workers: Maximum number of tools finished concurrently
+
+        Returns:
+            create_tool results, in the order of ``specs``
+        """
+        if not specs:
+            return []
+
+        logger.info("Creating %d tools", len(specs))
+        codes = self._generate_codes(specs)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(specs)))) as pool:
+            return list(pool.map(self._build_tool, specs, codes))
+
+    def _build_tool(self, spec: Dict[str, Any], code: Optional[str]) -> Dict[str, Any]:
+        """Validate, package and test generated code."""
         if not code:
             return {"status": "FAIL", "reason": "generation_failed"}
 
-        # AST parse check
-        validation = self.validator.validate(code)
+        # Static validation also reports missing type hints in the same pass.
+        # Without LLM repair nothing consumes the full list of blockers, so
+        # validation can stop at the first one. The validator parses through
+        # parse_code, whose cache then serves packaging.
+        validation = self.validator.validate(code, fail_fast=not self.use_llm)
         if validation.has_blockers():
-            logger.error(f"Validation failed: {validation.blockers}")
+            logger.error("Validation failed: %s", validation.blockers)
 
             # Attempt self-repair
             code = self._attempt_repair(code, validation)
@@ -59,13 +242,19 @@ class CodeGenerator:
             else:
                 return {"status": "FAIL", "reason": "validation_failed", "findings": validation.blockers}
 
-        # Type checking
-        type_result = self.type_checker.check(code)
-        if type_result.has_blockers():
-            logger.warning(f"Type checking issues: {type_result.blockers}")
+        # Type hint findings are advisory and never block creation
+        if logger.isEnabledFor(logging.DEBUG):
+            type_issues = [f for f in validation if f["category"] == "types"]
+            if type_issues:
+                logger.debug("Type checking issues: %s", type_issues)
 
-        # Package code
-        artifact = self._package_code(code, spec)
+        # Package code; compiling catches errors the parser does not,
+        # such as a return outside a function
+        try:
+            artifact = self._package_code(code, spec)
+        except SyntaxError as e:
+            logger.error("Compilation failed: %s", e)
+            return {"status": "FAIL", "reason": "compilation_failed", "details": str(e)}
 
         # Run smoke tests
         test_result = self._run_smoke_tests(artifact, spec.get("tests", []))
@@ -92,30 +281,41 @@ class CodeGenerator:
         # Use Gemini LLM if available
         if self.use_llm and self.llm_client:
             try:
-                logger.info(f"Generating code with Gemini for {name}")
+                logger.info("Generating code with Gemini for %s", name)
                 code = self.llm_client.generate_code(
                     task_description=description,
                     function_name=name,
                     io_spec=io_spec,
                     constraints=spec.get("constraints", {})
                 )
-                logger.info(f"Generated code length: {len(code)} chars")
-                logger.debug(f"Generated code:\n{code[:200]}...")  # Log first 200 chars
+                logger.info("Generated code length: %d chars", len(code))
+                logger.debug("Generated code:\n%.200s...", code)  # Log first 200 chars
                 return code
             except Exception as e:
-                logger.warning(f"LLM generation failed, falling back to templates: {e}")
+                logger.warning("LLM generation failed, falling back to templates: %s", e)
 
         # Fallback to template-based generation
-        logger.info(f"Using template-based generation for {name}")
+        logger.info("Using template-based generation for %s", name)
         code = self.templates.generate_function(
             name=name,
             description=description,
             io_spec=io_spec
         )
 
-        logger.info(f"Generated code for {name}")
+        logger.info("Generated code for %s", name)
         return code
 
+    def _generate_codes(self, specs: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """Generate code for several specifications."""
+        if self.use_llm and self.llm_client:
+            try:
+                logger.info("Generating code with Gemini for %d tools", len(specs))
+                return list(self.llm_client.generate_code_batch(specs))
+            except Exception as e:
+                logger.warning("Batched LLM generation failed, generating per tool: %s", e)
+
+        return [self._generate_code(spec) for spec in specs]
+
     def _attempt_repair(self, code: str, validation: Any) -> Optional[str]:
         """Attempt to repair code based on validation findings."""
         logger.info("Attempting code repair...")
@@ -130,15 +330,26 @@ class CodeGenerator:
                 logger.info("Code repaired with Gemini")
                 return repaired_code
             except Exception as e:
-                logger.warning(f"LLM repair failed: {e}")
+                logger.warning("LLM repair failed: %s", e)
 
         # No template-based repair available
         return None
 
-    def _package_code(self, code: str, spec: Dict[str, Any]) -> Dict[str, Any]:
-        """Package code into artifact."""
+    def _package_code(self, code: str, spec: Dict[str, Any], tree: Optional[ast.Module] = None) -> Dict[str, Any]:
+        """Package code into artifact.
+
+        The code is compiled once, from the already parsed tree when given,
+        and the code object is kept in the artifact for in-process callers.
+        It is not persisted by the registry. The function executors call is
+        recorded as the artifact's entrypoint.
+        """
+        if tree is None:
+            tree = parse_code(code)
+        code_obj = _compile_tool(tree if tree is not None else code, spec.get("name"))
         return {
             "code": code,
+            "code_obj": code_obj,
+            "entrypoint": _find_entrypoint(tree, spec.get("name")),
             "spec": spec,
             "type": "python_function"
         }
@@ -146,7 +357,7 @@ class CodeGenerator:
     def _run_smoke_tests(self, artifact: Dict[str, Any], tests: list) -> Dict[str, Any]:
         """Run smoke tests on artifact."""
         # Simplified: in production run in sandbox
-        logger.info(f"Running {len(tests)} smoke tests")
+        logger.info("Running %d smoke tests", len(tests))
 
         # For MVP, assume tests pass if code is valid
         return {
@@ -164,6 +375,69 @@ class CodeGenerator:
 class CodeTemplates:
     """Code templates for tool generation."""
 
+    _FUNCTION_TEMPLATE = textwrap.dedent('''
+    def {name}(input_data: dict) -> dict:
+        """
+        {description}
+        
+        Args:
+            input_data: Input dictionary with parameters
+        
+        Returns:
+            Dictionary with results
+        """
+        # Implementation
+        result = {{
+            "status": "success",
+            "data": input_data
+        }}
+        
+        return result
+    ''').strip()
+    _FUNCTION_PARTS = _split_template(_FUNCTION_TEMPLATE, "name", "description")
+
+    _TRANSFORM_TEMPLATE = textwrap.dedent('''
+    import json
+    from typing import Any, Dict, List
+    
+    def transform_data(data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Transform data according to specification.
+        
+        Args:
+            data: Input data list
+        
+        Returns:
+            Transformed data list
+        """
+        result = []
+        for item in data:
+            # Apply transformations
+            transformed = item.copy()
+            result.append(transformed)
+        
+        return result
+    ''').strip()
+
+    # Note: Network operations require explicit allowlist
+    _API_TEMPLATE = textwrap.dedent('''
+    from typing import Dict, Any
+    
+    def call_api(endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Call external API (requires network permission).
+        
+        Args:
+            endpoint: API endpoint
+            params: Request parameters
+        
+        Returns:
+            API response
+        """
+        # This requires network access to be granted
+        raise NotImplementedError("Network access not enabled in sandbox")
+    ''').strip()
+
     def generate_function(
         self,
         name: str,
@@ -171,80 +445,13 @@ class CodeTemplates:
         io_spec: Dict[str, Any]
     ) -> str:
         """Generate function from template."""
-
-        template = textwrap.dedent('''
-        def {name}(input_data: dict) -> dict:
-            """
-            {description}
-            
-            Args:
-                input_data: Input dictionary with parameters
-            
-            Returns:
-                Dictionary with results
-            """
-            # Implementation
-            result = {{
-                "status": "success",
-                "data": input_data
-            }}
-            
-            return result
-        ''').strip()
-
-        code = template.format(
-            name=name,
-            description=description
-        )
-
-        return code
+        head, middle, tail = self._FUNCTION_PARTS
+        return "".join((head, name, middle, description, tail))
 
     def generate_data_transform(self, spec: Dict[str, Any]) -> str:
         """Generate data transformation function."""
-        template = textwrap.dedent('''
-        import json
-        from typing import Any, Dict, List
-        
-        def transform_data(data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-            """
-            Transform data according to specification.
-            
-            Args:
-                data: Input data list
-            
-            Returns:
-                Transformed data list
-            """
-            result = []
-            for item in data:
-                # Apply transformations
-                transformed = item.copy()
-                result.append(transformed)
-            
-            return result
-        ''').strip()
-
-        return template
+        return self._TRANSFORM_TEMPLATE
 
     def generate_api_caller(self, spec: Dict[str, Any]) -> str:
         """Generate API caller function."""
-        # Note: Network operations require explicit allowlist
-        template = textwrap.dedent('''
-        from typing import Dict, Any
-        
-        def call_api(endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
-            """
-            Call external API (requires network permission).
-            
-            Args:
-                endpoint: API endpoint
-                params: Request parameters
-            
-            Returns:
-                API response
-            """
-            # This requires network access to be granted
-            raise NotImplementedError("Network access not enabled in sandbox")
-        ''').strip()
-
-        return template
+        return self._API_TEMPLATE
@@ -1,123 +1,522 @@
 """Static code validation using AST, policy gates, SAST, and type checking."""
 
 import ast
+import functools
+import hashlib
 import logging
-from typing import Dict, List, Any, Optional
+import os
+import sys
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, Iterator, List, Any, Optional, Tuple
+
+from evomind.utils.serialization import dumps, loads
 
 logger = logging.getLogger(__name__)
 
+# Always dangerous - never allow
+_ALWAYS_DANGEROUS = frozenset({
+    "os",
+    "subprocess",
+    "ctypes",
+    "multiprocessing",
+    "threading",
+    "__import__",
+    "eval",
+    "exec",
+    "compile"
+})
+
+# Network modules - conditionally allowed
+_NETWORK_IMPORTS = frozenset({
+    "socket",
+    "http",
+    "urllib",
+    "requests",
+    "httpx"
+})
+
+_BASE_ALLOWED = frozenset({
+    "json",
+    "re",
+    "math",
+    "datetime",
+    "typing",
+    "dataclasses",
+    "collections",
+    "itertools",
+    "functools",
+    "string",
+    "statistics",
+    "decimal",
+    "fractions"
+})
+
+# Call and attribute names flagged by the policy and security rules
+_FORBIDDEN_CALLS = frozenset({"eval", "exec", "compile", "__import__"})
+_FILE_CALLS = frozenset({"open", "file"})
+_NETWORK_ATTRS = frozenset({"urlopen", "get", "post", "request"})
+
+# Finding severities that fail validation
+_BLOCKING_SEVERITIES = frozenset({"critical", "high"})
+
+_DANGEROUS_WITH_NETWORK = _ALWAYS_DANGEROUS
+_DANGEROUS_WITHOUT_NETWORK = _ALWAYS_DANGEROUS | _NETWORK_IMPORTS
+_ALLOWED_WITH_NETWORK = _BASE_ALLOWED | _NETWORK_IMPORTS
+_ALLOWED_WITHOUT_NETWORK = _BASE_ALLOWED
+
+# Version of the stored validation result format
+_CACHE_FORMAT = 1
+
+
+@functools.lru_cache(maxsize=None)
+def _rules_digest(dangerous_imports: FrozenSet[str], allowed_imports: FrozenSet[str]) -> str:
+    """Digest of the rules a validator applies, including this module's checks.
+
+    Stored results are keyed by it, so verdicts of other rule sets or
+    releases are never reused.
+    """
+    digest = hashlib.blake2b(digest_size=8)
+    for names in (
+        dangerous_imports,
+        allowed_imports,
+        _FORBIDDEN_CALLS,
+        _FILE_CALLS,
+        _NETWORK_ATTRS,
+        _BLOCKING_SEVERITIES
+    ):
+        digest.update("\0".join(sorted(names)).encode() + b"\1")
+    try:
+        digest.update(Path(__file__).read_bytes())
+    except OSError:
+        from evomind import __version__
+        digest.update(__version__.encode())
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=256)
+def _base_module(module: str) -> str:
+    """Top-level package of a dotted module name.
+
+    The name is interned; the policy set entries are identifier literals and
+    interned by the compiler, so membership tests hit the identity fast path.
+    """
+    return sys.intern(module.split(".")[0])
+
+
+@functools.lru_cache(maxsize=256)
+def parse_code(code: str) -> Optional[ast.Module]:
+    """Parse code into an AST, returning None if it has a syntax error.
+
+    Trees are cached by source, so the validator, type checker and
+    generator share one parse of a given tool. The returned tree is shared
+    and must not be modified.
+    """
+    try:
+        return ast.parse(code, mode="exec", type_comments=False)
+    except SyntaxError:
+        return None
+
 
 class ValidationResult:
-    """Result of static validation."""
+    """Result of static validation.
+
+    Findings are stored column-wise; ``findings`` and ``blockers`` build
+    finding dicts only when read.
+    """
+
+    __slots__ = ("passed", "severities", "categories", "messages", "lines", "_blocker_idx")
 
     def __init__(self):
         self.passed: bool = True
-        self.findings: List[Dict[str, Any]] = []
-        self.blockers: List[Dict[str, Any]] = []
+        self.severities: List[str] = []
+        self.categories: List[str] = []
+        self.messages: List[str] = []
+        self.lines: List[Optional[int]] = []
+        self._blocker_idx: List[int] = []
 
     def add_finding(self, severity: str, category: str, message: str, line: Optional[int] = None) -> None:
         """Add validation finding."""
-        finding = {
-            "severity": severity,
-            "category": category,
-            "message": message,
-            "line": line
+        if severity in _BLOCKING_SEVERITIES:
+            self._blocker_idx.append(len(self.severities))
+            self.passed = False
+
+        self.severities.append(severity)
+        self.categories.append(category)
+        self.messages.append(message)
+        self.lines.append(line)
+
+    def _finding(self, index: int) -> Dict[str, Any]:
+        """Build the finding dict at an index."""
+        return {
+            "severity": self.severities[index],
+            "category": self.categories[index],
+            "message": self.messages[index],
+            "line": self.lines[index]
         }
-        self.findings.append(finding)
 
-        if severity in ["critical", "high"]:
-            self.blockers.append(finding)
-            self.passed = False
+    @property
+    def findings(self) -> List[Dict[str, Any]]:
+        """All findings, in the order they were added."""
+        return [self._finding(i) for i in range(len(self.severities))]
+
+    @property
+    def blockers(self) -> List[Dict[str, Any]]:
+        """Findings severe enough to block the code."""
+        return [self._finding(i) for i in self._blocker_idx]
+
+    def rows(self) -> Iterator[Tuple[str, str, str, Optional[int]]]:
+        """Iterate findings as (severity, category, message, line) tuples."""
+        return zip(self.severities, self.categories, self.messages, self.lines)
+
+    def __len__(self) -> int:
+        return len(self.severities)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return (self._finding(i) for i in range(len(self.severities)))
 
     def has_blockers(self) -> bool:
         """Check if there are blocking issues."""
-        return len(self.blockers) > 0
+        return bool(self._blocker_idx)
+
+
+def _exits_loop(body: List[ast.stmt]) -> bool:
+    """Check if a loop body contains a break or return that leaves it."""
+    # Nodes with whether they sit inside a nested loop's body
+    pending: List[Tuple[ast.AST, bool]] = [(node, False) for node in body]
+    while pending:
+        node, nested = pending.pop()
+        if isinstance(node, ast.Return) or (isinstance(node, ast.Break) and not nested):
+            return True
+        # Breaks in nested loop bodies only leave the nested loop; returns
+        # anywhere outside nested functions leave this one too
+        if isinstance(node, (ast.For, ast.AsyncFor, ast.While)):
+            pending.extend((child, True) for child in node.body)
+            pending.extend((child, nested) for child in node.orelse)
+            continue
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)):
+            continue
+        pending.extend((child, nested) for child in ast.iter_child_nodes(node))
+    return False
+
+
+class _Blocker(Exception):
+    """Raised by a fail-fast traversal at the first blocking finding."""
+
+
+class _FusedValidator:
+    """Single AST traversal applying the policy, security, safety and type hint rules.
+
+    Nodes are visited depth-first in source order, as ast.NodeVisitor
+    would, but with an explicit stack and handlers looked up by node type
+    in a table built once, instead of a recursive visit that formats and
+    looks up a method name for every node.
+    """
+
+    def __init__(
+        self,
+        result: ValidationResult,
+        dangerous_imports: FrozenSet[str],
+        allowed_imports: FrozenSet[str],
+        fail_fast: bool = False
+    ):
+        self.result = result
+        self.dangerous_imports = dangerous_imports
+        self.allowed_imports = allowed_imports
+        self.fail_fast = fail_fast
+
+    def run(self, tree: ast.AST) -> None:
+        """Apply the rules to every node of a tree."""
+        handlers = _HANDLERS
+        node_type = ast.AST
+        stack = [tree]
+        pop, push = stack.pop, stack.append
+        while stack:
+            node = pop()
+            handler = handlers.get(type(node))
+            if handler is not None:
+                handler(self, node)
+            # Push children last-first so they are visited in source order
+            for name in reversed(node._fields):
+                value = getattr(node, name, None)
+                if type(value) is list:
+                    for item in reversed(value):
+                        if isinstance(item, node_type):
+                            push(item)
+                elif isinstance(value, node_type):
+                    push(value)
+
+    def _add_finding(self, severity: str, category: str, message: str, line: Optional[int] = None) -> None:
+        """Record a finding, stopping the traversal on a blocker if failing fast."""
+        self.result.add_finding(severity, category, message, line)
+        if self.fail_fast and severity in _BLOCKING_SEVERITIES:
+            raise _Blocker()
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            self._check_import(alias.name, node.lineno)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        if node.module:
+            self._check_import(node.module, node.lineno)
+
+    def visit_Call(self, node: ast.Call) -> None:
+        if isinstance(node.func, ast.Name):
+            # Check for dangerous calls
+            if node.func.id in _FORBIDDEN_CALLS:
+                self._add_finding(
+                    "critical",
+                    "policy",
+                    f"Forbidden function call: {node.func.id}",
+                    node.lineno
+                )
+
+            # Check for file operations
+            if node.func.id in _FILE_CALLS:
+                self._add_finding(
+                    "high",
+                    "security",
+                    "File operations detected - ensure proper sandboxing",
+                    node.lineno
+                )
+
+    def visit_Attribute(self, node: ast.Attribute) -> None:
+        # Check for network operations
+        if node.attr in _NETWORK_ATTRS:
+            self._add_finding(
+                "high",
+                "security",
+                "Network operation detected",
+                node.lineno
+            )
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        # Type hint check, as done by TypeChecker
+        if not node.returns:
+            self._add_finding(
+                "low",
+                "types",
+                f"Function '{node.name}' missing return type hint",
+                node.lineno
+            )
+
+    def visit_While(self, node: ast.While) -> None:
+        # Check for infinite loop patterns
+        if isinstance(node.test, ast.Constant) and node.test.value and not _exits_loop(node.body):
+            self._add_finding(
+                "high",
+                "safety",
+                "Potential infinite loop detected",
+                node.lineno
+            )
+
+    def _check_import(self, module: str, line: int) -> None:
+        """Check if import is allowed."""
+        base_module = _base_module(module)
+
+        if base_module in self.dangerous_imports:
+            self._add_finding(
+                "critical",
+                "policy",
+                f"Forbidden import: {module}",
+                line
+            )
+        elif base_module not in self.allowed_imports:
+            self._add_finding(
+                "medium",
+                "policy",
+                f"Import requires review: {module}",
+                line
+            )
+
+
+# Rule handlers by node type
+_HANDLERS: Dict[type, Callable[[_FusedValidator, Any], None]] = {
+    ast.Import: _FusedValidator.visit_Import,
+    ast.ImportFrom: _FusedValidator.visit_ImportFrom,
+    ast.Call: _FusedValidator.visit_Call,
+    ast.Attribute: _FusedValidator.visit_Attribute,
+    ast.FunctionDef: _FusedValidator.visit_FunctionDef,
+    ast.While: _FusedValidator.visit_While,
+}
+
+
+class _ResultCache:
+    """Bounded LRU cache of validation results keyed by code content.
+
+    With a ``path``, results are also stored there as one JSON file per
+    entry, so they outlive the process. ``namespace`` separates entries of
+    validators whose results differ for the same code.
+    """
+
+    __slots__ = ("maxsize", "path", "namespace", "_entries", "_lock")
+
+    def __init__(self, maxsize: int = 512, path: Optional[Path] = None, namespace: str = ""):
+        self.maxsize = maxsize
+        self.path = path
+        self.namespace = namespace
+        self._entries: "OrderedDict[bytes, Tuple[Tuple[Any, ...], ...]]" = OrderedDict()
+        self._lock = threading.Lock()
+        if path is not None:
+            path.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(code: str) -> bytes:
+        """Content hash of code."""
+        return hashlib.blake2b(code.encode(), digest_size=16).digest()
+
+    def get(self, key: bytes) -> Optional[ValidationResult]:
+        """Rebuild the cached result for a key, if present."""
+        with self._lock:
+            findings = self._entries.get(key)
+            if findings is not None:
+                self._entries.move_to_end(key)
+
+        if findings is None:
+            findings = self._load(key)
+            if findings is None:
+                return None
+            self._remember(key, findings)
+
+        result = ValidationResult()
+        for finding in findings:
+            result.add_finding(*finding)
+        return result
+
+    def put(self, key: bytes, result: ValidationResult) -> None:
+        """Store an immutable snapshot of a result."""
+        findings = tuple(result.rows())
+        self._remember(key, findings)
+        self._store(key, findings)
+
+    def _remember(self, key: bytes, findings: Tuple[Tuple[Any, ...], ...]) -> None:
+        """Keep findings in memory, evicting the least recently used entry."""
+        with self._lock:
+            self._entries[key] = findings
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _entry_path(self, key: bytes) -> Optional[Path]:
+        """File holding the findings for a key, or None without a path."""
+        if self.path is None:
+            return None
+        return self.path / f"{self.namespace}{key.hex()}.json"
+
+    def _load(self, key: bytes) -> Optional[Tuple[Tuple[Any, ...], ...]]:
+        """Read stored findings for a key, if a path is set and has them."""
+        entry_path = self._entry_path(key)
+        if entry_path is None:
+            return None
+        try:
+            rows = loads(entry_path.read_bytes())
+        except (OSError, ValueError):
+            return None
+        return tuple(tuple(row) for row in rows)
+
+    def _store(self, key: bytes, findings: Tuple[Tuple[Any, ...], ...]) -> None:
+        """Write findings for a key, if a path is set."""
+        entry_path = self._entry_path(key)
+        if entry_path is None:
+            return
+        tmp_path = entry_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            tmp_path.write_bytes(dumps(findings))
+            tmp_path.replace(entry_path)
+        except OSError as e:
+            logger.debug("Could not store validation result: %s", e)
 
 
 class StaticValidator:
     """Static code validator implementing multiple validation layers."""
 
-    def __init__(self, allow_network: bool = False):
+    def __init__(self, allow_network: bool = False, cache_path: Optional[Path] = None):
         """Initialize validator.
         
         Args:
             allow_network: If True, allows network-related imports (urllib, requests, socket)
+            cache_path: Optional directory where validation results are kept
+                across processes
         """
         self.allow_network = allow_network
-        
-        # Always dangerous - never allow
-        self.always_dangerous = {
-            "os",
-            "subprocess",
-            "ctypes",
-            "multiprocessing",
-            "threading",
-            "__import__",
-            "eval",
-            "exec",
-            "compile"
-        }
-        
-        # Network modules - conditionally allowed
-        self.network_imports = {
-            "socket",
-            "http",
-            "urllib",
-            "requests",
-            "httpx"
-        }
-        
-        # Build dangerous imports list based on network permission
+        self.always_dangerous = _ALWAYS_DANGEROUS
+        self.network_imports = _NETWORK_IMPORTS
+
+        # Import sets are shared between validators with the same network permission
         if allow_network:
-            self.dangerous_imports = self.always_dangerous.copy()
+            self.dangerous_imports = _DANGEROUS_WITH_NETWORK
+            self.allowed_imports = _ALLOWED_WITH_NETWORK
             logger.info("Network access enabled for validation")
         else:
-            self.dangerous_imports = self.always_dangerous | self.network_imports
-
-        self.allowed_imports = {
-            "json",
-            "re",
-            "math",
-            "datetime",
-            "typing",
-            "dataclasses",
-            "collections",
-            "itertools",
-            "functools",
-            "string",
-            "statistics",
-            "decimal",
-            "fractions"
-        }
-        
-        # Add network imports to allowed if network is enabled
-        if allow_network:
-            self.allowed_imports |= self.network_imports
+            self.dangerous_imports = _DANGEROUS_WITHOUT_NETWORK
+            self.allowed_imports = _ALLOWED_WITHOUT_NETWORK
+
+        # Repaired and re-submitted code is often identical to code already
+        # seen. Results depend on the network permission and the rules.
+        namespace = "v%d-%s-%s-" % (
+            _CACHE_FORMAT,
+            "network" if allow_network else "offline",
+            _rules_digest(self.dangerous_imports, self.allowed_imports)
+        )
+        self._cache = _ResultCache(path=cache_path, namespace=namespace)
+
+    def validate(self, code: str, tree: Optional[ast.Module] = None, fail_fast: bool = False) -> ValidationResult:
+        """Run all validation checks.
 
-    def validate(self, code: str) -> ValidationResult:
-        """Run all validation checks."""
+        Args:
+            code: Source code to validate
+            tree: Already parsed AST of ``code``, parsed here if not given
+            fail_fast: Stop at the first blocking finding; the result then
+                holds only the findings recorded up to that point
+        """
+        key = self._cache.key(code)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        result, complete = self._run_checks(code, tree, fail_fast)
+        # Results cut short by fail_fast are not cached
+        if complete:
+            self._cache.put(key, result)
+        return result
+
+    def _run_checks(
+        self,
+        code: str,
+        tree: Optional[ast.Module],
+        fail_fast: bool = False
+    ) -> Tuple[ValidationResult, bool]:
+        """Run all validation layers on code.
+
+        Returns:
+            The result, and whether every layer ran to completion
+        """
         result = ValidationResult()
 
         # AST parse check
-        if not self._validate_ast(code, result):
-            return result
+        if tree is None:
+            tree = self._validate_ast(code, result)
+            if tree is None:
+                return result, True
 
-        # Policy gate check
-        self._validate_policy(code, result)
-
-        # SAST-like checks
-        self._validate_security(code, result)
+        # Policy gate, SAST-like, loop safety and type hint checks in a single traversal
+        if not self._validate_tree(tree, result, fail_fast):
+            return result, False
 
         # Additional safety checks
         self._validate_safety(code, result)
 
-        return result
+        return result, True
 
-    def _validate_ast(self, code: str, result: ValidationResult) -> bool:
-        """Validate AST parseability."""
+    def _validate_ast(self, code: str, result: ValidationResult) -> Optional[ast.Module]:
+        """Validate AST parseability, returning the parsed tree."""
+        tree = parse_code(code)
+        if tree is not None:
+            return tree
+        # Parse again uncached for the error details
         try:
-            ast.parse(code)
-            return True
+            return ast.parse(code, mode="exec", type_comments=False)
         except SyntaxError as e:
             result.add_finding(
                 "critical",
@@ -125,86 +524,22 @@ class StaticValidator:
                 f"Syntax error: {e.msg}",
                 e.lineno
             )
-            return False
-
-    def _validate_policy(self, code: str, result: ValidationResult) -> None:
-        """Validate against policy rules."""
-        try:
-            tree = ast.parse(code)
-
-            # Check imports
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Import):
-                    for alias in node.names:
-                        self._check_import(alias.name, result, node.lineno)
-
-                elif isinstance(node, ast.ImportFrom):
-                    if node.module:
-                        self._check_import(node.module, result, node.lineno)
-
-                # Check for dangerous calls
-                elif isinstance(node, ast.Call):
-                    if isinstance(node.func, ast.Name):
-                        if node.func.id in ["eval", "exec", "compile", "__import__"]:
-                            result.add_finding(
-                                "critical",
-                                "policy",
-                                f"Forbidden function call: {node.func.id}",
-                                node.lineno
-                            )
+            return None
 
-        except Exception as e:
-            logger.error(f"Policy validation error: {e}")
-            result.add_finding("high", "policy", f"Policy check failed: {e}")
-
-    def _check_import(self, module: str, result: ValidationResult, line: int) -> None:
-        """Check if import is allowed."""
-        base_module = module.split(".")[0]
+    def _validate_tree(self, tree: ast.Module, result: ValidationResult, fail_fast: bool = False) -> bool:
+        """Validate against policy rules and run security, safety and type hint checks.
 
-        if base_module in self.dangerous_imports:
-            result.add_finding(
-                "critical",
-                "policy",
-                f"Forbidden import: {module}",
-                line
-            )
-        elif base_module not in self.allowed_imports:
-            result.add_finding(
-                "medium",
-                "policy",
-                f"Import requires review: {module}",
-                line
-            )
-
-    def _validate_security(self, code: str, result: ValidationResult) -> None:
-        """SAST-like security checks."""
+        Returns:
+            False if the traversal stopped early at a blocker
+        """
         try:
-            tree = ast.parse(code)
-
-            for node in ast.walk(tree):
-                # Check for file operations
-                if isinstance(node, ast.Call):
-                    if isinstance(node.func, ast.Name):
-                        if node.func.id in ["open", "file"]:
-                            result.add_finding(
-                                "high",
-                                "security",
-                                "File operations detected - ensure proper sandboxing",
-                                node.lineno
-                            )
-
-                # Check for network operations
-                if isinstance(node, ast.Attribute):
-                    if node.attr in ["urlopen", "get", "post", "request"]:
-                        result.add_finding(
-                            "high",
-                            "security",
-                            "Network operation detected",
-                            node.lineno
-                        )
-
+            _FusedValidator(result, self.dangerous_imports, self.allowed_imports, fail_fast).run(tree)
+        except _Blocker:
+            return False
         except Exception as e:
-            logger.error(f"Security validation error: {e}")
+            logger.error("Policy validation error: %s", e)
+            result.add_finding("high", "policy", f"Policy check failed: {e}")
+        return True
 
     def _validate_safety(self, code: str, result: ValidationResult) -> None:
         """Additional safety checks."""
@@ -216,26 +551,40 @@ class StaticValidator:
                 "Code is very long, may indicate complexity issues"
             )
 
-        # Check for infinite loop patterns (simplified)
-        if "while True:" in code and "break" not in code:
-            result.add_finding(
-                "high",
-                "safety",
-                "Potential infinite loop detected"
-            )
-
 
 class TypeChecker:
     """Type checking wrapper (simplified)."""
 
-    def check(self, code: str) -> ValidationResult:
-        """Run type checking."""
+    def __init__(self) -> None:
+        self._cache = _ResultCache()
+
+    def check(self, code: str, tree: Optional[ast.Module] = None) -> ValidationResult:
+        """Run type checking.
+
+        Args:
+            code: Source code to check
+            tree: Already parsed AST of ``code``, parsed here if not given
+        """
+        key = self._cache.key(code)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = self._check_hints(code, tree)
+        self._cache.put(key, result)
+        return result
+
+    def _check_hints(self, code: str, tree: Optional[ast.Module]) -> ValidationResult:
+        """Check that functions carry return type hints."""
         result = ValidationResult()
 
         # In production: integrate mypy or pyright
         # For now, just validate that type hints are present
         try:
-            tree = ast.parse(code)
+            if tree is None:
+                tree = parse_code(code)
+            if tree is None:
+                raise SyntaxError("invalid syntax")
             functions = [node for node in ast.walk(tree) if isinstance(node, ast.FunctionDef)]
 
             for func in functions:
@@ -248,6 +597,6 @@ class TypeChecker:
                     )
 
         except Exception as e:
-            logger.error(f"Type checking error: {e}")
+            logger.error("Type checking error: %s", e)
 
         return result
@@ -1,5 +1,7 @@
 """LLM integration module."""
 
+from evomind.llm.batching import BatchingGeminiClient
+from evomind.llm.cache import LLMCache
 from evomind.llm.gemini_client import GeminiClient
 
-__all__ = ["GeminiClient"]
+__all__ = ["BatchingGeminiClient", "GeminiClient", "LLMCache"]
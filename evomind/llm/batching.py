@@ -0,0 +1,126 @@
+"""Client-side micro-batching of concurrent code generation requests."""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from evomind.llm.gemini_client import GeminiClient
+
+logger = logging.getLogger(__name__)
+
+
+class BatchingGeminiClient:
+    """Collect concurrent code generation requests into batched prompts.
+
+    Requests arriving within ``max_wait_ms`` of the first one in a batch,
+    up to ``max_batch`` of them, are sent as a single multi-function prompt
+    through :meth:`GeminiClient.generate_code_batch_async` and the results
+    are handed back to each caller. Batches are dispatched without waiting
+    for earlier ones to finish.
+
+    Args:
+        client: Client used for the batched calls
+        max_batch: Most specs in one prompt
+        max_wait_ms: Longest a request waits for others to join its batch
+    """
+
+    def __init__(self, client: GeminiClient, max_batch: int = 6, max_wait_ms: float = 20.0):
+        self.client = client
+        self.max_batch = max_batch
+        self.max_wait_ms = max_wait_ms
+
+        self._queue: Optional["asyncio.Queue[Tuple[Dict[str, Any], asyncio.Future]]"] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._dispatcher: Optional["asyncio.Task[None]"] = None
+        self._tasks: Set["asyncio.Task[None]"] = set()
+
+    async def generate_code(self, spec: Dict[str, Any]) -> str:
+        """Generate code for a tool specification as part of a batch.
+
+        Args:
+            spec: Tool specification with name, description, io_spec and
+                optional constraints
+
+        Returns:
+            Generated Python code
+        """
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        if self._loop is not loop or queue is None:
+            # Queues and tasks belong to one event loop
+            self._loop = loop
+            queue = self._queue = asyncio.Queue()
+            self._dispatcher = loop.create_task(self._dispatch(queue))
+
+        future: "asyncio.Future[str]" = loop.create_future()
+        await queue.put((spec, future))
+        return await future
+
+    async def aclose(self) -> None:
+        """Stop collecting batches and wait for dispatched ones to finish.
+
+        Requests already waiting for a batch are dispatched first, so every
+        pending caller gets an answer.
+        """
+        # Later requests start a new queue and dispatcher
+        dispatcher, self._dispatcher = self._dispatcher, None
+        self._loop = None
+        if dispatcher is not None:
+            dispatcher.cancel()
+            await asyncio.gather(dispatcher, return_exceptions=True)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _dispatch(self, queue: "asyncio.Queue[Tuple[Dict[str, Any], asyncio.Future]]") -> None:
+        """Group queued requests into batches and launch them."""
+        loop = asyncio.get_running_loop()
+        batch: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        try:
+            while True:
+                batch = [await queue.get()]
+                deadline = loop.time() + self.max_wait_ms / 1000
+
+                while len(batch) < self.max_batch:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(queue.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+
+                self._launch(batch)
+                batch = []
+        except asyncio.CancelledError:
+            # Launch the batch being collected and everything still queued
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            for start in range(0, len(batch), self.max_batch):
+                self._launch(batch[start:start + self.max_batch])
+            raise
+
+    def _launch(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        """Start generating one batch without waiting for it."""
+        task = asyncio.get_running_loop().create_task(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        """Generate code for one batch and resolve its callers' futures."""
+        specs = [spec for spec, _ in batch]
+        logger.debug("Dispatching code generation batch of %d", len(specs))
+
+        try:
+            if len(specs) == 1:
+                codes = [await self.client._generate_spec_code_async(specs[0])]
+            else:
+                codes = await self.client.generate_code_batch_async(specs, batch_size=len(specs))
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), code in zip(batch, codes):
+            if not future.done():
+                future.set_result(code)
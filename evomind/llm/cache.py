@@ -0,0 +1,224 @@
+"""Response caching for LLM calls.
+
+Deterministic (low temperature) requests are cached by an exact key over
+the model, prompt, system instruction and generation settings. An optional
+semantic tier matches near-duplicate prompts by embedding similarity.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Optional, Sequence, Tuple
+
+from evomind.observability.metrics import MetricsCollector, get_metrics_collector
+from evomind.utils.serialization import dumps, loads
+
+logger = logging.getLogger(__name__)
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+
+class MemoryBackend:
+    """In-process LRU cache backend."""
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[str, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached value, if present and not expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        """Cache a value, optionally expiring after ``ttl`` seconds."""
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+class FileBackend:
+    """Cache backend storing one JSON file per entry."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path or Path.home() / ".evomind" / "llm_cache"
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached value, if present and not expired."""
+        entry_path = self.path / f"{key}.json"
+        try:
+            entry = loads(entry_path.read_bytes())
+        except (OSError, ValueError):
+            return None
+
+        expires_at = entry.get("expires_at")
+        if expires_at is not None and expires_at <= time.time():
+            entry_path.unlink(missing_ok=True)
+            return None
+        value: str = entry["value"]
+        return value
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        """Cache a value, optionally expiring after ``ttl`` seconds."""
+        entry = {"value": value, "expires_at": time.time() + ttl if ttl else None}
+        entry_path = self.path / f"{key}.json"
+        # A temp file per writer, so concurrent writes of a key never
+        # publish each other's partial files
+        tmp_path = entry_path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            tmp_path.write_bytes(dumps(entry))
+            tmp_path.replace(entry_path)
+        except OSError as e:
+            logger.warning("Could not write LLM cache entry: %s", e)
+            tmp_path.unlink(missing_ok=True)
+
+
+class RedisBackend:
+    """Cache backend on a Redis server (requires the redis package)."""
+
+    def __init__(self, url: str = "redis://localhost:6379/0", prefix: str = "evomind:llm:"):
+        if not REDIS_AVAILABLE:
+            raise ImportError("redis is required for RedisBackend. Install with: pip install redis")
+
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached value, if present."""
+        value = self.client.get(self.prefix + key)
+        return value.decode() if value is not None else None
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None) -> None:
+        """Cache a value, optionally expiring after ``ttl`` seconds."""
+        self.client.set(self.prefix + key, value, ex=int(ttl) if ttl else None)
+
+
+def _normalize(vector: Sequence[float]) -> Tuple[float, ...]:
+    """Scale a vector to unit length."""
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return tuple(v / norm for v in vector)
+
+
+class LLMCache:
+    """Two-tier cache for LLM responses.
+
+    Args:
+        backend: Storage for exact-match entries (defaults to MemoryBackend)
+        ttl: Seconds entries stay valid
+        max_temperature: Requests above this temperature are never cached
+        embed: Optional function mapping a prompt to an embedding vector,
+            enabling the semantic tier
+        similarity_threshold: Minimum cosine similarity for a semantic hit
+        max_semantic_entries: Number of prompt embeddings kept for matching
+        metrics: Collector for hit and miss counters
+    """
+
+    def __init__(
+        self,
+        backend: Optional[Any] = None,
+        ttl: Optional[float] = 3600,
+        max_temperature: float = 0.3,
+        embed: Optional[Callable[[str], Sequence[float]]] = None,
+        similarity_threshold: float = 0.92,
+        max_semantic_entries: int = 1024,
+        metrics: Optional[MetricsCollector] = None
+    ):
+        self.backend = backend or MemoryBackend()
+        self.ttl = ttl
+        self.max_temperature = max_temperature
+        self.embed = embed
+        self.similarity_threshold = similarity_threshold
+        self.metrics = metrics or get_metrics_collector()
+
+        # (settings key, unit embedding, exact key) of recently stored prompts
+        self._semantic: Deque[Tuple[str, Tuple[float, ...], str]] = deque(maxlen=max_semantic_entries)
+        self._lock = threading.Lock()
+
+    def cacheable(self, temperature: float) -> bool:
+        """Check if requests at a temperature are deterministic enough to cache."""
+        return temperature <= self.max_temperature
+
+    @staticmethod
+    def make_key(request: Dict[str, Any]) -> str:
+        """Exact cache key of a request."""
+        return hashlib.sha256(json.dumps(request, sort_keys=True).encode()).hexdigest()
+
+    @staticmethod
+    def _settings_key(request: Dict[str, Any]) -> str:
+        """Key of everything in a request except the prompt."""
+        return LLMCache.make_key({k: v for k, v in request.items() if k != "prompt"})
+
+    def get(self, request: Dict[str, Any]) -> Optional[str]:
+        """Look up a cached response for a request.
+
+        Args:
+            request: Dict with model, prompt, system_instruction, temperature
+                and max_tokens
+        """
+        value = self.backend.get(self.make_key(request))
+        if value is not None:
+            self.metrics.increment_counter("llm_cache_hits_total", labels={"tier": "exact"})
+            return value
+
+        if self.embed is not None:
+            value = self._get_semantic(request, self.embed)
+            if value is not None:
+                self.metrics.increment_counter("llm_cache_hits_total", labels={"tier": "semantic"})
+                return value
+
+        self.metrics.increment_counter("llm_cache_misses_total")
+        return None
+
+    def set(self, request: Dict[str, Any], value: str) -> None:
+        """Cache the response to a request."""
+        key = self.make_key(request)
+        self.backend.set(key, value, ttl=self.ttl)
+
+        if self.embed is not None:
+            vector = _normalize(self.embed(request["prompt"]))
+            with self._lock:
+                self._semantic.append((self._settings_key(request), vector, key))
+
+    def _get_semantic(self, request: Dict[str, Any], embed: Callable[[str], Sequence[float]]) -> Optional[str]:
+        """Find the response of the most similar cached prompt with the same settings."""
+        settings = self._settings_key(request)
+        vector = _normalize(embed(request["prompt"]))
+
+        with self._lock:
+            candidates = [(v, key) for s, v, key in self._semantic if s == settings]
+
+        best_key = None
+        best_score = self.similarity_threshold
+        for candidate, key in candidates:
+            score = sum(a * b for a, b in zip(vector, candidate))
+            if score >= best_score:
+                best_key, best_score = key, score
+
+        if best_key is None:
+            return None
+        return self.backend.get(best_key)
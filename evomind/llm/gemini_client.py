@@ -1,19 +1,174 @@
 """Google Gemini LLM client wrapper."""
 
+import asyncio
+import hashlib
 import logging
 import os
-from typing import Dict, Any, Optional, List
-from google import genai
-from tenacity import retry, stop_after_attempt, wait_exponential
+import re
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, cast
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_random_exponential
+
+from evomind.llm.cache import LLMCache
+from evomind.utils.serialization import loads
+
+if TYPE_CHECKING:
+    from google import genai
+    from google.genai import types
 
 logger = logging.getLogger(__name__)
 
+# Code generation instructions are assembled from fixed modules, so every
+# code request shares one system instruction (one context cache, and an
+# identical prefix for implicit caching) and prompts carry only the spec
+_CODE_ROLE_MODULE = """You are an expert Python code generator.
+Generate clean, efficient, well-documented Python code.
+Follow PEP 8 style guidelines and Python 3.10+ best practices."""
+
+_CODE_TYPING_MODULE = """CRITICAL RULES:
+- Use lowercase built-in types: list, dict, tuple, set (NOT List, Dict, Tuple, Set from typing)
+- For type hints: list[int], dict[str, str], etc. (Python 3.10+ syntax)
+- NEVER instantiate type objects: NO List(), Dict(), Set() - use list(), dict(), set()
+- Only import from typing if you need Union, Optional, Any"""
+
+_CODE_SAFETY_MODULE = """Sandbox rules:
+- Do NOT use network imports (requests, urllib, socket) - they will be blocked
+- Only use safe built-in modules: json, math, re, datetime, collections, itertools"""
+
+_CODE_CONTRACT_MODULE = """Every function must:
+- Include a comprehensive docstring
+- Handle errors gracefully with try/except
+- Return a dictionary with 'status' and 'result' keys
+
+Return ONLY the function code - no explanations, no markdown, no ``` blocks.
+Do NOT wrap the code in ```python or ``` markers."""
+
+CODE_SYSTEM_INSTRUCTION = "\n\n".join(
+    (_CODE_ROLE_MODULE, _CODE_TYPING_MODULE, _CODE_SAFETY_MODULE, _CODE_CONTRACT_MODULE)
+)
+
+PLAN_SYSTEM_INSTRUCTION = """You are an AI planning assistant.
+Analyze tasks and create structured execution plans.
+Be concise and practical.
+Return JSON format only."""
+
+REPAIR_SYSTEM_INSTRUCTION = """You are a Python code repair expert.
+Fix validation errors while preserving functionality.
+IMPORTANT: Return ONLY the corrected Python code without any markdown formatting, explanations, or code blocks.
+Do NOT wrap the code in ```python or ``` markers."""
+
+CHAT_SYSTEM_INSTRUCTION = """You are EvoMind, an AI coding assistant.
+Help users with code generation, planning, and problem-solving.
+Be helpful, concise, and technical."""
+
+# HTTP statuses of transient API failures
+_RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+def _is_retryable(error: BaseException) -> bool:
+    """Check if an API error is transient and worth retrying."""
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    code = getattr(error, "status_code", None) or getattr(error, "code", None)
+    if code is None:
+        code = getattr(getattr(error, "response", None), "status_code", None)
+    return code in _RETRYABLE_STATUS
+
+
+# Full-jitter exponential backoff on transient failures; other errors fail fast
+_api_retry = retry(
+    stop=stop_after_attempt(5),
+    wait=wait_random_exponential(multiplier=1, max=30),
+    retry=retry_if_exception(_is_retryable),
+    reraise=True
+)
+
+# Delimited function blocks in a batched code generation response
+_BATCH_BLOCK_RE = re.compile(r"<<<FUNC (\d+)>>>(.*?)<<<END \1>>>", re.DOTALL)
+
+# Markdown fence around a code response, and the first line of actual code
+_FENCE_RE = re.compile(r"\A(?:```(?:python)?)?(.*?)(?:```)?\Z", re.DOTALL)
+_CODE_START_RE = re.compile(r"^[ \t]*(?:def |class |import |from |@)", re.MULTILINE)
+
+# Highest temperature at which identical requests are coalesced when no
+# response cache defines its own limit
+_DETERMINISTIC_TEMPERATURE = 0.3
+
+# Seconds before expiry at which a server-side context cache is recreated
+_CONTEXT_CACHE_MARGIN = 60.0
+
+# Largest response, in tokens, each model accepts for max_output_tokens
+_MAX_OUTPUT_TOKENS: Dict[str, int] = {
+    "gemini-2.0-flash-exp": 8192,
+    "gemini-2.0-flash": 8192,
+    "gemini-1.5-flash": 8192,
+    "gemini-1.5-pro": 8192,
+    "gemini-2.5-flash": 65536,
+    "gemini-2.5-pro": 65536,
+}
+_DEFAULT_MAX_OUTPUT_TOKENS = 8192
+
+
+# genai clients by hash of their API key, shared so instances reuse connections
+_CLIENT_CACHE: Dict[str, "genai.Client"] = {}
+_CLIENT_LOCK = threading.Lock()
+
+
+def _shared_client(api_key: Optional[str]) -> "genai.Client":
+    """Get the genai client for an API key, creating it on first use.
+
+    The google-genai SDK is imported here rather than with the module, so
+    code that only references GeminiClient does not pay for loading it.
+    """
+    from google import genai
+
+    key = hashlib.sha256((api_key or "").encode()).hexdigest()
+    with _CLIENT_LOCK:
+        client = _CLIENT_CACHE.get(key)
+        if client is None:
+            # Without a key the client will try to get one from the environment
+            client = genai.Client(api_key=api_key) if api_key else genai.Client()
+            _CLIENT_CACHE[key] = client
+        return client
+
+
+def _extract_json(text: str) -> Optional[str]:
+    """Find the first balanced ``{...}`` span in text, skipping string literals."""
+    start = text.find("{")
+    if start < 0:
+        return None
+
+    depth = 0
+    in_string = False
+    escaped = False
+    for index in range(start, len(text)):
+        char = text[index]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:index + 1]
+    return None
+
 
 class GeminiClient:
     """Wrapper for Google Gemini API.
 
     Uses the google-genai library to interact with Gemini models.
-    API key is read from GEMINI_API_KEY environment variable.
+    API key is read from GEMINI_API_KEY environment variable. Instances
+    using the same API key share one underlying genai client, and with it
+    one HTTP connection pool.
     """
 
     def __init__(
@@ -21,7 +176,11 @@ class GeminiClient:
         model: str = "gemini-2.0-flash-exp",
         api_key: Optional[str] = None,
         temperature: float = 0.7,
-        max_tokens: int = 4096
+        max_tokens: int = 4096,
+        cache: Optional[LLMCache] = None,
+        dead_letter: Optional[Callable[[Dict[str, Any]], None]] = None,
+        context_cache: bool = False,
+        context_cache_ttl: int = 3600
     ):
         """Initialize Gemini client.
 
@@ -30,25 +189,37 @@ class GeminiClient:
             api_key: API key (reads from GEMINI_API_KEY env var if not provided)
             temperature: Sampling temperature (0.0 to 1.0)
             max_tokens: Maximum tokens to generate
+            cache: Optional response cache for deterministic requests
+            dead_letter: Optional callback receiving requests that failed
+                after all retries, for offline reprocessing
+            context_cache: Store each system instruction in a server-side
+                context cache and reference it instead of resending it.
+                Models reject instructions below their minimum cacheable
+                size; those are sent inline.
+            context_cache_ttl: Seconds a server-side context cache lives
         """
         self.model = model
         self.temperature = temperature
         self.max_tokens = max_tokens
+        self.cache = cache
+        self.dead_letter = dead_letter
+        self.context_cache = context_cache
+        self.context_cache_ttl = context_cache_ttl
+
+        # Hash of system instruction -> (cache name or None if it could not
+        # be cached, time to recreate it)
+        self._context_caches: Dict[str, Tuple[Optional[str], float]] = {}
+        self._context_lock = threading.Lock()
+
+        # Cache key -> task of an identical deterministic request in flight
+        self._inflight: Dict[str, "asyncio.Future[str]"] = {}
 
-        # Initialize client - API key from environment
-        api_key = api_key or os.getenv("GEMINI_API_KEY")
-        if api_key:
-            self.client = genai.Client(api_key=api_key)
-        else:
-            # Client will try to get key from environment
-            self.client = genai.Client()
+        # Initialize client - API key from environment. Instances with the
+        # same key share one client and its connection pool.
+        self.client = _shared_client(api_key or os.getenv("GEMINI_API_KEY"))
 
         logger.info(f"Initialized Gemini client with model: {model}")
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10)
-    )
     def generate_content(
         self,
         prompt: str,
@@ -57,6 +228,9 @@ class GeminiClient:
     ) -> str:
         """Generate content using Gemini.
 
+        Deterministic requests are answered from the response cache when
+        one is configured.
+
         Args:
             prompt: The prompt to send to Gemini
             system_instruction: Optional system instruction
@@ -68,32 +242,220 @@ class GeminiClient:
         Raises:
             Exception: If API call fails after retries
         """
+        config = self._build_config(system_instruction, kwargs)
+        request = self._cache_request(prompt, config)
+        if request is not None and self.cache is not None:
+            cached = self.cache.get(request)
+            if cached is not None:
+                return cached
+
+        try:
+            text = self._generate(prompt, config)
+        except Exception as e:
+            self._dead_letter(prompt, config, e)
+            raise
+        if request is not None and self.cache is not None:
+            self.cache.set(request, text)
+        return text
+
+    async def generate_content_async(
+        self,
+        prompt: str,
+        system_instruction: Optional[str] = None,
+        **kwargs
+    ) -> str:
+        """Generate content using Gemini without blocking the event loop.
+
+        Uses the client's native ``aio`` API, so concurrent calls overlap
+        their HTTP I/O. Concurrent identical deterministic requests share a
+        single API call. Takes the same arguments as :meth:`generate_content`.
+        """
+        config = self._build_config(system_instruction, kwargs)
+        if not self._deterministic(config["temperature"]):
+            return await self._generate_content_async(prompt, config)
+
+        key = LLMCache.make_key(self._describe_request(prompt, config))
+        task = self._inflight.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = asyncio.ensure_future(self._generate_content_async(prompt, config))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._forget_inflight(key, done))
+
+        # Shielded so one caller being cancelled does not cancel the others
+        return await asyncio.shield(task)
+
+    def _forget_inflight(self, key: str, task: "asyncio.Future[str]") -> None:
+        """Drop a finished request from the in-flight map."""
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    async def _generate_content_async(self, prompt: str, config: Dict[str, Any]) -> str:
+        """Answer a request from the cache or the API."""
+        request = self._cache_request(prompt, config)
+        if request is not None and self.cache is not None:
+            cached = self.cache.get(request)
+            if cached is not None:
+                return cached
+
         try:
-            # Build config
-            config = {
-                "temperature": kwargs.get("temperature", self.temperature),
-                "max_output_tokens": kwargs.get("max_tokens", self.max_tokens),
-            }
+            text = await self._generate_async(prompt, config)
+        except Exception as e:
+            self._dead_letter(prompt, config, e)
+            raise
+        if request is not None and self.cache is not None:
+            self.cache.set(request, text)
+        return text
 
-            # Add system instruction if provided
-            contents = prompt
-            if system_instruction:
-                config["system_instruction"] = system_instruction
+    @_api_retry
+    def _generate(self, prompt: str, config: Dict[str, Any]) -> str:
+        """Call the Gemini API, retrying failures."""
+        try:
+            if self.context_cache and "system_instruction" in config:
+                config = self._with_cached_content(
+                    config, self._context_cache_name(config["system_instruction"])
+                )
 
             # Call Gemini API
             response = self.client.models.generate_content(
                 model=self.model,
-                contents=contents,
-                config=config
+                contents=prompt,
+                config=cast("types.GenerateContentConfigDict", config)
             )
 
             logger.debug(f"Gemini API call successful")
-            return response.text
+            return response.text or ""
 
         except Exception as e:
             logger.error(f"Gemini API error: {e}")
             raise
 
+    @_api_retry
+    async def _generate_async(self, prompt: str, config: Dict[str, Any]) -> str:
+        """Call the Gemini aio API, retrying failures."""
+        try:
+            if self.context_cache and "system_instruction" in config:
+                config = self._with_cached_content(
+                    config, await self._context_cache_name_async(config["system_instruction"])
+                )
+
+            response = await self.client.aio.models.generate_content(
+                model=self.model,
+                contents=prompt,
+                config=cast("types.GenerateContentConfigDict", config)
+            )
+
+            logger.debug("Gemini async API call successful")
+            return response.text or ""
+
+        except Exception as e:
+            logger.error("Gemini API error: %s", e)
+            raise
+
+    @staticmethod
+    def _with_cached_content(config: Dict[str, Any], name: Optional[str]) -> Dict[str, Any]:
+        """Swap the system instruction in a config for a context cache reference."""
+        if name is None:
+            return config
+        config = {k: v for k, v in config.items() if k != "system_instruction"}
+        config["cached_content"] = name
+        return config
+
+    def _context_cache_key(self, system_instruction: str) -> str:
+        """Key of a system instruction's context cache."""
+        return hashlib.sha256(f"{self.model}\0{system_instruction}".encode()).hexdigest()
+
+    def _fresh_context_cache(self, key: str) -> Optional[Tuple[Optional[str], float]]:
+        """Entry for a context cache key, or None if it is missing or due for refresh."""
+        with self._context_lock:
+            entry = self._context_caches.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            return entry
+        return None
+
+    def _store_context_cache(self, key: str, name: Optional[str]) -> Optional[str]:
+        """Remember a created cache, or that the instruction cannot be cached."""
+        refresh_at = time.monotonic() + max(self.context_cache_ttl - _CONTEXT_CACHE_MARGIN, 0.0)
+        with self._context_lock:
+            self._context_caches[key] = (name, refresh_at)
+        return name
+
+    def _context_cache_config(self, system_instruction: str) -> "types.CreateCachedContentConfigDict":
+        """Config for creating a context cache holding a system instruction."""
+        return {"system_instruction": system_instruction, "ttl": f"{self.context_cache_ttl}s"}
+
+    def _context_cache_name(self, system_instruction: str) -> Optional[str]:
+        """Name of the context cache holding a system instruction, creating it if needed."""
+        key = self._context_cache_key(system_instruction)
+        entry = self._fresh_context_cache(key)
+        if entry is not None:
+            return entry[0]
+
+        try:
+            cached = self.client.caches.create(model=self.model, config=self._context_cache_config(system_instruction))
+        except Exception as e:
+            logger.debug("Context cache unavailable, sending system instruction inline: %s", e)
+            return self._store_context_cache(key, None)
+        return self._store_context_cache(key, cached.name)
+
+    async def _context_cache_name_async(self, system_instruction: str) -> Optional[str]:
+        """Async variant of :meth:`_context_cache_name`."""
+        key = self._context_cache_key(system_instruction)
+        entry = self._fresh_context_cache(key)
+        if entry is not None:
+            return entry[0]
+
+        try:
+            cached = await self.client.aio.caches.create(
+                model=self.model, config=self._context_cache_config(system_instruction)
+            )
+        except Exception as e:
+            logger.debug("Context cache unavailable, sending system instruction inline: %s", e)
+            return self._store_context_cache(key, None)
+        return self._store_context_cache(key, cached.name)
+
+    def _dead_letter(self, prompt: str, config: Dict[str, Any], error: Exception) -> None:
+        """Hand a request that exhausted its retries to the dead-letter callback."""
+        if self.dead_letter is None:
+            return
+        try:
+            self.dead_letter({"model": self.model, "prompt": prompt, "config": config, "error": str(error)})
+        except Exception as e:
+            logger.error("Dead-letter callback failed: %s", e)
+
+    def _deterministic(self, temperature: float) -> bool:
+        """Check if identical requests at a temperature should get the same response."""
+        if self.cache is not None:
+            return self.cache.cacheable(temperature)
+        return temperature <= _DETERMINISTIC_TEMPERATURE
+
+    def _cache_request(self, prompt: str, config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Describe a request for the response cache, or None if it is not cacheable."""
+        if self.cache is None or not self.cache.cacheable(config["temperature"]):
+            return None
+        return self._describe_request(prompt, config)
+
+    def _describe_request(self, prompt: str, config: Dict[str, Any]) -> Dict[str, Any]:
+        """Fields identifying a request's response."""
+        return {
+            "model": self.model,
+            "prompt": prompt,
+            "system_instruction": config.get("system_instruction"),
+            "temperature": config["temperature"],
+            "max_tokens": config["max_output_tokens"]
+        }
+
+    def _build_config(self, system_instruction: Optional[str], kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the generation config for a request."""
+        config = {
+            "temperature": kwargs.get("temperature", self.temperature),
+            "max_output_tokens": kwargs.get("max_tokens", self.max_tokens),
+        }
+
+        # Add system instruction if provided
+        if system_instruction:
+            config["system_instruction"] = system_instruction
+        return config
+
     def generate_code(
         self,
         task_description: str,
@@ -112,52 +474,181 @@ class GeminiClient:
         Returns:
             Generated Python code
         """
-        system_instruction = """You are an expert Python code generator.
-Generate clean, efficient, well-documented Python code.
-Follow PEP 8 style guidelines and Python 3.10+ best practices.
+        response = self.generate_content(
+            prompt=self._code_prompt(task_description, function_name, io_spec, constraints),
+            system_instruction=CODE_SYSTEM_INSTRUCTION,
+            temperature=0.3  # Lower temperature for code generation
+        )
 
-CRITICAL RULES:
-- Use lowercase built-in types: list, dict, tuple, set (NOT List, Dict, Tuple, Set from typing)
-- For type hints: list[int], dict[str, str], etc. (Python 3.10+ syntax)
-- NEVER instantiate type objects: NO List(), Dict(), Set() - use list(), dict(), set()
-- Only import from typing if you need Union, Optional, Any
-- Return ONLY the function code - no explanations, no markdown, no ``` blocks
-Do NOT wrap the code in ```python or ``` markers."""
+        # Clean up the response - remove markdown code blocks if present
+        return self._clean_code_response(response)
 
-        prompt = f"""Generate a Python function with the following specifications:
+    async def generate_code_async(
+        self,
+        task_description: str,
+        function_name: str,
+        io_spec: Dict[str, Any],
+        constraints: Optional[Dict[str, Any]] = None
+    ) -> str:
+        """Async variant of :meth:`generate_code`."""
+        response = await self.generate_content_async(
+            prompt=self._code_prompt(task_description, function_name, io_spec, constraints),
+            system_instruction=CODE_SYSTEM_INSTRUCTION,
+            temperature=0.3
+        )
+        return self._clean_code_response(response)
 
-Function Name: {function_name}
-Description: {task_description}
+    def _code_prompt(
+        self,
+        task_description: str,
+        function_name: str,
+        io_spec: Dict[str, Any],
+        constraints: Optional[Dict[str, Any]]
+    ) -> str:
+        """Build the prompt for generating a single function."""
+        lines = [
+            "Generate a Python function with the following specifications:",
+            "",
+            f"Function Name: {function_name}",
+            f"Description: {task_description}",
+            "",
+            "Input Specification:",
+            str(io_spec.get('input', 'dict with parameters')),
+            "",
+            "Output Specification:",
+            str(io_spec.get('output', 'dict with results')),
+        ]
+        if constraints:
+            lines += [
+                "",
+                f"- Must complete within {constraints.get('timeout', 30)} seconds",
+                f"- Memory usage under {constraints.get('memory_mb', 512)}MB",
+            ]
+        return "\n".join(lines)
+
+    def generate_code_batch(self, specs: List[Dict[str, Any]], batch_size: int = 6) -> List[str]:
+        """Generate Python code for several tool specifications.
+
+        Specs are packed ``batch_size`` at a time into a single prompt, so
+        the system instruction and requirements are sent once per batch.
+        Batches are made smaller when their combined ``max_tokens`` would
+        exceed the model's output limit.
+        A batch whose response cannot be split into one function per spec
+        is generated one spec at a time instead.
 
-Input Specification:
-{io_spec.get('input', 'dict with parameters')}
+        Args:
+            specs: Tool specifications with name, description, io_spec and constraints
+            batch_size: Maximum number of specs per request
 
-Output Specification:
-{io_spec.get('output', 'dict with results')}
+        Returns:
+            Generated Python code for each spec, in order
+        """
+        batch_size = self._code_batch_size(batch_size)
+        codes: List[str] = []
+        for start in range(0, len(specs), batch_size):
+            batch = specs[start:start + batch_size]
+            response = self.generate_content(
+                prompt=self._code_batch_prompt(batch),
+                system_instruction=CODE_SYSTEM_INSTRUCTION,
+                temperature=0.3,
+                max_tokens=self._code_batch_tokens(len(batch))
+            )
 
-Requirements:
-- Include comprehensive docstring
-- Use modern Python 3.10+ type hints: list[int], dict[str, any] (NOT List, Dict from typing module)
-- NEVER use List(), Dict(), Set(), Tuple() - always use list(), dict(), set(), tuple()
-- Handle errors gracefully with try/except
-- Return a dictionary with 'status' and 'result' keys
-{"- Must complete within " + str(constraints.get('timeout', 30)) + " seconds" if constraints else ""}
-{"- Memory usage under " + str(constraints.get('memory_mb', 512)) + "MB" if constraints else ""}
-- Do NOT use network imports (requests, urllib, socket) - they will be blocked
-- Only use safe built-in modules: json, math, re, datetime, collections, itertools
+            batch_codes = self._split_code_batch(response, len(batch))
+            if batch_codes is None:
+                logger.warning("Could not split batched response for %d functions, generating individually", len(batch))
+                batch_codes = [self._generate_spec_code(spec) for spec in batch]
+            codes.extend(batch_codes)
+
+        return codes
+
+    async def generate_code_batch_async(self, specs: List[Dict[str, Any]], batch_size: int = 6) -> List[str]:
+        """Async variant of :meth:`generate_code_batch`; batches are requested concurrently."""
+        async def generate_batch(batch: List[Dict[str, Any]]) -> List[str]:
+            response = await self.generate_content_async(
+                prompt=self._code_batch_prompt(batch),
+                system_instruction=CODE_SYSTEM_INSTRUCTION,
+                temperature=0.3,
+                max_tokens=self._code_batch_tokens(len(batch))
+            )
 
-Return ONLY the Python function code. No markdown, no explanations, no ```python blocks."""
+            batch_codes = self._split_code_batch(response, len(batch))
+            if batch_codes is None:
+                logger.warning("Could not split batched response for %d functions, generating individually", len(batch))
+                batch_codes = await asyncio.gather(*(self._generate_spec_code_async(spec) for spec in batch))
+            return list(batch_codes)
+
+        batch_size = self._code_batch_size(batch_size)
+        batches = await asyncio.gather(*(
+            generate_batch(specs[start:start + batch_size])
+            for start in range(0, len(specs), batch_size)
+        ))
+        return [code for batch_codes in batches for code in batch_codes]
+
+    def _output_token_limit(self) -> int:
+        """Largest max_output_tokens the configured model accepts."""
+        return _MAX_OUTPUT_TOKENS.get(self.model, _DEFAULT_MAX_OUTPUT_TOKENS)
+
+    def _code_batch_size(self, batch_size: int) -> int:
+        """Largest batch, up to ``batch_size``, whose output fits the model limit."""
+        return max(1, min(batch_size, self._output_token_limit() // self.max_tokens))
+
+    def _code_batch_tokens(self, count: int) -> int:
+        """Output token budget for a batch of ``count`` functions."""
+        return min(self.max_tokens * count, self._output_token_limit())
+
+    def _generate_spec_code(self, spec: Dict[str, Any]) -> str:
+        """Generate code for a single tool specification."""
+        return self.generate_code(
+            task_description=spec.get("description", "A generated tool"),
+            function_name=spec.get("name", "tool"),
+            io_spec=spec.get("io_spec", {}),
+            constraints=spec.get("constraints")
+        )
 
-        response = self.generate_content(
-            prompt=prompt,
-            system_instruction=system_instruction,
-            temperature=0.3  # Lower temperature for code generation
+    async def _generate_spec_code_async(self, spec: Dict[str, Any]) -> str:
+        """Async variant of :meth:`_generate_spec_code`."""
+        return await self.generate_code_async(
+            task_description=spec.get("description", "A generated tool"),
+            function_name=spec.get("name", "tool"),
+            io_spec=spec.get("io_spec", {}),
+            constraints=spec.get("constraints")
         )
-        
-        # Clean up the response - remove markdown code blocks if present
-        code = self._clean_code_response(response)
-        return code
-    
+
+    def _code_batch_prompt(self, specs: List[Dict[str, Any]]) -> str:
+        """Build one prompt asking for a numbered function per spec."""
+        sections = []
+        for index, spec in enumerate(specs, 1):
+            io_spec = spec.get("io_spec", {})
+            constraints = spec.get("constraints") or {}
+            sections.append(f"""Function {index}:
+Function Name: {spec.get('name', 'tool')}
+Description: {spec.get('description', 'A generated tool')}
+Input Specification: {io_spec.get('input', 'dict with parameters')}
+Output Specification: {io_spec.get('output', 'dict with results')}
+{"Must complete within " + str(constraints.get('timeout', 30)) + " seconds" if constraints else ""}""")
+
+        return f"""Generate {len(specs)} independent Python functions with the following specifications:
+
+{chr(10).join(sections)}
+
+Output each function i between the lines <<<FUNC i>>> and <<<END i>>>, e.g.
+<<<FUNC 1>>>
+def ...
+<<<END 1>>>
+Return ONLY the delimited Python code. No markdown, no explanations, no ```python blocks."""
+
+    def _split_code_batch(self, response: str, count: int) -> Optional[List[str]]:
+        """Split a batched response into cleaned code per function.
+
+        Returns:
+            The code for functions 1..count, or None if any is missing
+        """
+        codes = {int(index): self._clean_code_response(code) for index, code in _BATCH_BLOCK_RE.findall(response)}
+        if sorted(codes) != list(range(1, count + 1)):
+            return None
+        return [codes[index] for index in range(1, count + 1)]
+
     def _clean_code_response(self, response: str) -> str:
         """Clean code response by removing markdown and extra text.
         
@@ -167,29 +658,17 @@ Return ONLY the Python function code. No markdown, no explanations, no ```python
         Returns:
             Cleaned Python code
         """
-        # Remove leading/trailing whitespace
         code = response.strip()
-        
-        # Remove markdown code blocks
-        if code.startswith("```python"):
-            code = code[len("```python"):].strip()
-        elif code.startswith("```"):
-            code = code[3:].strip()
-        
-        if code.endswith("```"):
-            code = code[:-3].strip()
-        
-        # Remove any explanatory text before the function
-        lines = code.split('\n')
-        start_idx = 0
-        for i, line in enumerate(lines):
-            if line.strip().startswith('def ') or line.strip().startswith('import ') or line.strip().startswith('from '):
-                start_idx = i
-                break
-        
-        if start_idx > 0:
-            code = '\n'.join(lines[start_idx:])
-        
+        # Always matches; the fences are optional
+        match = _FENCE_RE.match(code)
+        if match is not None:
+            code = match.group(1).strip()
+
+        # Remove any explanatory text before the code
+        start = _CODE_START_RE.search(code)
+        if start:
+            code = code[start.start():]
+
         return code.strip()
 
     def generate_plan(
@@ -206,12 +685,29 @@ Return ONLY the Python function code. No markdown, no explanations, no ```python
         Returns:
             Plan dictionary with intent, actions, success criteria
         """
-        system_instruction = """You are an AI planning assistant.
-Analyze tasks and create structured execution plans.
-Be concise and practical.
-Return JSON format only."""
+        response = self.generate_content(
+            prompt=self._plan_prompt(task, context),
+            system_instruction=PLAN_SYSTEM_INSTRUCTION,
+            temperature=0.5
+        )
+        return self._parse_plan(task, response)
 
-        prompt = f"""Analyze this task and create an execution plan:
+    async def generate_plan_async(
+        self,
+        task: str,
+        context: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Async variant of :meth:`generate_plan`."""
+        response = await self.generate_content_async(
+            prompt=self._plan_prompt(task, context),
+            system_instruction=PLAN_SYSTEM_INSTRUCTION,
+            temperature=0.5
+        )
+        return self._parse_plan(task, response)
+
+    def _plan_prompt(self, task: str, context: Dict[str, Any]) -> str:
+        """Build the prompt for planning a task."""
+        return f"""Analyze this task and create an execution plan:
 
 Task: {task}
 
@@ -237,24 +733,13 @@ Generate a JSON plan with:
 
 Return ONLY valid JSON, no explanations."""
 
-        response = self.generate_content(
-            prompt=prompt,
-            system_instruction=system_instruction,
-            temperature=0.5
-        )
-
-        # Parse JSON response
-        import json
+    def _parse_plan(self, task: str, response: str) -> Dict[str, Any]:
+        """Parse a plan response, falling back to a generic plan."""
+        raw = _extract_json(response) or response.strip()
         try:
-            # Try to extract JSON from response
-            response_clean = response.strip()
-            if response_clean.startswith("```"):
-                # Remove markdown code blocks
-                lines = response_clean.split("\n")
-                response_clean = "\n".join(lines[1:-1])
-            return json.loads(response_clean)
-        except json.JSONDecodeError:
-            logger.warning(f"Failed to parse plan JSON: {response}")
+            return loads(raw)
+        except ValueError:
+            logger.debug("Failed to parse plan JSON: %s", response)
             # Return fallback plan
             return {
                 "intent": task,
@@ -278,17 +763,36 @@ Return ONLY valid JSON, no explanations."""
         Returns:
             Repaired code
         """
-        system_instruction = """You are a Python code repair expert.
-Fix validation errors while preserving functionality.
-IMPORTANT: Return ONLY the corrected Python code without any markdown formatting, explanations, or code blocks.
-Do NOT wrap the code in ```python or ``` markers."""
+        response = self.generate_content(
+            prompt=self._repair_prompt(original_code, validation_errors),
+            system_instruction=REPAIR_SYSTEM_INSTRUCTION,
+            temperature=0.1  # Very low temperature for repairs
+        )
+        
+        # Clean the response
+        return self._clean_code_response(response)
 
+    async def repair_code_async(
+        self,
+        original_code: str,
+        validation_errors: List[Dict[str, Any]]
+    ) -> str:
+        """Async variant of :meth:`repair_code`."""
+        response = await self.generate_content_async(
+            prompt=self._repair_prompt(original_code, validation_errors),
+            system_instruction=REPAIR_SYSTEM_INSTRUCTION,
+            temperature=0.1
+        )
+        return self._clean_code_response(response)
+
+    def _repair_prompt(self, original_code: str, validation_errors: List[Dict[str, Any]]) -> str:
+        """Build the prompt for repairing code."""
         errors_text = "\n".join([
             f"- Line {err.get('line', '?')}: {err.get('category', 'error')} - {err.get('message', 'unknown error')}"
             for err in validation_errors
         ])
 
-        prompt = f"""Fix the following Python code to resolve these validation errors:
+        return f"""Fix the following Python code to resolve these validation errors:
 
 ERRORS:
 {errors_text}
@@ -304,15 +808,6 @@ INSTRUCTIONS:
 
 Return ONLY the corrected Python code. No markdown, no explanations, no ```python blocks."""
 
-        response = self.generate_content(
-            prompt=prompt,
-            system_instruction=system_instruction,
-            temperature=0.1  # Very low temperature for repairs
-        )
-        
-        # Clean the response
-        return self._clean_code_response(response)
-
     def chat(
         self,
         message: str,
@@ -327,21 +822,28 @@ Return ONLY the corrected Python code. No markdown, no explanations, no ```pytho
         Returns:
             Assistant response
         """
-        system_instruction = """You are EvoMind, an AI coding assistant.
-Help users with code generation, planning, and problem-solving.
-Be helpful, concise, and technical."""
+        return self.generate_content(
+            prompt=self._chat_prompt(message, conversation_history),
+            system_instruction=CHAT_SYSTEM_INSTRUCTION
+        )
 
-        # Build prompt with history
+    async def chat_async(
+        self,
+        message: str,
+        conversation_history: Optional[List[Dict[str, str]]] = None
+    ) -> str:
+        """Async variant of :meth:`chat`."""
+        return await self.generate_content_async(
+            prompt=self._chat_prompt(message, conversation_history),
+            system_instruction=CHAT_SYSTEM_INSTRUCTION
+        )
+
+    def _chat_prompt(self, message: str, conversation_history: Optional[List[Dict[str, str]]]) -> str:
+        """Build a chat prompt including the conversation history."""
         if conversation_history:
             history_text = "\n".join([
                 f"{turn['role']}: {turn['content']}"
                 for turn in conversation_history
             ])
-            prompt = f"{history_text}\nuser: {message}\nassistant:"
-        else:
-            prompt = message
-
-        return self.generate_content(
-            prompt=prompt,
-            system_instruction=system_instruction
-        )
+            return f"{history_text}\nuser: {message}\nassistant:"
+        return message
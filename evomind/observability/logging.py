@@ -1,19 +1,32 @@
 """Logging configuration and utilities."""
 
+import atexit
+import copy
 import logging
+import logging.handlers
+import os
+import queue
 import sys
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from datetime import datetime, timezone
-import json
+
+from evomind.utils.serialization import dumps
+
+# Attributes every LogRecord has; anything else was passed through ``extra``
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
 
 
 class StructuredFormatter(logging.Formatter):
-    """Structured JSON formatter for logs."""
+    """Structured JSON formatter for logs.
+
+    Fields passed with ``logger.info(msg, extra={...})`` are added to the
+    entry.
+    """
 
     def format(self, record: logging.LogRecord) -> str:
         """Format log record as JSON."""
-        log_data = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+        log_data: Dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -27,10 +40,70 @@ class StructuredFormatter(logging.Formatter):
             log_data["exception"] = self.formatException(record.exc_info)
 
         # Add extra fields
-        if hasattr(record, "extra"):
-            log_data.update(record.extra)
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                log_data[key] = value
+
+        return dumps(log_data, default=str).decode()
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that defers all formatting to the listener thread.
+
+    The stock handler formats records before queueing them and drops their
+    exception info, which the structured formatter needs. Only the message
+    is resolved here, so later changes to the arguments do not leak in.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        return record
+
 
-        return json.dumps(log_data)
+# Listener writing queued records to the configured handlers, and the
+# handler feeding it
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[_QueueHandler] = None
+
+
+def _start_queue_logging(handlers: List[logging.Handler]) -> logging.Handler:
+    """Start a listener thread for handlers and return the handler feeding it."""
+    global _listener, _queue_handler
+    _stop_queue_logging()
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    _queue_handler = _QueueHandler(log_queue)
+    return _queue_handler
+
+
+def _restart_queue_logging_after_fork() -> None:
+    """Give a forked child its own listener; the parent's thread does not exist there."""
+    global _listener
+    if _listener is None or _queue_handler is None:
+        return
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(log_queue, *_listener.handlers, respect_handler_level=True)
+    _listener.start()
+    _queue_handler.queue = log_queue
+
+
+def _stop_queue_logging() -> None:
+    """Write out queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(_stop_queue_logging)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_queue_logging_after_fork)
 
 
 def setup_logging(
@@ -44,6 +117,9 @@ def setup_logging(
         level: Logging level (DEBUG, INFO, WARN, ERROR)
         structured: Use structured JSON logging
         log_file: Optional log file path
+
+    Logging calls only enqueue their records; formatting and writing happen
+    on a listener thread.
     """
     log_level = getattr(logging, level.upper(), logging.INFO)
 
@@ -56,7 +132,7 @@ def setup_logging(
         )
 
     # Setup handlers
-    handlers = []
+    handlers: List[logging.Handler] = []
 
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
@@ -69,10 +145,12 @@ def setup_logging(
         file_handler.setFormatter(formatter)
         handlers.append(file_handler)
 
-    # Configure root logger
+    # Configure root logger, replacing the handler of any earlier call
+    # whose listener is stopped by _start_queue_logging
     logging.basicConfig(
         level=log_level,
-        handlers=handlers
+        handlers=[_start_queue_logging(handlers)],
+        force=True
     )
 
     # Set third-party loggers to WARNING
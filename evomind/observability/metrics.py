@@ -1,14 +1,78 @@
 """Metrics collection using OpenTelemetry concepts."""
 
 import logging
-from typing import Dict, Any, Optional
+from typing import Deque, Dict, Any, List, Optional, Tuple
+from array import array
 from datetime import datetime, timezone
-from collections import defaultdict
+from collections import defaultdict, deque
+import random
 import threading
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
+# Buffered histogram samples a thread records before merging them itself
+_FLUSH_SAMPLES = 1024
+
+
+class _ThreadBuffer:
+    """Metrics emitted by one thread, written without locking.
+
+    Only the owning thread updates ``counters`` and appends to ``samples``;
+    the collector drains ``samples`` under its lock.
+    """
+
+    __slots__ = ("thread", "counters", "samples")
+
+    def __init__(self):
+        self.thread = threading.current_thread()
+        self.counters: Dict[str, int] = defaultdict(int)
+        self.samples: Deque[Tuple[str, float]] = deque()
+
+
+class _Reservoir:
+    """Uniform sample of a histogram's values with exact running aggregates.
+
+    Keeps at most ``size`` samples using reservoir sampling (Algorithm R);
+    count, sum, min and max cover every added value.
+    """
+
+    __slots__ = ("size", "count", "total", "minimum", "maximum", "samples")
+
+    def __init__(self, size: int):
+        self.size = size
+        self.count = 0
+        self.total = 0.0
+        self.minimum = float("inf")
+        self.maximum = float("-inf")
+        self.samples = array("d")
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def add(self, value: float) -> None:
+        """Add one value."""
+        self.count += 1
+        self.total += value
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+
+        if len(self.samples) < self.size:
+            self.samples.append(value)
+        else:
+            slot = random.randrange(self.count)
+            if slot < self.size:
+                self.samples[slot] = value
+
+
 class MetricsCollector:
     """Metrics collector for agent operations.
     
@@ -16,23 +80,82 @@ class MetricsCollector:
     In production: export to Prometheus/OpenTelemetry.
     """
 
-    def __init__(self):
+    def __init__(self, max_histogram_samples: int = 10000):
+        """Initialize collector.
+
+        Args:
+            max_histogram_samples: Samples kept per histogram for percentiles;
+                beyond this a uniform reservoir sample is kept. Count, sum,
+                min and max always cover every recorded value.
+        """
+        self.max_histogram_samples = max_histogram_samples
         self._lock = threading.Lock()
+        self._local = threading.local()
+        self._buffers: List[_ThreadBuffer] = []
+        # Counters of threads that have exited
         self._counters: Dict[str, int] = defaultdict(int)
-        self._histograms: Dict[str, list] = defaultdict(list)
+        self._histograms: Dict[str, _Reservoir] = {}
         self._gauges: Dict[str, float] = {}
 
     def increment_counter(self, name: str, value: int = 1, labels: Optional[Dict[str, str]] = None) -> None:
         """Increment counter metric."""
         key = self._make_key(name, labels)
-        with self._lock:
-            self._counters[key] += value
+        self._buffer().counters[key] += value
 
     def record_histogram(self, name: str, value: float, labels: Optional[Dict[str, str]] = None) -> None:
         """Record histogram value."""
         key = self._make_key(name, labels)
-        with self._lock:
-            self._histograms[key].append(value)
+        buffer = self._buffer()
+        buffer.samples.append((key, value))
+
+        if len(buffer.samples) >= _FLUSH_SAMPLES:
+            with self._lock:
+                self._drain(buffer)
+
+    def _buffer(self) -> _ThreadBuffer:
+        """Get the calling thread's buffer, registering it on first use."""
+        try:
+            buffer: _ThreadBuffer = self._local.buffer
+            return buffer
+        except AttributeError:
+            buffer = self._local.buffer = _ThreadBuffer()
+            with self._lock:
+                self._buffers.append(buffer)
+            return buffer
+
+    def _drain(self, buffer: _ThreadBuffer) -> None:
+        """Merge a thread's buffered samples into the histograms (lock held)."""
+        samples = buffer.samples
+        while samples:
+            key, value = samples.popleft()
+            self._add_sample(key, value)
+
+    def _add_sample(self, key: str, value: float) -> None:
+        """Add one value to a histogram (lock held)."""
+        reservoir = self._histograms.get(key)
+        if reservoir is None:
+            reservoir = self._histograms[key] = _Reservoir(self.max_histogram_samples)
+        reservoir.add(value)
+
+    def _merge_counters(self) -> Dict[str, int]:
+        """Sum counters across thread buffers (lock held).
+
+        Buffers of exited threads are folded into the base counters and dropped.
+        """
+        live = []
+        for buffer in self._buffers:
+            if buffer.thread.is_alive():
+                live.append(buffer)
+            else:
+                for key, value in buffer.counters.items():
+                    self._counters[key] += value
+        self._buffers = live
+
+        counters = dict(self._counters)
+        for buffer in live:
+            for key, value in dict(buffer.counters).items():
+                counters[key] = counters.get(key, 0) + value
+        return counters
 
     def set_gauge(self, name: str, value: float, labels: Optional[Dict[str, str]] = None) -> None:
         """Set gauge value."""
@@ -63,29 +186,50 @@ class MetricsCollector:
     def get_metrics(self) -> Dict[str, Any]:
         """Get all metrics snapshot."""
         with self._lock:
+            for buffer in self._buffers:
+                self._drain(buffer)
+
             return {
-                "counters": dict(self._counters),
-                "histograms": {k: self._summarize_histogram(v) for k, v in self._histograms.items()},
+                "counters": self._merge_counters(),
+                "histograms": {
+                    k: self._summarize_histogram(r.samples, [r.count, r.total, r.minimum, r.maximum])
+                    for k, r in self._histograms.items()
+                },
                 "gauges": dict(self._gauges),
                 "timestamp": datetime.now(timezone.utc).isoformat()
             }
 
-    def _summarize_histogram(self, values: list) -> Dict[str, float]:
-        """Summarize histogram values."""
+    def _summarize_histogram(self, values: array, stats: Optional[List[float]] = None) -> Dict[str, float]:
+        """Summarize histogram values.
+
+        Args:
+            values: Recorded samples
+            stats: Running [count, sum, min, max]; computed from ``values`` if not given
+        """
         if not values:
             return {"count": 0}
 
-        sorted_values = sorted(values)
-        count = len(sorted_values)
+        if stats is None:
+            stats = [len(values), sum(values), min(values), max(values)]
+        count, total, minimum, maximum = stats
+
+        # Percentiles are taken over the samples with O(n) selection
+        n = len(values)
+        ranks = [int(n * 0.5), int(n * 0.95), int(n * 0.99) if n > 100 else n - 1]
+        if NUMPY_AVAILABLE:
+            p50, p95, p99 = np.partition(np.frombuffer(values, dtype=np.float64), ranks)[ranks].tolist()
+        else:
+            sorted_values = sorted(values)
+            p50, p95, p99 = (sorted_values[r] for r in ranks)
 
         return {
             "count": count,
-            "sum": sum(sorted_values),
-            "min": sorted_values[0],
-            "max": sorted_values[-1],
-            "p50": sorted_values[int(count * 0.5)],
-            "p95": sorted_values[int(count * 0.95)],
-            "p99": sorted_values[int(count * 0.99)] if count > 100 else sorted_values[-1]
+            "sum": total,
+            "min": minimum,
+            "max": maximum,
+            "p50": p50,
+            "p95": p95,
+            "p99": p99
         }
 
     def _make_key(self, name: str, labels: Optional[Dict[str, str]] = None) -> str:
@@ -99,6 +243,9 @@ class MetricsCollector:
     def reset(self) -> None:
         """Reset all metrics."""
         with self._lock:
+            for buffer in self._buffers:
+                buffer.counters.clear()
+                buffer.samples.clear()
             self._counters.clear()
             self._histograms.clear()
             self._gauges.clear()
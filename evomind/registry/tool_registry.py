@@ -1,16 +1,83 @@
 """Tool registry for managing and discovering tools."""
 
+import atexit
+import hashlib
+import heapq
 import logging
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass, field
+import queue
+import sqlite3
+import sys
+import threading
+import weakref
+import zlib
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+from operator import itemgetter
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple, overload
+from dataclasses import dataclass, field, fields
 from datetime import datetime, timezone
-import json
 from pathlib import Path
 
+from evomind.utils.compat import DATACLASS_SLOTS
+from evomind.utils.serialization import dumps, loads
+
 logger = logging.getLogger(__name__)
 
+# Length of the substrings indexed for search
+_GRAM = 3
+
+
+def _grams(text: str) -> Set[str]:
+    """All substrings of length _GRAM in text."""
+    return {text[i:i + _GRAM] for i in range(len(text) - _GRAM + 1)}
+
+
+# Artifact entries that only exist in memory, such as compiled code objects
+_RUNTIME_ARTIFACT_KEYS = frozenset({"code_obj"})
+
+_DB_NAME = "registry.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tools (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    version TEXT NOT NULL,
+    description TEXT NOT NULL,
+    metadata_json TEXT NOT NULL,
+    artifact_ref TEXT NOT NULL,
+    success_rate REAL NOT NULL,
+    usage_count INTEGER NOT NULL,
+    deprecated INTEGER NOT NULL,
+    tags_json TEXT NOT NULL
+);
+
+-- Compressed artifacts keyed by the sha256 of their JSON, shared by all
+-- tools with identical artifacts
+CREATE TABLE IF NOT EXISTS blobs (
+    hash TEXT PRIMARY KEY,
+    data BLOB NOT NULL
+);
+"""
+
+_INSERT_TOOL = "INSERT OR REPLACE INTO tools VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+_INSERT_BLOB = "INSERT OR IGNORE INTO blobs VALUES (?, ?)"
+
 
-@dataclass
+def _encode_artifact(artifact: Dict[str, Any]) -> Tuple[str, bytes]:
+    """Content hash and compressed form of an artifact's persisted entries."""
+    persisted = {k: v for k, v in artifact.items() if k not in _RUNTIME_ARTIFACT_KEYS}
+    data = dumps(persisted, sort_keys=True)
+    return hashlib.sha256(data).hexdigest(), zlib.compress(data)
+
+
+def _decode_artifact(blob: bytes) -> Dict[str, Any]:
+    """Inverse of the compressed form made by _encode_artifact."""
+    artifact: Dict[str, Any] = loads(zlib.decompress(blob))
+    return artifact
+
+
+@dataclass(**DATACLASS_SLOTS)
 class ToolMetadata:
     """Metadata for a registered tool."""
 
@@ -33,33 +100,163 @@ class ToolMetadata:
     deprecation_date: Optional[str] = None
     tags: List[str] = field(default_factory=list)
 
+    def __post_init__(self):
+        # Few distinct owners and versions exist, so tools loaded from
+        # storage share one string each instead of holding their own copy
+        if type(self.owner) is str:
+            self.owner = sys.intern(self.owner)
+        if type(self.version) is str:
+            self.version = sys.intern(self.version)
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary."""
-        return {
-            "id": self.id,
-            "name": self.name,
-            "version": self.version,
-            "description": self.description,
-            "owner": self.owner,
-            "io_spec": self.io_spec,
-            "dependencies": self.dependencies,
-            "network_scopes": self.network_scopes,
-            "fs_scopes": self.fs_scopes,
-            "cpu_limit": self.cpu_limit,
-            "memory_limit_mb": self.memory_limit_mb,
-            "tests": self.tests,
-            "success_rate": self.success_rate,
-            "usage_count": self.usage_count,
-            "created_at": self.created_at,
-            "deprecated": self.deprecated,
-            "deprecation_date": self.deprecation_date,
-            "tags": self.tags
-        }
+        return {name: getattr(self, name) for name in _METADATA_FIELDS}
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "ToolMetadata":
         """Create from dictionary."""
-        return cls(**{k: v for k, v in data.items() if k in cls.__annotations__})
+        return cls(**{k: v for k, v in data.items() if k in _METADATA_FIELD_SET})
+
+
+_METADATA_FIELDS = tuple(f.name for f in fields(ToolMetadata))
+_METADATA_FIELD_SET = frozenset(_METADATA_FIELDS)
+
+
+class _ArtifactStore:
+    """Artifacts by tool id, read from the blob table on first access.
+
+    Tools map to the content hash of their artifact, so tools with
+    identical artifacts share one dict. Artifacts registered in this
+    process are kept in memory; ones loaded from storage are held in an
+    LRU cache of ``maxsize`` blobs.
+    """
+
+    def __init__(self, db: sqlite3.Connection, db_lock: threading.Lock, maxsize: int = 128):
+        self._db = db
+        self._db_lock = db_lock
+        self.maxsize = maxsize
+        self._refs: Dict[str, str] = {}
+        self._pinned: Dict[str, Dict[str, Any]] = {}
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add_ref(self, tool_id: str, artifact_ref: str) -> None:
+        """Record the blob holding a stored tool's artifact."""
+        self._refs[tool_id] = artifact_ref
+
+    def pin(self, tool_id: str, artifact_ref: str, artifact: Dict[str, Any]) -> None:
+        """Keep an artifact registered in this process in memory.
+
+        An artifact identical to one already pinned is not kept again;
+        the tool shares the earlier dict.
+        """
+        with self._lock:
+            self._pinned.setdefault(artifact_ref, artifact)
+            self._refs[tool_id] = artifact_ref
+
+    def clear(self) -> None:
+        """Forget all artifacts."""
+        with self._lock:
+            self._refs.clear()
+            self._pinned.clear()
+            self._cache.clear()
+
+    def __contains__(self, tool_id: object) -> bool:
+        return tool_id in self._refs
+
+    def __getitem__(self, tool_id: str) -> Dict[str, Any]:
+        artifact = self.get(tool_id)
+        if artifact is None:
+            raise KeyError(tool_id)
+        return artifact
+
+    @overload
+    def get(self, tool_id: str) -> Optional[Dict[str, Any]]: ...
+
+    @overload
+    def get(self, tool_id: str, default: Dict[str, Any]) -> Dict[str, Any]: ...
+
+    def get(self, tool_id: str, default: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """Artifact of a tool, loading it from storage if needed."""
+        artifact_ref = self._refs.get(tool_id)
+        if artifact_ref is None:
+            return default
+
+        artifact = self._pinned.get(artifact_ref)
+        if artifact is not None:
+            return artifact
+
+        with self._lock:
+            artifact = self._cache.get(artifact_ref)
+            if artifact is not None:
+                self._cache.move_to_end(artifact_ref)
+                return artifact
+
+        with self._db_lock:
+            row = self._db.execute("SELECT data FROM blobs WHERE hash = ?", (artifact_ref,)).fetchone()
+        if row is None:
+            logger.error("Missing artifact blob for tool %s", tool_id)
+            return default
+
+        try:
+            artifact = _decode_artifact(row[0])
+        except (ValueError, zlib.error) as e:
+            logger.error("Error loading artifact for tool %s: %s", tool_id, e)
+            return default
+
+        with self._lock:
+            self._cache[artifact_ref] = artifact
+            if len(self._cache) > self.maxsize:
+                self._cache.popitem(last=False)
+        return artifact
+
+
+# Most queued writes applied in one transaction
+_WRITE_BATCH = 256
+
+# Queue item telling the writer thread to exit
+_STOP = object()
+
+
+def _write_loop(db: sqlite3.Connection, db_lock: threading.Lock, write_queue: "queue.SimpleQueue[Any]") -> None:
+    """Apply queued registry writes, one transaction per drained batch.
+
+    Items are ``(sql, rows)`` statements, events set once everything queued
+    before them is written, or _STOP.
+    """
+    while True:
+        batch = [write_queue.get()]
+        while len(batch) < _WRITE_BATCH:
+            try:
+                batch.append(write_queue.get_nowait())
+            except queue.Empty:
+                break
+
+        statements = [item for item in batch if isinstance(item, tuple)]
+        if statements:
+            with db_lock:
+                try:
+                    db.execute("BEGIN")
+                    for sql, rows in statements:
+                        db.executemany(sql, rows)
+                    db.execute("COMMIT")
+                except sqlite3.Error as e:
+                    if db.in_transaction:
+                        db.execute("ROLLBACK")
+                    logger.error("Registry write failed: %s", e)
+
+        for item in batch:
+            if isinstance(item, threading.Event):
+                item.set()
+        if any(item is _STOP for item in batch):
+            return
+
+
+def _flush_at_exit(ref: "weakref.ReferenceType[ToolRegistry]") -> None:
+    """Flush a registry's pending stats if it is still alive."""
+    registry = ref()
+    if registry is not None:
+        registry.flush()
 
 
 class ToolRegistry:
@@ -70,17 +267,56 @@ class ToolRegistry:
     - Metadata indexing
     - Search and discovery
     - Lifecycle management
+
+    Tools are persisted as rows of a SQLite database in WAL mode. Tools
+    stored by older versions as per-tool JSON directories are imported on
+    load.
+
+    Writes are queued and applied by a background thread, so mutations
+    return without waiting on disk. Call flush() to wait until everything
+    is persisted.
     """
 
-    def __init__(self, storage_path: Optional[Path] = None):
+    def __init__(self, storage_path: Optional[Path] = None, flush_interval: float = 5.0):
         self.storage_path = storage_path or Path.home() / ".evomind" / "registry"
         self.storage_path.mkdir(parents=True, exist_ok=True)
 
+        # Usage stats are written in batches at most flush_interval seconds
+        # after they change
+        self.flush_interval = flush_interval
+        self._dirty: Set[str] = set()
+        self._flush_timer: Optional[threading.Timer] = None
+        self._closed = False
+        self._lock = threading.Lock()
+
+        self._write_queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._writer: Optional[threading.Thread] = None
+
+        self._db_lock = threading.Lock()
+        self._db = sqlite3.connect(
+            str(self.storage_path / _DB_NAME),
+            isolation_level=None,
+            check_same_thread=False
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._migrate_inline_artifacts()
+
         self.tools: Dict[str, ToolMetadata] = {}
-        self.artifacts: Dict[str, Dict[str, Any]] = {}
+        self.artifacts = _ArtifactStore(self._db, self._db_lock)
+
+        # Search index: trigram -> ids of tools whose name, description or a
+        # tag contains it, plus lowercased fields and registration order
+        self._index: Dict[str, Set[str]] = defaultdict(set)
+        self._lower: Dict[str, Tuple[str, str, Tuple[str, ...]]] = {}
+        self._order: Dict[str, int] = {}
+        self._sequence = count()
 
         self._load_registry()
 
+        atexit.register(_flush_at_exit, weakref.ref(self))
+
     def register(
         self,
         artifact: Dict[str, Any],
@@ -109,12 +345,13 @@ class ToolRegistry:
             tags=metadata.get("tags", [])
         )
 
+        # Persist, keyed by the artifact's content hash
+        artifact_ref = self._save_tool(tool_id, meta, artifact)
+
         # Store
         self.tools[tool_id] = meta
-        self.artifacts[tool_id] = artifact
-
-        # Persist
-        self._save_tool(tool_id, meta, artifact)
+        self.artifacts.pin(tool_id, artifact_ref, artifact)
+        self._index_tool(meta)
 
         logger.info(f"Registered tool: {tool_id}")
         return tool_id
@@ -135,43 +372,98 @@ class ToolRegistry:
         Returns:
             List of matching tools
         """
-        results = []
+        scored = []
 
         query_lower = query.lower()
 
-        for tool_id, meta in self.tools.items():
+        for tool_id in self._candidates(query_lower):
+            meta = self.tools[tool_id]
             if meta.deprecated:
                 continue
 
             # Simple text matching
             score = 0.0
+            name_lower, description_lower, tags_lower = self._lower[tool_id]
 
-            if query_lower in meta.name.lower():
+            if query_lower in name_lower:
                 score += 0.5
 
-            if query_lower in meta.description.lower():
+            if query_lower in description_lower:
                 score += 0.3
 
-            for tag in meta.tags:
-                if query_lower in tag.lower():
+            for tag in tags_lower:
+                if query_lower in tag:
                     score += 0.2
 
             if score > 0:
-                artifact = self.artifacts.get(tool_id, {})
-                results.append({
-                    "id": tool_id,
-                    "metadata": meta.to_dict(),
-                    "artifact": artifact,
-                    "score": score,
-                    "tool_id": tool_id,
-                    "code": artifact.get("code", "")
-                })
-
-        # Sort by score
-        results.sort(key=lambda x: x["score"], reverse=True)
-
-        logger.info(f"Found {len(results)} tools for query: {query}")
-        return results[:limit]
+                scored.append((score, tool_id))
+
+        # Select the top scores, building result dicts only for the returned
+        # tools. Like a stable sort, ties keep registration order.
+        results = []
+        for score, tool_id in heapq.nlargest(limit, scored, key=itemgetter(0)):
+            artifact = self.artifacts.get(tool_id, {})
+            results.append({
+                "id": tool_id,
+                "metadata": self.tools[tool_id].to_dict(),
+                "artifact": artifact,
+                "score": score,
+                "tool_id": tool_id,
+                "code": artifact.get("code", "")
+            })
+
+        logger.info("Found %d tools for query: %s", len(scored), query)
+        return results
+
+    def _candidates(self, query_lower: str) -> Iterable[str]:
+        """Ids of tools that may contain the query, in registration order.
+
+        A field containing the query contains each of its trigrams, so the
+        intersection of their postings holds every match. Queries shorter
+        than a trigram match against all tools.
+        """
+        if len(query_lower) < _GRAM:
+            # _order is filled in registration order
+            return [tool_id for tool_id in self._order if tool_id in self._lower]
+
+        postings = []
+        for gram in _grams(query_lower):
+            ids = self._index.get(gram)
+            if not ids:
+                return []
+            postings.append(ids)
+
+        postings.sort(key=len)
+        candidates = set(postings[0]).intersection(*postings[1:])
+        return sorted(candidates, key=self._order.__getitem__)
+
+    def _index_tool(self, meta: ToolMetadata) -> None:
+        """Add a tool's lowercased fields to the search index."""
+        self._unindex_tool(meta.id)
+
+        fields = (meta.name.lower(), meta.description.lower(), tuple(tag.lower() for tag in meta.tags))
+        self._lower[meta.id] = fields
+        self._order.setdefault(meta.id, next(self._sequence))
+
+        name_lower, description_lower, tags_lower = fields
+        for text in (name_lower, description_lower, *tags_lower):
+            for gram in _grams(text):
+                self._index[gram].add(meta.id)
+
+    def _unindex_tool(self, tool_id: str) -> None:
+        """Remove a tool from the search index."""
+        fields = self._lower.pop(tool_id, None)
+        if fields is None:
+            return
+
+        name_lower, description_lower, tags_lower = fields
+        for text in (name_lower, description_lower, *tags_lower):
+            for gram in _grams(text):
+                ids = self._index.get(gram)
+                if ids is not None:
+                    ids.discard(tool_id)
+                    if not ids:
+                        del self._index[gram]
 
     def get(self, tool_id: str) -> Optional[Dict[str, Any]]:
         """Get tool by ID."""
@@ -202,7 +494,36 @@ class ToolRegistry:
                 alpha = 0.1
                 meta.success_rate = alpha * 0.0 + (1 - alpha) * meta.success_rate
 
-            self._save_tool(tool_id, meta, self.artifacts.get(tool_id, {}))
+            with self._lock:
+                self._dirty.add(tool_id)
+                if self._flush_timer is None:
+                    self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+                    self._flush_timer.daemon = True
+                    self._flush_timer.start()
+
+    def flush(self) -> None:
+        """Write pending usage stats and wait until all queued writes are persisted."""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+
+            if self._closed:
+                return
+
+            rows = [
+                (self.tools[tool_id].usage_count, self.tools[tool_id].success_rate, tool_id)
+                for tool_id in self._dirty
+            ]
+            self._dirty.clear()
+
+        if rows:
+            self._write("UPDATE tools SET usage_count = ?, success_rate = ? WHERE id = ?", rows)
+
+        if self._writer is not None:
+            done = threading.Event()
+            self._write_queue.put(done)
+            done.wait()
 
     def deprecate(self, tool_id: str, reason: Optional[str] = None) -> bool:
         """Deprecate a tool."""
@@ -210,7 +531,11 @@ class ToolRegistry:
         if meta:
             meta.deprecated = True
             meta.deprecation_date = datetime.now(timezone.utc).isoformat()
-            self._save_tool(tool_id, meta, self.artifacts.get(tool_id, {}))
+            self._unindex_tool(tool_id)
+            self._execute(
+                "UPDATE tools SET deprecated = 1, metadata_json = ? WHERE id = ?",
+                (dumps(meta.to_dict()).decode(), tool_id)
+            )
             logger.info(f"Deprecated tool: {tool_id}")
             return True
         return False
@@ -229,50 +554,177 @@ class ToolRegistry:
 
         return results
 
+    def reset(self) -> None:
+        """Remove every tool from the registry and its storage."""
+        self.flush()
+        with self._lock:
+            self.tools.clear()
+            self._dirty.clear()
+        self.artifacts.clear()
+        self._index.clear()
+        self._lower.clear()
+        self._order.clear()
+
+        self._execute("DELETE FROM tools")
+        self._execute("DELETE FROM blobs")
+        self.flush()
+
+    def close(self) -> None:
+        """Flush pending writes and close the registry database."""
+        self.flush()
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            writer = self._writer
+
+        if writer is not None:
+            self._write_queue.put(_STOP)
+            writer.join()
+        with self._db_lock:
+            self._db.close()
+
+    def _execute(self, sql: str, params: Tuple[Any, ...] = ()) -> None:
+        """Queue a single write statement."""
+        self._write(sql, [params])
+
+    def _write(self, sql: str, rows: List[Tuple[Any, ...]]) -> None:
+        """Queue a statement for the writer thread, starting it if needed."""
+        with self._lock:
+            if self._closed:
+                logger.warning("Dropping write to closed registry: %s", sql)
+                return
+            if self._writer is None:
+                # The thread holds no reference to the registry, so an
+                # unused registry can still be collected
+                self._writer = threading.Thread(
+                    target=_write_loop,
+                    args=(self._db, self._db_lock, self._write_queue),
+                    name="registry-writer",
+                    daemon=True
+                )
+                self._writer.start()
+        self._write_queue.put((sql, rows))
+
+    @staticmethod
+    def _rows(metadata: ToolMetadata, artifact: Dict[str, Any]) -> Tuple[Tuple[Any, ...], Tuple[str, bytes]]:
+        """Column values of a tool row and of its artifact's blob row."""
+        artifact_ref, blob = _encode_artifact(artifact)
+        tool_row = (
+            metadata.id,
+            metadata.name,
+            metadata.version,
+            metadata.description,
+            dumps(metadata.to_dict()).decode(),
+            artifact_ref,
+            metadata.success_rate,
+            metadata.usage_count,
+            int(metadata.deprecated),
+            dumps(metadata.tags).decode()
+        )
+        return tool_row, (artifact_ref, blob)
+
     def _save_tool(
         self,
         tool_id: str,
         metadata: ToolMetadata,
         artifact: Dict[str, Any]
-    ) -> None:
-        """Save tool to storage."""
-        tool_dir = self.storage_path / tool_id
-        tool_dir.mkdir(exist_ok=True)
-
-        # Save metadata
-        meta_path = tool_dir / "metadata.json"
-        meta_path.write_text(json.dumps(metadata.to_dict(), indent=2))
-
-        # Save artifact
-        artifact_path = tool_dir / "artifact.json"
-        artifact_path.write_text(json.dumps(artifact, indent=2))
+    ) -> str:
+        """Save tool to storage, returning its artifact's content hash."""
+        tool_row, blob_row = self._rows(metadata, artifact)
+        # The blob goes first so a tool row never references a missing blob
+        self._execute(_INSERT_BLOB, blob_row)
+        self._execute(_INSERT_TOOL, tool_row)
+        return blob_row[0]
 
     def _load_registry(self) -> None:
         """Load registry from storage."""
-        if not self.storage_path.exists():
-            return
+        self._import_legacy()
 
-        for tool_dir in self.storage_path.iterdir():
-            if not tool_dir.is_dir():
-                continue
+        with self._db_lock:
+            rows = self._db.execute(
+                "SELECT metadata_json, artifact_ref, success_rate, usage_count, deprecated FROM tools"
+            ).fetchall()
 
+        # Artifacts are read on first access
+        for metadata_json, artifact_ref, success_rate, usage_count, deprecated in rows:
             try:
-                # Load metadata
-                meta_path = tool_dir / "metadata.json"
-                if meta_path.exists():
-                    meta_data = json.loads(meta_path.read_text())
-                    meta = ToolMetadata.from_dict(meta_data)
-                    self.tools[meta.id] = meta
+                meta = ToolMetadata.from_dict(loads(metadata_json))
+            except (ValueError, TypeError) as e:
+                logger.error("Error loading tool row: %s", e)
+                continue
+
+            # Stats columns are updated in place and take precedence
+            meta.success_rate = success_rate
+            meta.usage_count = usage_count
+            meta.deprecated = bool(deprecated)
+
+            self.tools[meta.id] = meta
+            self.artifacts.add_ref(meta.id, artifact_ref)
+            if not meta.deprecated:
+                self._index_tool(meta)
+
+        logger.info("Loaded %d tools from registry", len(self.tools))
+
+    def _migrate_inline_artifacts(self) -> None:
+        """Move artifacts of databases that stored them inline into blobs."""
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(tools)")}
+        if "artifact_json" not in columns:
+            return
+
+        rows = self._db.execute("SELECT id, artifact_json FROM tools").fetchall()
+        encoded = [(tool_id, *_encode_artifact(loads(artifact_json))) for tool_id, artifact_json in rows]
 
-                # Load artifact
-                artifact_path = tool_dir / "artifact.json"
-                if artifact_path.exists():
-                    artifact = json.loads(artifact_path.read_text())
-                    self.artifacts[meta.id] = artifact
+        self._db.execute("BEGIN")
+        self._db.execute("ALTER TABLE tools RENAME COLUMN artifact_json TO artifact_ref")
+        self._db.executemany(_INSERT_BLOB, [(ref, blob) for _, ref, blob in encoded])
+        self._db.executemany(
+            "UPDATE tools SET artifact_ref = ? WHERE id = ?",
+            [(ref, tool_id) for tool_id, ref, _ in encoded]
+        )
+        self._db.execute("COMMIT")
+        logger.info("Moved %d inline artifacts into blobs", len(encoded))
+
+    def _import_legacy(self) -> None:
+        """Import tools stored as per-tool JSON directories."""
+        with self._db_lock:
+            known = {tool_id for (tool_id,) in self._db.execute("SELECT id FROM tools")}
+
+        # Legacy directories are named after the tool id
+        tool_dirs = [path for path in self.storage_path.iterdir() if path.name not in known and path.is_dir()]
+        if not tool_dirs:
+            return
+
+        # Reading is I/O bound, so files are read concurrently
+        with ThreadPoolExecutor(max_workers=min(16, len(tool_dirs))) as pool:
+            rows = [row for row in pool.map(self._read_legacy_tool, tool_dirs) if row is not None]
 
-                logger.debug(f"Loaded tool: {meta.id}")
+        if not rows:
+            return
 
-            except Exception as e:
-                logger.error(f"Error loading tool from {tool_dir}: {e}")
+        # Existing rows are newer than the legacy files
+        with self._db_lock:
+            self._db.execute("BEGIN")
+            self._db.executemany(_INSERT_BLOB, [blob_row for _, blob_row in rows])
+            self._db.executemany(
+                "INSERT OR IGNORE INTO tools VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [tool_row for tool_row, _ in rows]
+            )
+            self._db.execute("COMMIT")
+        logger.info("Imported %d legacy tools into %s", len(rows), _DB_NAME)
+
+    def _read_legacy_tool(self, tool_dir: Path) -> Optional[Tuple[Tuple[Any, ...], Tuple[str, bytes]]]:
+        """Rows for a tool stored as a JSON directory, or None if there is none."""
+        meta_path = tool_dir / "metadata.json"
+        if not meta_path.is_file():
+            return None
+
+        try:
+            meta = ToolMetadata.from_dict(loads(meta_path.read_bytes()))
+            artifact_path = tool_dir / "artifact.json"
+            artifact = loads(artifact_path.read_bytes()) if artifact_path.exists() else {}
+        except Exception as e:
+            logger.error("Error loading tool from %s: %s", tool_dir, e)
+            return None
 
-        logger.info(f"Loaded {len(self.tools)} tools from registry")
+        return self._rows(meta, artifact)
@@ -0,0 +1,215 @@
+"""Tool runner executed inside sandbox processes.
+
+Run as a script, never imported by the parent:
+
+- ``python _runner.py once CPU_SECONDS MEMORY_BYTES`` applies the CPU time
+  and address space limits, reads one JSON request from stdin and writes
+  its JSON result to stdout as a final line starting with ``RESULT``. A
+  newline always precedes that line, so it starts a line even after tool
+  output without a trailing newline.
+- ``python _runner.py worker MEMORY_BYTES [MODULES]`` applies the address
+  space limit and imports the comma-separated MODULES, then answers JSON
+  requests on stdin with JSON results on stdout until stdin closes. Each
+  message is prefixed with its length as a 4-byte big-endian integer. The
+  protocol moves to private descriptors and /dev/null takes over fds 0
+  and 1, so tools and their child processes writing to fd 1 cannot
+  corrupt the framing. The CPU limit is re-armed per request as the usage
+  so far plus the request's ``cpu_time_limit``.
+
+Requests hold ``code``, ``args`` and optionally the ``entrypoint`` function
+name. Worker requests also carry a ``code_sha``; ``code`` is only sent the
+first time a worker sees a hash, and the tool's function is loaded once
+per hash and reused. The tool's own stdout and stderr are captured and
+returned with the result, so they never mix with the protocol.
+
+Only the standard library may be required here; orjson speeds up
+messages when it is installed.
+"""
+
+import contextlib
+import io
+import json
+import os
+import resource
+import struct
+import sys
+import traceback
+from typing import BinaryIO
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+FRAME_HEADER = struct.Struct(">I")
+
+# Marks the one-shot result line, after any output written straight to fd 1
+RESULT_PREFIX = b"RESULT "
+
+
+def set_memory_limit(memory_bytes: int) -> None:
+    """Limit the address space of this process."""
+    try:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+    except (ValueError, OSError):
+        pass
+
+
+def set_cpu_limit(seconds: int) -> None:
+    """Limit the CPU time of this process."""
+    try:
+        resource.setrlimit(resource.RLIMIT_CPU, (seconds, seconds))
+    except (ValueError, OSError):
+        pass
+
+
+def preload(modules: str) -> None:
+    """Import modules up front so tools using them skip the import cost."""
+    for module in filter(None, modules.split(",")):
+        try:
+            __import__(module)
+        except ImportError:
+            pass
+
+
+def arm_cpu_limit(seconds: int) -> None:
+    """Allow ``seconds`` more CPU time before SIGXCPU."""
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft = int(usage.ru_utime + usage.ru_stime) + seconds
+    hard = resource.getrlimit(resource.RLIMIT_CPU)[1]
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    try:
+        resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+    except (ValueError, OSError):
+        pass
+
+
+def load_tool(code: str, entrypoint=None):
+    """Execute tool code and return its entrypoint function, if any.
+
+    Without an entrypoint name the first public callable is used.
+    """
+    namespace = {"__name__": "__tool__"}
+    # Optimized like the code objects the generator packages
+    exec(compile(code, "<tool>", "exec", dont_inherit=True, optimize=2), namespace)
+    if entrypoint is not None:
+        func = namespace.get(entrypoint)
+        return func if callable(func) else None
+    for name, obj in namespace.items():
+        if callable(obj) and not name.startswith("_"):
+            return obj
+    return None
+
+
+def call_tool(payload: dict, functions: dict) -> dict:
+    """Call a tool's function with the args, loading it on first use.
+
+    Loaded functions are kept in ``functions`` by ``code_sha`` and
+    entrypoint, so a worker compiles and executes each tool's code once.
+    """
+    entrypoint = payload.get("entrypoint")
+    key = (payload.get("code_sha"), entrypoint)
+    func = functions.get(key)
+    if func is None:
+        func = load_tool(payload["code"], entrypoint)
+        if func is None:
+            return {"status": "error", "error": "No executable function found"}
+        if key[0] is not None:
+            functions[key] = func
+    return {"status": "success", "result": func(payload["args"])}
+
+
+def handle(payload: dict, functions: dict) -> bytes:
+    """Run one request and serialize its result."""
+    out, err = io.StringIO(), io.StringIO()
+    sys.stdin = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+            result = call_tool(payload, functions)
+    except BaseException as e:
+        result = {"status": "error", "error": str(e), "traceback": traceback.format_exc()}
+    finally:
+        sys.stdin = sys.__stdin__
+
+    if out.getvalue() or err.getvalue():
+        result["stdout"], result["stderr"] = out.getvalue(), err.getvalue()
+    try:
+        return dumps(result)
+    except (TypeError, ValueError) as e:
+        return dumps({"status": "error", "error": str(e)})
+
+
+def dumps(obj) -> bytes:
+    """Encode a message, with orjson when possible."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(obj).encode()
+
+
+def loads(data: bytes):
+    """Decode a message, with orjson when it is installed."""
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+
+def read_frame(stream: BinaryIO) -> bytes:
+    """Read one length-prefixed message, or b"" at end of input."""
+    header = stream.read(FRAME_HEADER.size)
+    if len(header) < FRAME_HEADER.size:
+        return b""
+    (size,) = FRAME_HEADER.unpack(header)
+    return stream.read(size)
+
+
+def take_protocol_streams():
+    """Move the protocol off fds 0 and 1, returning binary streams for it.
+
+    Duplicated descriptors are not inheritable, so processes started by
+    tools cannot hold the protocol pipes either.
+    """
+    protocol_in, protocol_out = os.dup(0), os.dup(1)
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+    os.close(devnull)
+    return os.fdopen(protocol_in, "rb"), os.fdopen(protocol_out, "wb")
+
+
+def serve() -> None:
+    """Answer requests until stdin closes."""
+    protocol_in, protocol_out = take_protocol_streams()
+    sources = {}
+    functions: dict = {}
+    while True:
+        request = read_frame(protocol_in)
+        if not request:
+            return
+        payload = loads(request)
+        if "code" in payload:
+            sources[payload["code_sha"]] = payload["code"]
+        else:
+            payload["code"] = sources.get(payload["code_sha"], "")
+        arm_cpu_limit(payload["cpu_time_limit"])
+        response = handle(payload, functions)
+        protocol_out.write(FRAME_HEADER.pack(len(response)) + response)
+        protocol_out.flush()
+
+
+def main() -> None:
+    mode = sys.argv[1]
+    if mode == "worker":
+        set_memory_limit(int(sys.argv[2]))
+        preload(sys.argv[3] if len(sys.argv) > 3 else "")
+        serve()
+    else:
+        set_cpu_limit(int(sys.argv[2]))
+        set_memory_limit(int(sys.argv[3]))
+        sys.stdout.buffer.write(b"\n" + RESULT_PREFIX + handle(loads(sys.stdin.buffer.read()), {}) + b"\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,32 +1,294 @@
 """Sandbox executor for safe code execution."""
 
+import asyncio
+import hashlib
 import logging
+import os
+import selectors
+import shutil
+import struct
 import subprocess
+import sys
 import tempfile
-from typing import Dict, Any, Optional
+import threading
+import time
+import weakref
+from collections import defaultdict
+from typing import IO, Dict, Any, List, Optional, Set, Tuple, cast
 from pathlib import Path
-import json
 
 from evomind.sandbox.policies import SandboxPolicy, ResourcePolicy
+from evomind.utils.serialization import dumps, loads
 
 logger = logging.getLogger(__name__)
 
+# Script run inside sandbox processes, in one-shot or persistent worker mode
+_RUNNER = str(Path(__file__).with_name("_runner.py"))
+
+# Length prefix of messages exchanged with persistent workers
+_FRAME_HEADER = struct.Struct(">I")
+
+# Start of the line carrying a one-shot runner's result; the runner
+# always writes the newline, so it is not part of the tool's output
+_RESULT_MARKER = b"\nRESULT "
+
+# Largest single read from a worker's stdout
+_READ_CHUNK = 1 << 16
+
+# Age after which leftovers in the work directory are considered orphaned
+_STALE_AFTER = 3600.0
+
+
+def _open_pidfd(pid: int) -> Optional[int]:
+    """File descriptor that becomes readable when a process exits (Linux 5.3+)."""
+    if not hasattr(os, "pidfd_open"):
+        return None
+    try:
+        return os.pidfd_open(pid)
+    except OSError:
+        return None
+
+
+def _sweep_stale(work_dir: Path, max_age: float) -> None:
+    """Remove entries of a work directory not modified for max_age seconds.
+
+    Execution and worker directories are normally removed when done; this
+    catches those left behind by processes that crashed or were killed.
+    """
+    cutoff = time.time() - max_age
+    try:
+        entries = list(os.scandir(work_dir))
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            if entry.stat(follow_symlinks=False).st_mtime >= cutoff:
+                continue
+            if entry.is_dir(follow_symlinks=False):
+                shutil.rmtree(entry.path, ignore_errors=True)
+            else:
+                os.unlink(entry.path)
+        except OSError:
+            pass
+        else:
+            logger.debug("Removed stale sandbox entry %s", entry.path)
+
+
+class _Worker:
+    """A persistent Python subprocess running the worker driver."""
+
+    __slots__ = ("process", "stdin", "stdout", "work_dir", "uses", "pidfd", "known_code")
+
+    def __init__(self, memory_limit_mb: int, preload: Tuple[str, ...], work_dir: Path):
+        self.work_dir = Path(tempfile.mkdtemp(dir=work_dir, prefix="worker_"))
+        self.uses = 0
+        # Hashes of tool sources this worker has already received
+        self.known_code: Set[str] = set()
+        self.process = subprocess.Popen(
+            [sys.executable, _RUNNER, "worker", str(memory_limit_mb * 1024 * 1024), ",".join(preload)],
+            cwd=self.work_dir,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+        # Both pipes were requested, so Popen always creates them
+        self.stdin = cast(IO[bytes], self.process.stdin)
+        self.stdout = cast(IO[bytes], self.process.stdout)
+        self.pidfd = _open_pidfd(self.process.pid)
+
+    def call(self, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        """Send one request and wait for its result.
+
+        Messages in both directions are JSON prefixed with their length, so
+        payloads larger than the pipe buffer are read in full.
+
+        Raises:
+            subprocess.TimeoutExpired: If no result arrives within timeout
+            EOFError: If the worker exits before answering
+        """
+        self.uses += 1
+        deadline = time.monotonic() + timeout
+        request = dumps(payload)
+        self.stdin.write(_FRAME_HEADER.pack(len(request)) + request)
+        self.stdin.flush()
+
+        # Wait for the result or, where pidfds exist, for the worker to
+        # exit, which catches deaths while a grandchild holds stdout open
+        with selectors.DefaultSelector() as selector:
+            selector.register(self.stdout, selectors.EVENT_READ, "result")
+            if self.pidfd is not None:
+                selector.register(self.pidfd, selectors.EVENT_READ, "exit")
+
+            (size,) = _FRAME_HEADER.unpack(self._read_exact(selector, _FRAME_HEADER.size, deadline))
+            result: Dict[str, Any] = loads(self._read_exact(selector, size, deadline))
+            return result
+
+    def _read_exact(self, selector: selectors.BaseSelector, size: int, deadline: float) -> bytes:
+        """Read exactly size bytes of the worker's stdout before the deadline."""
+        fd = self.stdout.fileno()
+        chunks = []
+        while size:
+            timeout = deadline - time.monotonic()
+            ready = {key.data for key, _ in selector.select(timeout)} if timeout > 0 else set()
+            if not ready:
+                raise subprocess.TimeoutExpired(self.process.args, timeout)
+            if "result" not in ready:
+                raise EOFError(f"Worker exited with code {self.process.wait()}")
+
+            chunk = os.read(fd, min(size, _READ_CHUNK))
+            if not chunk:
+                raise EOFError(f"Worker exited with code {self.process.wait()}")
+            chunks.append(chunk)
+            size -= len(chunk)
+        return b"".join(chunks)
+
+    def kill(self) -> None:
+        """Stop the worker and remove its directory."""
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait()
+        for stream in (self.stdin, self.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+        if self.pidfd is not None:
+            os.close(self.pidfd)
+            self.pidfd = None
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+
+class _WorkerPool:
+    """Idle persistent workers, grouped by the limits they were started with
+    and the allowed modules they imported at startup.
+
+    Workers are reused across executions and replaced after
+    ``max_tasks_per_worker`` calls, a timeout or a crash. At most ``size``
+    workers are kept idle; concurrent executions beyond that start extra
+    workers that are stopped once done.
+    """
+
+    def __init__(self, size: int, max_tasks_per_worker: int, work_dir: Path):
+        self.size = size
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.work_dir = work_dir
+        self._idle: Dict[Tuple[int, Tuple[str, ...]], List[_Worker]] = defaultdict(list)
+        self._idle_count = 0
+        self._lock = threading.Lock()
+
+    def run(
+        self,
+        code: str,
+        args: Dict[str, Any],
+        policy: SandboxPolicy,
+        entrypoint: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Execute tool code on a pooled worker."""
+        resource_policy = policy.resource
+        key = (resource_policy.memory_limit_mb, tuple(sorted(policy.security.allow_imports)))
+        worker = self._acquire(key)
+
+        # Workers keep the sources they have seen, so repeat runs send only the hash
+        code_sha = hashlib.sha256(code.encode()).hexdigest()
+        payload = {"code_sha": code_sha, "args": args, "cpu_time_limit": resource_policy.cpu_time_limit}
+        if entrypoint is not None:
+            payload["entrypoint"] = entrypoint
+        if code_sha not in worker.known_code:
+            payload["code"] = code
+            worker.known_code.add(code_sha)
+
+        try:
+            result = worker.call(payload, resource_policy.wall_time_limit)
+        except subprocess.TimeoutExpired:
+            worker.kill()
+            return {
+                "status": "timeout",
+                "error": "Execution timed out",
+                "stdout": "",
+                "stderr": ""
+            }
+        except (EOFError, OSError, ValueError) as e:
+            worker.kill()
+            return {
+                "status": "error",
+                "error": str(e),
+                "stdout": "",
+                "stderr": ""
+            }
+
+        self._release(key, worker)
+        return result
+
+    def _acquire(self, key: Tuple[int, Tuple[str, ...]]) -> _Worker:
+        """Take an idle worker for the limits, or start one."""
+        with self._lock:
+            idle = self._idle[key]
+            while idle:
+                worker = idle.pop()
+                self._idle_count -= 1
+                if worker.process.poll() is None:
+                    return worker
+                worker.kill()
+        return _Worker(key[0], key[1], self.work_dir)
+
+    def _release(self, key: Tuple[int, Tuple[str, ...]], worker: _Worker) -> None:
+        """Return a worker to the pool, or stop it if it is spent or surplus."""
+        try:
+            # Keep the directory of a long-lived worker from looking orphaned
+            os.utime(worker.work_dir)
+        except OSError:
+            worker.kill()
+            return
+        with self._lock:
+            if worker.uses < self.max_tasks_per_worker and self._idle_count < self.size:
+                self._idle[key].append(worker)
+                self._idle_count += 1
+                return
+        worker.kill()
+
+    def close(self) -> None:
+        """Stop all idle workers."""
+        with self._lock:
+            workers = [worker for idle in self._idle.values() for worker in idle]
+            self._idle.clear()
+            self._idle_count = 0
+        for worker in workers:
+            worker.kill()
+
 
 class SandboxExecutor:
     """Executor for running code in isolated sandbox.
     
     Implements isolation using subprocess with resource limits.
     In production: use gVisor, nsjail, or Firecracker for stronger isolation.
+
+    By default tools run on a pool of persistent worker processes, which
+    avoids starting an interpreter per execution. Policies with
+    ``reuse_workers`` disabled, or ``pool_size=0``, get a fresh process for
+    every execution.
     """
 
     def __init__(
         self,
         default_policy: Optional[SandboxPolicy] = None,
-        work_dir: Optional[Path] = None
+        work_dir: Optional[Path] = None,
+        pool_size: int = 4,
+        max_tasks_per_worker: int = 100
     ):
         self.default_policy = default_policy or SandboxPolicy()
         self.work_dir = work_dir or Path(tempfile.gettempdir()) / "evomind_sandbox"
         self.work_dir.mkdir(exist_ok=True)
+        _sweep_stale(self.work_dir, _STALE_AFTER)
+
+        self._pool = _WorkerPool(pool_size, max_tasks_per_worker, self.work_dir) if pool_size > 0 else None
+        # Stop workers, removing their directories, if the executor is
+        # never closed. The work directory itself is shared and kept.
+        self._finalizer = weakref.finalize(self, self._pool.close) if self._pool is not None else None
+
+    def close(self) -> None:
+        """Stop pooled workers."""
+        if self._finalizer is not None:
+            self._finalizer()
 
     def execute(
         self,
@@ -46,182 +308,235 @@ class SandboxExecutor:
         """
         policy = policy or self.default_policy
 
-        logger.info(f"Executing tool {tool.get('tool_id', 'unknown')} in sandbox")
+        logger.info("Executing tool %s in sandbox", tool.get("tool_id", "unknown"))
 
         try:
-            # Prepare execution environment
-            exec_dir = self._prepare_environment(tool)
+            entrypoint = self._tool_entrypoint(tool)
+            if self._pool is not None and policy.security.reuse_workers:
+                return self._pool.run(self._tool_code(tool), args, policy, entrypoint)
 
-            # Create execution script
-            script_path = self._create_exec_script(tool, args, exec_dir)
+            # The execution directory is removed however execution ends
+            with tempfile.TemporaryDirectory(dir=self.work_dir) as exec_dir:
+                payload = self._one_shot_payload(tool, args, entrypoint)
+                return self._execute_with_limits(payload, Path(exec_dir), policy)
 
-            # Execute with limits
-            result = self._execute_with_limits(script_path, policy)
+        except Exception as e:
+            return self._execution_error(e)
 
-            # Cleanup
-            self._cleanup(exec_dir)
+    async def execute_async(
+        self,
+        tool: Dict[str, Any],
+        args: Dict[str, Any],
+        policy: Optional[SandboxPolicy] = None
+    ) -> Dict[str, Any]:
+        """Execute tool in sandbox without blocking the event loop.
 
-            return result
+        One-shot executions run as asyncio subprocesses, so many of them
+        can be awaited together on one thread. Pooled executions are
+        handed to a thread, as workers answer over blocking pipes.
 
-        except Exception as e:
-            logger.error(f"Sandbox execution error: {e}", exc_info=True)
-            return {
-                "status": "error",
-                "error": str(e),
-                "stdout": "",
-                "stderr": str(e)
-            }
+        Args:
+            tool: Tool artifact with code
+            args: Execution arguments
+            policy: Optional override policy
 
-    def _prepare_environment(self, tool: Dict[str, Any]) -> Path:
-        """Prepare isolated execution environment."""
-        # Create temporary directory for this execution
-        exec_dir = Path(tempfile.mkdtemp(dir=self.work_dir))
+        Returns:
+            Execution result
+        """
+        policy = policy or self.default_policy
+
+        logger.info("Executing tool %s in sandbox", tool.get("tool_id", "unknown"))
 
-        # Write tool code
-        code = tool.get("artifact", {}).get("code", tool.get("code", ""))
-        code_path = exec_dir / "tool_code.py"
-        code_path.write_text(code)
+        try:
+            entrypoint = self._tool_entrypoint(tool)
+            if self._pool is not None and policy.security.reuse_workers:
+                return await asyncio.get_running_loop().run_in_executor(
+                    None, self._pool.run, self._tool_code(tool), args, policy, entrypoint
+                )
 
-        logger.debug(f"Prepared environment at {exec_dir}")
-        return exec_dir
+            with tempfile.TemporaryDirectory(dir=self.work_dir) as exec_dir:
+                payload = self._one_shot_payload(tool, args, entrypoint)
+                return await self._execute_with_limits_async(payload, Path(exec_dir), policy)
 
-    def _create_exec_script(
-        self,
+        except Exception as e:
+            return self._execution_error(e)
+
+    @staticmethod
+    def _execution_error(e: Exception) -> Dict[str, Any]:
+        """Result of an execution that failed outside the tool."""
+        logger.error("Sandbox execution error: %s", e, exc_info=True)
+        return {
+            "status": "error",
+            "error": str(e),
+            "stdout": "",
+            "stderr": str(e)
+        }
+
+    @classmethod
+    def _one_shot_payload(
+        cls,
         tool: Dict[str, Any],
         args: Dict[str, Any],
-        exec_dir: Path
-    ) -> Path:
-        """Create execution script."""
-        script = f"""
-import sys
-import json
-
-# Load tool code
-with open('tool_code.py', 'r') as f:
-    exec(f.read(), globals())
-
-# Load arguments
-args = {json.dumps(args)}
-
-# Execute tool
-try:
-    # Find the main function (avoid iteration issues)
-    tool_func = None
-    all_names = list(globals().keys())
-    for name in all_names:
-        obj = globals()[name]
-        if callable(obj) and not name.startswith('_'):
-            tool_func = obj
-            break
-    
-    if tool_func:
-        result = tool_func(args)
-        print(json.dumps({{"status": "success", "result": result}}))
-    else:
-        print(json.dumps({{"status": "error", "error": "No executable function found"}}))
-except Exception as e:
-    import traceback
-    print(json.dumps({{"status": "error", "error": str(e), "traceback": traceback.format_exc()}}))
-"""
-
-        script_path = exec_dir / "exec_script.py"
-        script_path.write_text(script)
-        return script_path
+        entrypoint: Optional[str]
+    ) -> Dict[str, Any]:
+        """Request sent to a one-shot runner."""
+        payload = {"code": cls._tool_code(tool), "args": args}
+        if entrypoint is not None:
+            payload["entrypoint"] = entrypoint
+        return payload
+
+    @staticmethod
+    def _tool_code(tool: Dict[str, Any]) -> str:
+        """Source code of a tool."""
+        code: str = tool.get("artifact", {}).get("code", tool.get("code", ""))
+        return code
+
+    @staticmethod
+    def _tool_entrypoint(tool: Dict[str, Any]) -> Optional[str]:
+        """Name of the function to call, if the tool declares one."""
+        entrypoint: Optional[str] = tool.get("artifact", {}).get("entrypoint", tool.get("entrypoint"))
+        return entrypoint
+
+    @staticmethod
+    def _one_shot_command(resource_policy: ResourcePolicy) -> List[str]:
+        """Command line of a one-shot runner.
+
+        The runner applies the limits to itself, so no preexec_fn is needed
+        and subprocess can spawn with vfork instead of forking this process.
+        """
+        return [
+            sys.executable,
+            _RUNNER,
+            "once",
+            str(resource_policy.cpu_time_limit),
+            str(resource_policy.memory_limit_mb * 1024 * 1024)
+        ]
 
     def _execute_with_limits(
         self,
-        script_path: Path,
+        payload: Dict[str, Any],
+        exec_dir: Path,
         policy: SandboxPolicy
     ) -> Dict[str, Any]:
-        """Execute script with resource limits."""
+        """Run the tool runner once with resource limits, passing the request on stdin."""
         resource_policy = policy.resource
 
-        # Build command
-        cmd = [
-            "python3",
-            str(script_path)
-        ]
-
         try:
-            # Set resource limits (simplified version)
-            # In production: use cgroups, rlimits properly
-
+            # In production: use cgroups
             process = subprocess.Popen(
-                cmd,
-                cwd=script_path.parent,
+                self._one_shot_command(resource_policy),
+                cwd=exec_dir,
+                stdin=subprocess.PIPE,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True,
-                preexec_fn=self._set_limits(resource_policy)
+                bufsize=-1
             )
 
-            # Wait with timeout
+            # Wait with timeout. Output is collected as bytes and decoded once.
             try:
-                stdout, stderr = process.communicate(timeout=resource_policy.wall_time_limit)
-                returncode = process.returncode
+                stdout_bytes, stderr_bytes = process.communicate(
+                    input=dumps(payload),
+                    timeout=resource_policy.wall_time_limit
+                )
             except subprocess.TimeoutExpired:
                 process.kill()
-                stdout, stderr = process.communicate()
+                stdout_bytes, stderr_bytes = process.communicate()
                 return {
                     "status": "timeout",
                     "error": "Execution timed out",
-                    "stdout": stdout,
-                    "stderr": stderr
+                    "stdout": stdout_bytes.decode("utf-8", "replace"),
+                    "stderr": stderr_bytes.decode("utf-8", "replace")
                 }
 
-            # Parse result
-            if returncode == 0 and stdout:
-                try:
-                    result_data = json.loads(stdout.strip())
-                    return result_data
-                except json.JSONDecodeError:
-                    return {
-                        "status": "success",
-                        "result": {"output": stdout},
-                        "stdout": stdout,
-                        "stderr": stderr
-                    }
-            else:
-                return {
-                    "status": "error",
-                    "error": f"Process exited with code {returncode}",
-                    "stdout": stdout,
-                    "stderr": stderr
-                }
+            return self._one_shot_result(process.returncode, stdout_bytes, stderr_bytes, resource_policy)
 
         except Exception as e:
-            logger.error(f"Execution error: {e}")
+            logger.error("Execution error: %s", e)
             return {
                 "status": "error",
                 "error": str(e)
             }
 
-    def _set_limits(self, policy: ResourcePolicy):
-        """Return function to set resource limits."""
-        def limits():
+    async def _execute_with_limits_async(
+        self,
+        payload: Dict[str, Any],
+        exec_dir: Path,
+        policy: SandboxPolicy
+    ) -> Dict[str, Any]:
+        """Asyncio counterpart of _execute_with_limits."""
+        resource_policy = policy.resource
+
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *self._one_shot_command(resource_policy),
+                cwd=exec_dir,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE
+            )
+
             try:
-                import resource
-                # Set CPU time limit
-                resource.setrlimit(
-                    resource.RLIMIT_CPU,
-                    (policy.cpu_time_limit, policy.cpu_time_limit)
-                )
-                # Set memory limit
-                mem_bytes = policy.memory_limit_mb * 1024 * 1024
-                resource.setrlimit(
-                    resource.RLIMIT_AS,
-                    (mem_bytes, mem_bytes)
+                stdout_bytes, stderr_bytes = await asyncio.wait_for(
+                    process.communicate(input=dumps(payload)),
+                    timeout=resource_policy.wall_time_limit
                 )
-            except Exception as e:
-                logger.warning(f"Could not set resource limits: {e}")
+            except asyncio.TimeoutError:
+                # Output read so far is discarded with the cancelled read
+                process.kill()
+                await process.wait()
+                return {
+                    "status": "timeout",
+                    "error": "Execution timed out",
+                    "stdout": "",
+                    "stderr": ""
+                }
 
-        return limits
+            return self._one_shot_result(process.returncode, stdout_bytes, stderr_bytes, resource_policy)
 
-    def _cleanup(self, exec_dir: Path) -> None:
-        """Cleanup execution directory."""
-        try:
-            import shutil
-            shutil.rmtree(exec_dir)
-            logger.debug(f"Cleaned up {exec_dir}")
         except Exception as e:
-            logger.warning(f"Cleanup error: {e}")
+            logger.error("Execution error: %s", e)
+            return {
+                "status": "error",
+                "error": str(e)
+            }
+
+    @staticmethod
+    def _one_shot_result(
+        returncode: Optional[int],
+        stdout_bytes: bytes,
+        stderr_bytes: bytes,
+        resource_policy: ResourcePolicy
+    ) -> Dict[str, Any]:
+        """Build the result of a finished one-shot runner from its output."""
+        stderr = stderr_bytes.decode("utf-8", "replace")
+
+        # The result is the last line, after anything written straight
+        # to the process's stdout. It is parsed from the bytes without
+        # decoding the rest of the output.
+        start = stdout_bytes.rfind(_RESULT_MARKER)
+        if returncode == 0 and start != -1:
+            try:
+                result_data = loads(stdout_bytes[start + len(_RESULT_MARKER):])
+            except ValueError:
+                result_data = None
+            if isinstance(result_data, dict):
+                if start:
+                    limit = resource_policy.max_file_size_mb * 1024 * 1024
+                    stray = stdout_bytes[:min(start, limit)].decode("utf-8", "replace")
+                    result_data["stdout"] = stray + result_data.get("stdout", "")
+                return result_data
+
+        stdout = stdout_bytes.decode("utf-8", "replace")
+        if returncode == 0 and stdout:
+            return {
+                "status": "success",
+                "result": {"output": stdout},
+                "stdout": stdout,
+                "stderr": stderr
+            }
+        return {
+            "status": "error",
+            "error": f"Process exited with code {returncode}",
+            "stdout": stdout,
+            "stderr": stderr
+        }
@@ -3,8 +3,10 @@
 from dataclasses import dataclass
 from typing import Set
 
+from evomind.utils.compat import DATACLASS_SLOTS
 
-@dataclass
+
+@dataclass(**DATACLASS_SLOTS)
 class ResourcePolicy:
     """Resource limits for sandbox execution."""
 
@@ -27,7 +29,7 @@ class ResourcePolicy:
         }
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class SecurityPolicy:
     """Security constraints for sandbox execution."""
 
@@ -37,6 +39,8 @@ class SecurityPolicy:
     allowed_write_paths: Set[str] = None
     allow_subprocess: bool = False
     allow_imports: Set[str] = None
+    # Run on persistent workers shared with earlier executions
+    reuse_workers: bool = True
 
     def __post_init__(self):
         if self.allowed_hosts is None:
@@ -57,11 +61,12 @@ class SecurityPolicy:
             "filesystem_readonly": self.filesystem_readonly,
             "allowed_write_paths": list(self.allowed_write_paths),
             "allow_subprocess": self.allow_subprocess,
-            "allow_imports": list(self.allow_imports)
+            "allow_imports": list(self.allow_imports),
+            "reuse_workers": self.reuse_workers
         }
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class SandboxPolicy:
     """Combined sandbox policy."""
 
@@ -0,0 +1,6 @@
+"""Compatibility helpers for supported Python versions."""
+
+import sys
+
+# Keyword arguments enabling __slots__ on dataclasses (supported from Python 3.10)
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
@@ -1,11 +1,10 @@
 """Configuration management."""
 
 import os
-from typing import Any, Dict, Optional
+from typing import Any, Callable, ClassVar, Dict, FrozenSet, Optional, Tuple
 from pathlib import Path
-import yaml
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 
 
 @dataclass
@@ -41,23 +40,39 @@ class Config:
     api_host: str = "0.0.0.0"
     api_port: int = 8000
 
+    # Environment variables read by from_env, in order of precedence, and
+    # the parser for their value. Fields without a set variable keep
+    # their default.
+    _ENV_VARS: ClassVar[Dict[str, Tuple[Tuple[str, ...], Callable[[str], Any]]]] = {
+        "confidence_threshold": (("EVOMIND_CONFIDENCE_THRESHOLD",), float),
+        "max_retries": (("EVOMIND_MAX_RETRIES",), int),
+        "llm_provider": (("EVOMIND_LLM_PROVIDER",), str),
+        "llm_model": (("EVOMIND_LLM_MODEL",), str),
+        "llm_api_key": (("EVOMIND_LLM_API_KEY", "GEMINI_API_KEY"), str),
+        "sandbox_cpu_limit": (("EVOMIND_SANDBOX_CPU_LIMIT",), int),
+        "sandbox_memory_mb": (("EVOMIND_SANDBOX_MEMORY_MB",), int),
+        "sandbox_timeout": (("EVOMIND_SANDBOX_TIMEOUT",), int),
+        "log_level": (("EVOMIND_LOG_LEVEL",), str),
+        "log_structured": (("EVOMIND_LOG_STRUCTURED",), lambda value: value.lower() == "true"),
+        "api_host": (("EVOMIND_API_HOST",), str),
+        "api_port": (("EVOMIND_API_PORT",), int),
+    }
+
+    # Fields left out of to_dict
+    _SECRET_FIELDS: ClassVar[FrozenSet[str]] = frozenset({"llm_api_key"})
+
     @classmethod
     def from_env(cls) -> "Config":
         """Create config from environment variables."""
-        return cls(
-            confidence_threshold=float(os.getenv("EVOMIND_CONFIDENCE_THRESHOLD", "0.7")),
-            max_retries=int(os.getenv("EVOMIND_MAX_RETRIES", "3")),
-            llm_provider=os.getenv("EVOMIND_LLM_PROVIDER", "gemini"),
-            llm_model=os.getenv("EVOMIND_LLM_MODEL", "gemini-2.0-flash-exp"),
-            llm_api_key=os.getenv("EVOMIND_LLM_API_KEY") or os.getenv("GEMINI_API_KEY"),
-            sandbox_cpu_limit=int(os.getenv("EVOMIND_SANDBOX_CPU_LIMIT", "30")),
-            sandbox_memory_mb=int(os.getenv("EVOMIND_SANDBOX_MEMORY_MB", "512")),
-            sandbox_timeout=int(os.getenv("EVOMIND_SANDBOX_TIMEOUT", "60")),
-            log_level=os.getenv("EVOMIND_LOG_LEVEL", "INFO"),
-            log_structured=os.getenv("EVOMIND_LOG_STRUCTURED", "false").lower() == "true",
-            api_host=os.getenv("EVOMIND_API_HOST", "0.0.0.0"),
-            api_port=int(os.getenv("EVOMIND_API_PORT", "8000")),
-        )
+        env = os.environ
+        values = {}
+        for name, (variables, parse) in cls._ENV_VARS.items():
+            for variable in variables:
+                value = env.get(variable)
+                if value:
+                    values[name] = parse(value)
+                    break
+        return cls(**values)
 
     @classmethod
     def from_file(cls, path: str) -> "Config":
@@ -69,8 +84,12 @@ class Config:
 
         content = file_path.read_text()
 
-        if path.endswith(".yaml") or path.endswith(".yml"):
-            data = yaml.safe_load(content)
+        if path.endswith((".yaml", ".yml")):
+            # Imported here so JSON-only use never loads PyYAML
+            import yaml
+            # The C parser is much faster, when PyYAML was built with libyaml
+            loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+            data = yaml.load(content, Loader=loader)
         elif path.endswith(".json"):
             data = json.loads(content)
         else:
@@ -79,20 +98,9 @@ class Config:
         return cls(**data)
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert config to dictionary."""
+        """Convert config to dictionary, leaving out secrets."""
         return {
-            "confidence_threshold": self.confidence_threshold,
-            "max_retries": self.max_retries,
-            "llm_provider": self.llm_provider,
-            "llm_model": self.llm_model,
-            "llm_temperature": self.llm_temperature,
-            "sandbox_cpu_limit": self.sandbox_cpu_limit,
-            "sandbox_memory_mb": self.sandbox_memory_mb,
-            "sandbox_timeout": self.sandbox_timeout,
-            "sandbox_network_enabled": self.sandbox_network_enabled,
-            "log_level": self.log_level,
-            "log_structured": self.log_structured,
-            "metrics_enabled": self.metrics_enabled,
-            "api_host": self.api_host,
-            "api_port": self.api_port,
+            f.name: getattr(self, f.name)
+            for f in fields(self)
+            if f.name not in self._SECRET_FIELDS
         }
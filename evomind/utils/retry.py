@@ -3,8 +3,8 @@
 import logging
 import time
 import random
-from typing import Callable, Any, Optional, Type
-from dataclasses import dataclass
+from typing import Callable, Any, List, Optional, Type
+from dataclasses import dataclass, field
 from functools import wraps
 
 logger = logging.getLogger(__name__)
@@ -20,17 +20,29 @@ class RetryPolicy:
     exponential_base: float = 2.0
     jitter: bool = True
 
-    def get_delay(self, attempt: int) -> float:
-        """Calculate delay for attempt."""
-        delay = min(
+    # Delay before jitter for each attempt within max_attempts
+    _base_delays: List[float] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._base_delays = [self._base_delay(i) for i in range(self.max_attempts)]
+
+    def _base_delay(self, attempt: int) -> float:
+        """Exponential delay for attempt, capped at max_delay."""
+        return min(
             self.initial_delay * (self.exponential_base ** attempt),
             self.max_delay
         )
 
+    def get_delay(self, attempt: int) -> float:
+        """Calculate delay for attempt."""
+        if 0 <= attempt < len(self._base_delays):
+            delay = self._base_delays[attempt]
+        else:
+            delay = self._base_delay(attempt)
+
         if self.jitter:
             # Add random jitter (±25%)
-            jitter_range = delay * 0.25
-            delay += random.uniform(-jitter_range, jitter_range)
+            delay *= 1 + random.random() * 0.5 - 0.25
 
         return max(0, delay)
 
@@ -49,6 +61,7 @@ class CircuitBreaker:
         self.expected_exception = expected_exception
 
         self.failure_count = 0
+        # time.monotonic() of the latest failure
         self.last_failure_time: Optional[float] = None
         self.state = "closed"  # closed, open, half_open
 
@@ -73,7 +86,7 @@ class CircuitBreaker:
         if self.last_failure_time is None:
             return True
 
-        return (time.time() - self.last_failure_time) >= self.recovery_timeout
+        return (time.monotonic() - self.last_failure_time) >= self.recovery_timeout
 
     def _on_success(self) -> None:
         """Handle successful call."""
@@ -83,11 +96,11 @@ class CircuitBreaker:
     def _on_failure(self) -> None:
         """Handle failed call."""
         self.failure_count += 1
-        self.last_failure_time = time.time()
+        self.last_failure_time = time.monotonic()
 
         if self.failure_count >= self.failure_threshold:
             self.state = "open"
-            logger.warning(f"Circuit breaker opened after {self.failure_count} failures")
+            logger.warning("Circuit breaker opened after %d failures", self.failure_count)
 
 
 def with_retry(
@@ -122,13 +135,13 @@ def with_retry(
                     if attempt < policy.max_attempts - 1:
                         delay = policy.get_delay(attempt)
                         logger.warning(
-                            f"Attempt {attempt + 1}/{policy.max_attempts} failed: {e}. "
-                            f"Retrying in {delay:.2f}s..."
+                            "Attempt %d/%d failed: %s. Retrying in %.2fs...",
+                            attempt + 1, policy.max_attempts, e, delay
                         )
                         time.sleep(delay)
                     else:
                         logger.error(
-                            f"All {policy.max_attempts} attempts failed. Last error: {e}"
+                            "All %d attempts failed. Last error: %s", policy.max_attempts, e
                         )
 
             # All attempts failed
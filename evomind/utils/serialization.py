@@ -0,0 +1,56 @@
+"""JSON encoding and decoding, with orjson when it is installed.
+
+Both paths produce compact UTF-8 bytes. Values orjson rejects, such as
+integers beyond 64 bits, fall back to the standard encoder.
+"""
+
+import json
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def dumps(
+    obj: Any,
+    sort_keys: bool = False,
+    indent: bool = False,
+    default: Optional[Callable[[Any], Any]] = None
+) -> bytes:
+    """Serialize a value to JSON bytes.
+
+    Args:
+        obj: Value to serialize
+        sort_keys: Emit object keys in sorted order
+        indent: Pretty-print with two-space indentation
+        default: Called for values JSON cannot represent
+    """
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=default, option=option)
+        except TypeError:
+            pass
+
+    return json.dumps(
+        obj,
+        sort_keys=sort_keys,
+        indent=2 if indent else None,
+        separators=None if indent else (",", ":"),
+        ensure_ascii=False,
+        default=default
+    ).encode()
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON text or bytes."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
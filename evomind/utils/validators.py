@@ -1,10 +1,15 @@
 """Result validation utilities."""
 
+import json
 import logging
-from typing import Dict, Any
+import re
+from typing import Dict, Any, List, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Strings matching this are redacted by InputValidator.sanitize_output
+_SECRET_RE = re.compile(r"password|secret", re.IGNORECASE)
+
 
 class ResultValidator:
     """Validator for execution results."""
@@ -62,24 +67,62 @@ class ResultValidator:
         required_fields = schema.get("required", [])
         for field in required_fields:
             if field not in result:
-                logger.warning(f"Required field '{field}' missing from result")
+                logger.warning("Required field '%s' missing from result", field)
                 return False
 
         return True
 
 
+class _ByteCountingStream:
+    """Write target for json.dump that only counts, up to a limit."""
+
+    __slots__ = ("limit", "size")
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.size = 0
+
+    def write(self, chunk: str) -> None:
+        # json.dump escapes non-ASCII by default, so characters are bytes
+        self.size += len(chunk)
+        if self.size > self.limit:
+            raise OverflowError(self.size)
+
+
+def _with_str_keys(data: Any) -> Any:
+    """Copy of nested dicts and sequences with every dict key stringified."""
+    if isinstance(data, dict):
+        return {str(k): _with_str_keys(v) for k, v in data.items()}
+    if isinstance(data, (list, tuple)):
+        return [_with_str_keys(v) for v in data]
+    return data
+
+
 class InputValidator:
     """Validator for input data."""
 
     @staticmethod
     def validate_size(data: Any, max_size_mb: int = 10) -> bool:
-        """Validate data size."""
-        import sys
-        size_bytes = sys.getsizeof(data)
-        size_mb = size_bytes / (1024 * 1024)
+        """Validate data size, measured as its JSON encoding.
 
-        if size_mb > max_size_mb:
-            logger.warning(f"Input data too large: {size_mb:.2f}MB > {max_size_mb}MB")
+        Serialization stops as soon as the limit is exceeded, so oversized
+        inputs are rejected without encoding them in full.
+        """
+        stream = _ByteCountingStream(max_size_mb * 1024 * 1024)
+        try:
+            try:
+                json.dump(data, stream, default=str)
+            except TypeError:
+                # Keys JSON cannot encode, such as tuples, are measured as
+                # their string form
+                stream.size = 0
+                json.dump(_with_str_keys(data), stream, default=str)
+        except OverflowError:
+            logger.warning("Input data too large: over %dMB", max_size_mb)
+            return False
+        except (ValueError, RecursionError) as e:
+            # Circular references
+            logger.warning("Input data cannot be measured: %s", e)
             return False
 
         return True
@@ -87,12 +130,28 @@ class InputValidator:
     @staticmethod
     def sanitize_output(data: Any) -> Any:
         """Sanitize output data."""
-        # Remove sensitive patterns
-        if isinstance(data, dict):
-            return {k: InputValidator.sanitize_output(v) for k, v in data.items()}
-        elif isinstance(data, str):
-            # Simplified: in production use proper secret detection
-            if "password" in data.lower() or "secret" in data.lower():
-                return "[REDACTED]"
-
-        return data
+        # Simplified: in production use proper secret detection
+        if isinstance(data, str):
+            return "[REDACTED]" if _SECRET_RE.search(data) else data
+        if not isinstance(data, dict):
+            return data
+
+        # Copy nested dicts with an explicit stack instead of recursion.
+        # A dict reached again, as in a cycle, maps to its existing copy.
+        sanitized: Dict[Any, Any] = {}
+        copies = {id(data): sanitized}
+        stack: List[Tuple[Dict[Any, Any], Dict[Any, Any]]] = [(data, sanitized)]
+        while stack:
+            source, target = stack.pop()
+            for key, value in source.items():
+                if isinstance(value, dict):
+                    copy = copies.get(id(value))
+                    if copy is None:
+                        copy = copies[id(value)] = {}
+                        stack.append((value, copy))
+                    target[key] = copy
+                elif isinstance(value, str) and _SECRET_RE.search(value):
+                    target[key] = "[REDACTED]"
+                else:
+                    target[key] = value
+        return sanitized
@@ -1,12 +1,34 @@
 #!/usr/bin/env python3
 """
-Advanced example showing custom configuration and error handling.
+Advanced example showing custom configuration, error handling and
+processing independent tasks in parallel.
 """
 
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 from evomind import AgentController
 from evomind.utils.config import Config
 from evomind.observability.logging import setup_logging
 
+# Agent of each worker process; an agent handles one request at a time
+_agent = None
+
+
+def _init_worker(confidence_threshold):
+    """Create the agent used by this worker process."""
+    global _agent
+    setup_logging(level="INFO", structured=False)
+    _agent = AgentController(confidence_threshold=confidence_threshold)
+
+
+def _handle(task):
+    """Handle one task, reporting errors as results."""
+    try:
+        return _agent.handle_request({"task": task})
+    except Exception as e:
+        return {"status": "exception", "error": str(e)}
+
 
 def main():
     print("EvoMind Advanced Example")
@@ -22,31 +44,31 @@ def main():
         sandbox_memory_mb=1024
     )
     
-    # Create agent with custom config
-    agent = AgentController(
-        confidence_threshold=config.confidence_threshold
-    )
-    
-    # Multiple requests
+    # Multiple independent requests
     tasks = [
         "Parse JSON data",
         "Transform CSV to JSON",
         "Calculate statistics"
     ]
-    
-    for i, task in enumerate(tasks, 1):
+
+    # Process tasks in parallel, with one agent per worker process
+    workers = min(len(tasks), os.cpu_count() or 1)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(config.confidence_threshold,)
+    ) as executor:
+        results = list(executor.map(_handle, tasks))
+
+    for i, (task, result) in enumerate(zip(tasks, results), 1):
         print(f"\n{i}. Processing: {task}")
-        
-        try:
-            result = agent.handle_request({"task": task})
-            
-            if result["status"] == "success":
-                print("   ✓ Success")
-            else:
-                print(f"   ⚠ Status: {result['status']}")
-        
-        except Exception as e:
-            print(f"   ✗ Error: {e}")
+
+        if result["status"] == "success":
+            print("   ✓ Success")
+        elif result["status"] == "exception":
+            print(f"   ✗ Error: {result['error']}")
+        else:
+            print(f"   ⚠ Status: {result['status']}")
     
     print("\n" + "=" * 50)
 
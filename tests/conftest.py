@@ -0,0 +1,46 @@
+"""Shared fixtures for the test suite.
+
+Registries, generators and executors are built once per session and
+reset between tests, so their setup (opening the database, warming
+sandbox workers) is not repeated by every test.
+"""
+
+import pytest
+
+from evomind.codegen.generator import CodeGenerator
+from evomind.registry.tool_registry import ToolRegistry
+from evomind.sandbox.executor import SandboxExecutor
+
+
+@pytest.fixture(scope="session")
+def shared_registry(tmp_path_factory):
+    registry = ToolRegistry(storage_path=tmp_path_factory.mktemp("registry"))
+    yield registry
+    registry.close()
+
+
+@pytest.fixture
+def registry(shared_registry):
+    """Empty registry, cleared again after the test."""
+    yield shared_registry
+    shared_registry.reset()
+
+
+@pytest.fixture(scope="session")
+def shared_generator():
+    return CodeGenerator()
+
+
+@pytest.fixture
+def generator(shared_generator):
+    """Template code generator with an empty tool cache."""
+    yield shared_generator
+    shared_generator.clear_cache()
+
+
+@pytest.fixture(scope="session")
+def executor(tmp_path_factory):
+    """Sandbox executor whose worker pool is shared by the session."""
+    executor = SandboxExecutor(work_dir=tmp_path_factory.mktemp("sandbox"))
+    yield executor
+    executor.close()
@@ -1,20 +1,22 @@
 """Tests for agent controller."""
 
+import pytest
+
 from evomind.agent.controller import AgentController
-from evomind.agent.state import AgentState, StateType
+from evomind.agent.state import FEEDBACK_LIMIT, HISTORY_LIMIT, AgentState, StateType, is_legal_transition
 
 
-def test_agent_initialization():
+def test_agent_initialization(registry, generator, executor):
     """Test agent controller initialization."""
-    agent = AgentController()
+    agent = AgentController(registry, generator, executor)
     
     assert agent is not None
     assert agent.state.current_state == StateType.IDLE
 
 
-def test_handle_simple_request():
+def test_handle_simple_request(registry, generator, executor):
     """Test handling a simple request."""
-    agent = AgentController()
+    agent = AgentController(registry, generator, executor)
     
     request = {
         "task": "simple test task"
@@ -36,9 +38,25 @@ def test_state_transitions():
     assert state.current_state == StateType.PLAN
     assert len(state.history) == 1
     
-    state.transition(StateType.EXECUTE)
-    assert state.current_state == StateType.EXECUTE
+    state.transition(StateType.SELECT_TOOL)
+    assert state.current_state == StateType.SELECT_TOOL
     assert len(state.history) == 2
+    assert state.history_values == ["plan", "select_tool"]
+
+    state.reset()
+    assert state.history_values == []
+
+
+def test_illegal_state_transition():
+    """Test the state machine rejects illegal transitions."""
+    state = AgentState()
+
+    assert is_legal_transition(StateType.VERIFY, StateType.LEARN) is True
+    assert is_legal_transition(StateType.EXECUTE, StateType.ERROR) is True
+    assert is_legal_transition(StateType.IDLE, StateType.RESPOND) is False
+
+    with pytest.raises(AssertionError):
+        state.transition(StateType.RESPOND)
 
 
 def test_feedback_tracking():
@@ -48,7 +66,7 @@ def test_feedback_tracking():
     state.add_feedback("error", {"message": "test error"})
     
     assert len(state.feedback) == 1
-    assert state.feedback[0]["category"] == "error"
+    assert state.feedback[0].category == "error"
 
 
 def test_retry_logic():
@@ -63,3 +81,181 @@ def test_retry_logic():
     state.increment_retry()
     state.increment_retry()
     assert state.can_retry() is False
+
+
+def test_independent_actions_batched(registry, generator):
+    """Test independent plan actions are executed as one batch."""
+    class RecordingExecutor:
+        def __init__(self):
+            self.calls = []
+
+        def execute(self, tool, args):
+            self.calls.append(args)
+            return {"status": "success", "result": args}
+
+    executor = RecordingExecutor()
+    agent = AgentController(registry, generator, executor, max_parallel_tools=2)
+
+    plan = {
+        "actions": [
+            {"type": "execute", "args": {"n": 1}},
+            {"type": "execute", "args": {"n": 2}},
+            {"type": "summarize", "depends_on": "execute"}
+        ]
+    }
+
+    agent.state.transition(StateType.PLAN)
+    agent.state.transition(StateType.SELECT_TOOL)
+    result = agent._run_plan_calls({"tool_id": "t"}, plan)
+
+    assert len(executor.calls) == 2
+    assert result["status"] == "success"
+    assert result["result"] == [{"n": 1}, {"n": 2}]
+
+
+def test_failure_counters():
+    """Test feedback counters are maintained incrementally."""
+    state = AgentState()
+
+    state.add_feedback("bad_result", {})
+    state.add_feedback("execution_error", {})
+    state.add_feedback("error", {})
+
+    assert state.failure_count == 2
+    assert state.feedback_count("execution_error") == 1
+    assert len(state.error_feedback) == 2
+
+    state.reset()
+    assert state.failure_count == 0
+    assert list(state.error_feedback) == []
+
+
+def test_aggregate_only_feedback():
+    """Test aggregate-only state counts feedback without storing entries."""
+    state = AgentState(aggregate_only=True)
+
+    state.add_feedback("bad_result", {})
+    state.add_feedback("bad_result", {})
+    state.add_feedback("tool_creation_failed", {})
+
+    assert list(state.feedback) == []
+    assert state.failure_count == 2
+    assert state.feedback_counts == {"bad_result": 2, "tool_creation_failed": 1}
+
+    state.reset()
+    assert state.aggregate_only is True
+
+
+def test_retry_reuses_plan(registry, generator):
+    """Test failed executions retry without re-planning."""
+    class FailingExecutor:
+        def __init__(self):
+            self.calls = 0
+
+        def execute(self, tool, args):
+            self.calls += 1
+            return {"status": "error", "error": "boom"}
+
+    executor = FailingExecutor()
+    agent = AgentController(registry, generator, executor)
+
+    result = agent.handle_request({"task": "always failing task"})
+
+    assert result["status"] == "degraded"
+    assert executor.calls == agent.state.max_retries
+    plan_states = [t for t in agent.state.history if t.to_state == StateType.PLAN]
+    assert len(plan_states) == 1
+
+    # A new request starts with a fresh retry budget
+    agent.handle_request({"task": "always failing task"})
+    assert executor.calls == 2 * agent.state.max_retries
+
+
+def test_failure_episode_stores_plain_feedback(registry, generator):
+    """Test failed requests store their feedback in episodic memory as plain dicts."""
+    class FailingExecutor:
+        def execute(self, tool, args):
+            return {"status": "error", "error": "boom"}
+
+    agent = AgentController(registry, generator, FailingExecutor())
+    agent.handle_request({"task": "always failing task"})
+
+    episodes = list(agent.context_manager.episodic)
+    assert len(episodes) == agent.state.max_retries
+    for attempt, episode in enumerate(episodes, 1):
+        # Each episode keeps the feedback up to its own attempt
+        assert len(episode["feedback"]) == attempt
+        assert all(set(entry) == {"category", "details"} for entry in episode["feedback"])
+
+
+def test_degraded_feedback_timestamps(registry, generator, executor):
+    """Test feedback timestamps are formatted on output."""
+    agent = AgentController(registry, generator, executor)
+    agent.state.add_feedback("error", {"message": "test error"})
+
+    assert isinstance(agent.state.feedback[0].timestamp_ns, int)
+
+    response = agent._graceful_degrade(agent.state.feedback)
+    assert response["feedback"][0]["timestamp"].endswith("+00:00")
+
+
+def test_tool_spec_cached_by_intent(registry, generator, executor):
+    """Test synthesized tool specs are reused for identical plans."""
+    agent = AgentController(registry, generator, executor)
+    plan = {"intent": "sum numbers", "io_spec": {"input_type": "list", "constraints": ()}}
+
+    first = agent._synthesize_tool_spec(plan)
+    second = agent._synthesize_tool_spec(dict(plan))
+
+    assert first == second
+    assert first is not second
+    assert first["tests"] is second["tests"]
+    assert first["name"] == "tool_sum_numbers"
+
+
+def test_tool_spec_name_sanitized(registry, generator, executor):
+    """Test tool names replace separators from the intent."""
+    agent = AgentController(registry, generator, executor)
+
+    spec = agent._synthesize_tool_spec({"intent": "convert c:/temp\\files now", "io_spec": {}})
+
+    assert spec["name"] == "tool_convert_c__temp_files_now"
+
+
+def test_history_and_feedback_bounded():
+    """Test long-lived states keep only the most recent transitions and feedback."""
+    state = AgentState()
+    state.transition(StateType.PLAN)
+    cycle = (StateType.SELECT_TOOL, StateType.EXECUTE, StateType.VERIFY, StateType.LEARN, StateType.PLAN)
+    for _ in range(HISTORY_LIMIT):
+        for to_state in cycle:
+            state.transition(to_state)
+    for i in range(FEEDBACK_LIMIT + 10):
+        state.add_feedback("error", {"i": i})
+
+    assert len(state.history_values) <= HISTORY_LIMIT
+    assert state.history_values[-5:] == [s.value for s in cycle]
+    assert len(state.feedback) == len(state.error_feedback) == FEEDBACK_LIMIT
+    assert state.feedback[0].details == {"i": 10}
+    assert state.feedback_count("error") == FEEDBACK_LIMIT + 10
+
+
+def test_controller_does_not_import_genai(tmp_path):
+    """Test building an agent without LLM use leaves the Gemini SDK unimported."""
+    import subprocess
+    import sys
+
+    code = (
+        "import sys\n"
+        "from pathlib import Path\n"
+        "from evomind.agent.controller import AgentController\n"
+        "from evomind.registry.tool_registry import ToolRegistry\n"
+        "import evomind.llm\n"
+        "AgentController(ToolRegistry(storage_path=Path(sys.argv[1])))\n"
+        "print('google.genai' in sys.modules)\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code, str(tmp_path)], capture_output=True, text=True, check=True
+    )
+
+    assert output.stdout.strip() == "False"
@@ -1,20 +1,18 @@
 """Tests for code generation."""
 
+import pytest
+
 from evomind.codegen.generator import CodeGenerator
 from evomind.codegen.validators import StaticValidator
 
 
-def test_code_generator_initialization():
+def test_code_generator_initialization(generator):
     """Test code generator initialization."""
-    generator = CodeGenerator()
-    
     assert generator is not None
 
 
-def test_create_tool():
+def test_create_tool(generator):
     """Test tool creation."""
-    generator = CodeGenerator()
-    
     spec = {
         "name": "test_tool",
         "description": "A test tool",
@@ -88,3 +86,311 @@ def test_template_generation():
     
     assert code is not None
     assert "def test_func" in code
+
+
+def test_validation_reuses_parsed_tree():
+    """Test validators accept an already parsed tree."""
+    from evomind.codegen.validators import TypeChecker, parse_code
+
+    code = """
+import os
+
+def untyped(x):
+    return x
+"""
+    tree = parse_code(code)
+
+    result = StaticValidator().validate(code, tree)
+    type_result = TypeChecker().check(code, tree)
+
+    assert result.passed is False
+    assert len(type_result.findings) == 1
+    assert parse_code("def invalid syntax here") is None
+
+
+def test_static_validation_single_pass_findings():
+    """Test policy and security findings are reported together."""
+    validator = StaticValidator()
+
+    code = """
+import json
+
+def read(path: str) -> str:
+    data = open(path).read()
+    return eval(data)
+"""
+
+    result = validator.validate(code)
+
+    categories = {f["category"] for f in result.blockers}
+    assert categories == {"policy", "security"}
+
+
+def test_static_validation_infinite_loop():
+    """Test infinite loops are detected from the AST."""
+    validator = StaticValidator()
+
+    looping = """
+def spin(x: int) -> int:
+    while True:
+        for i in range(x):
+            break
+"""
+    exiting = """
+def first(items: list) -> int:
+    # while True: without a break would loop forever
+    while True:
+        return items[0]
+"""
+
+    nested_return = """
+def find(xs: list) -> int:
+    while True:
+        for x in xs:
+            if x:
+                return x
+"""
+
+    assert any(f["category"] == "safety" for f in validator.validate(looping).blockers)
+    assert validator.validate(exiting).passed is True
+    assert validator.validate(nested_return).passed is True
+
+
+def test_validator_import_sets_shared():
+    """Test validators share import sets per network permission."""
+    offline = StaticValidator()
+    online = StaticValidator(allow_network=True)
+
+    assert offline.dangerous_imports is StaticValidator().dangerous_imports
+    assert "socket" in offline.dangerous_imports
+    assert "socket" in online.allowed_imports
+    assert "socket" not in online.dangerous_imports
+
+
+def test_validation_results_cached_by_content():
+    """Test re-validating identical code reuses the cached result."""
+    validator = StaticValidator()
+    code = "import os\n"
+    calls = []
+    run_checks = validator._run_checks
+    validator._run_checks = lambda *args: calls.append(args) or run_checks(*args)
+
+    first = validator.validate(code)
+    second = validator.validate(code)
+
+    assert len(calls) == 1
+    assert first is not second
+    assert second.blockers == first.blockers
+    assert second.passed is False
+
+
+def test_template_generation_matches_format():
+    """Test pre-split templates render like str.format."""
+    from evomind.codegen.generator import CodeTemplates
+
+    code = CodeTemplates().generate_function(name="f", description="Uses {braces}", io_spec={})
+
+    assert code == CodeTemplates._FUNCTION_TEMPLATE.format(name="f", description="Uses {braces}")
+    assert '"status": "success"' in code
+
+
+def test_generator_does_not_import_llm_client():
+    """Test template-only code generation leaves the Gemini SDK unimported."""
+    import subprocess
+    import sys
+
+    code = (
+        "import sys\n"
+        "from evomind.codegen.generator import CodeGenerator\n"
+        "CodeGenerator()\n"
+        "print('evomind.llm.gemini_client' in sys.modules)\n"
+    )
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+    assert output.stdout.strip() == "False"
+
+
+def test_static_validation_reports_type_hints():
+    """Test static validation includes missing type hints without blocking."""
+    validator = StaticValidator()
+
+    result = validator.validate("def untyped(x):\n    return x\n")
+
+    assert result.passed is True
+    assert [f["category"] for f in result.findings] == ["types"]
+
+
+def test_create_tool_compiles_artifact(tmp_path, generator):
+    """Test created tools carry a compiled code object that is not persisted."""
+    from evomind.registry.tool_registry import ToolRegistry
+
+    spec = {"name": "double", "description": "Double a value", "io_spec": {}, "tests": []}
+
+    result = generator.create_tool(spec)
+    namespace = {}
+    exec(result["artifact"]["code_obj"], namespace)
+
+    assert namespace["double"]({"x": 1})["status"] == "success"
+    assert result["artifact"]["entrypoint"] == "double"
+
+    registry = ToolRegistry(storage_path=tmp_path)
+    tool_id = registry.register(result["artifact"], {"name": "double"}, "0.1.0")
+    registry.close()
+
+    saved = ToolRegistry(storage_path=tmp_path).get(tool_id)["artifact"]
+    assert "code_obj" not in saved
+    assert saved["code"] == result["code"]
+    assert saved["entrypoint"] == "double"
+
+
+def test_validation_result_columns():
+    """Test validation results keep findings column-wise."""
+    from evomind.codegen.validators import ValidationResult
+
+    result = ValidationResult()
+    result.add_finding("low", "types", "missing hint", 2)
+    result.add_finding("critical", "policy", "forbidden", 1)
+
+    assert len(result) == 2
+    assert result.severities == ["low", "critical"]
+    assert result.blockers == [{"severity": "critical", "category": "policy", "message": "forbidden", "line": 1}]
+    assert list(result) == result.findings
+    assert result.has_blockers() is True
+    assert not hasattr(result, "__dict__")
+
+
+def test_static_validation_fail_fast():
+    """Test fail-fast validation stops at the first blocker."""
+    validator = StaticValidator()
+    code = "import os\nimport subprocess\n"
+
+    fast = validator.validate(code, fail_fast=True)
+    full = validator.validate(code)
+
+    assert len(fast.blockers) == 1
+    assert len(full.blockers) == 2
+
+
+def test_create_tools_batch():
+    """Test batch tool creation uses one LLM call and keeps spec order."""
+    class BatchClient:
+        def __init__(self):
+            self.batches = []
+
+        def generate_code_batch(self, specs):
+            self.batches.append(specs)
+            return [f"def {spec['name']}(input_data: dict) -> dict:\n    return input_data\n" for spec in specs]
+
+    client = BatchClient()
+    generator = CodeGenerator(llm_client=client, use_llm=True)
+    specs = [{"name": f"tool_{i}", "description": "Echo"} for i in range(3)]
+
+    results = generator.create_tools(specs)
+
+    assert len(client.batches) == 1
+    assert [r["tool_id"] for r in results] == ["tool_0", "tool_1", "tool_2"]
+    assert all(r["status"] == "READY" for r in results)
+
+
+def test_validation_results_persist_in_cache_path(tmp_path):
+    """Test results stored under cache_path are reused by new validators."""
+    code = "import os\n"
+    first = StaticValidator(cache_path=tmp_path).validate(code)
+
+    validator = StaticValidator(cache_path=tmp_path)
+    validator._run_checks = lambda *args: pytest.fail("validated again")
+    second = validator.validate(code)
+
+    assert second.blockers == first.blockers
+    assert second.passed is False
+    # Results depend on the network permission, so it is part of the key
+    assert StaticValidator(allow_network=True, cache_path=tmp_path).validate("import socket\n").passed
+    assert not StaticValidator(cache_path=tmp_path).validate("import socket\n").passed
+
+
+def test_create_tool_cached_by_spec(tmp_path):
+    """Test identical specs reuse the created tool, across generators via cache_dir."""
+    spec = {"name": "triple", "description": "Triple a value", "io_spec": {}, "tests": []}
+    generator = CodeGenerator(cache_dir=tmp_path)
+    calls = []
+    generate = generator._generate_code
+    generator._generate_code = lambda s: calls.append(s) or generate(s)
+
+    first = generator.create_tool(spec)
+    first["artifact"]["extra"] = True
+    second = generator.create_tool(spec)
+    generator.create_tool(spec, cache=False)
+
+    assert len(calls) == 2
+    assert second["code"] == first["code"]
+    assert "extra" not in second["artifact"]
+
+    restored = CodeGenerator(cache_dir=tmp_path)
+    restored._generate_code = lambda s: pytest.fail("generated again")
+    result = restored.create_tool(spec)
+    namespace = {}
+    exec(result["artifact"]["code_obj"], namespace)
+
+    assert result["status"] == "READY"
+    assert result["artifact"]["entrypoint"] == "triple"
+    assert namespace["triple"]({"x": 1})["status"] == "success"
+
+
+def test_validation_findings_in_source_order():
+    """Test findings follow a depth-first walk in source order."""
+    code = (
+        "def outer(x):\n"
+        "    import os\n"
+        "    def inner():\n"
+        "        return open('f')\n"
+        "    while True:\n"
+        "        eval(x)\n"
+        "import socket\n"
+    )
+
+    result = StaticValidator().validate(code)
+
+    assert [(f["message"], f["line"]) for f in result.findings] == [
+        ("Function 'outer' missing return type hint", 1),
+        ("Forbidden import: os", 2),
+        ("Function 'inner' missing return type hint", 3),
+        ("File operations detected - ensure proper sandboxing", 4),
+        ("Potential infinite loop detected", 5),
+        ("Forbidden function call: eval", 6),
+        ("Forbidden import: socket", 7),
+    ]
+
+
+def test_parse_code_shared_between_checks():
+    """Test the validator and type checker reuse one parse of the same code."""
+    from evomind.codegen.validators import TypeChecker, parse_code
+
+    code = "def shared_parse(x):\n    return x\n"
+    tree = parse_code(code)
+
+    assert parse_code(code) is tree
+    assert StaticValidator().validate(code).messages == TypeChecker().check(code).messages
+    assert parse_code("def broken(:\n") is None
+    assert StaticValidator().validate("def broken(:\n").categories == ["syntax"]
+
+
+def test_fail_fast_ignores_imports_inside_strings():
+    """Test fail-fast validation reports only imports the AST walk sees."""
+    validator = StaticValidator()
+    code = 'def f(x: int) -> int:\n    """Example:\n    import os\n    """\n    return x\n'
+
+    assert validator.validate(code, fail_fast=True).passed
+
+    code = "import json\nfrom subprocess import run\ndef broken(:\n"
+    assert [f["category"] for f in validator.validate(code, fail_fast=True).blockers] == ["syntax"]
+
+
+def test_cached_validation_results_depend_on_rules(tmp_path, monkeypatch):
+    """Test stored verdicts are not reused once the validation rules change."""
+    from evomind.codegen import validators
+
+    monkeypatch.setattr(validators, "_DANGEROUS_WITHOUT_NETWORK", validators._DANGEROUS_WITHOUT_NETWORK - {"os"})
+    assert StaticValidator(cache_path=tmp_path).validate("import os\n").passed
+
+    monkeypatch.undo()
+    assert not StaticValidator(cache_path=tmp_path).validate("import os\n").passed
@@ -0,0 +1,297 @@
+"""Tests for LLM response caching."""
+
+from evomind.llm.cache import FileBackend, LLMCache, MemoryBackend
+from evomind.observability.metrics import MetricsCollector
+
+
+def _request(prompt, temperature=0.1):
+    return {
+        "model": "test-model",
+        "prompt": prompt,
+        "system_instruction": None,
+        "temperature": temperature,
+        "max_tokens": 100
+    }
+
+
+def test_exact_cache_hit():
+    """Test identical deterministic requests are served from the cache."""
+    metrics = MetricsCollector()
+    cache = LLMCache(metrics=metrics)
+
+    assert cache.get(_request("hello")) is None
+    cache.set(_request("hello"), "world")
+
+    assert cache.get(_request("hello")) == "world"
+    assert cache.get(_request("hello", temperature=0.2)) is None
+    assert cache.cacheable(0.7) is False
+    assert metrics.get_metrics()["counters"]["llm_cache_hits_total{tier=exact}"] == 1
+
+
+def test_semantic_cache_hit():
+    """Test near-duplicate prompts hit the semantic tier."""
+    cache = LLMCache(embed=lambda prompt: [len(prompt), 1.0], metrics=MetricsCollector())
+    cache.set(_request("sum numbers"), "def total(): ...")
+
+    assert cache.get(_request("sum numberz")) == "def total(): ..."
+    assert cache.get(_request("x")) is None
+
+
+def test_backends_expire_and_evict(tmp_path):
+    """Test backend eviction and persistence."""
+    memory = MemoryBackend(maxsize=1)
+    memory.set("a", "1")
+    memory.set("b", "2")
+    assert memory.get("a") is None
+    assert memory.get("b") == "2"
+
+    FileBackend(tmp_path).set("k", "v", ttl=60)
+    assert FileBackend(tmp_path).get("k") == "v"
+
+
+def test_file_backend_writes_are_safe(tmp_path):
+    """Test concurrent writers of a key publish whole entries and write errors are swallowed."""
+    import shutil
+    from concurrent.futures import ThreadPoolExecutor
+
+    backend = FileBackend(tmp_path / "cache")
+    values = [str(i) * 10000 for i in range(8)]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(lambda value: backend.set("k", value), values * 4))
+    assert backend.get("k") in values
+    assert [p.name for p in backend.path.iterdir()] == ["k.json"]
+
+    shutil.rmtree(backend.path)
+    backend.set("k", "v")
+    assert backend.get("k") is None
+
+
+def test_retryable_errors():
+    """Test only transient API errors are retried."""
+    from evomind.llm.gemini_client import _is_retryable
+
+    def api_error(code):
+        error = Exception("api error")
+        error.code = code
+        return error
+
+    assert _is_retryable(api_error(429)) is True
+    assert _is_retryable(api_error(503)) is True
+    assert _is_retryable(api_error(400)) is False
+    assert _is_retryable(TimeoutError()) is True
+    assert _is_retryable(ValueError()) is False
+
+
+def test_context_cache_replaces_system_instruction():
+    """Test system instructions are sent once as a context cache and then referenced."""
+    from types import SimpleNamespace
+
+    from evomind.llm.gemini_client import GeminiClient
+
+    created, configs = [], []
+
+    def create(model, config):
+        created.append(config["system_instruction"])
+        if config["system_instruction"] == "short":
+            raise ValueError("content too small to cache")
+        return SimpleNamespace(name=f"cachedContents/{len(created)}")
+
+    def generate_content(model, contents, config):
+        configs.append(config)
+        return SimpleNamespace(text="ok")
+
+    client = GeminiClient(api_key="test", context_cache=True)
+    client.client = SimpleNamespace(
+        caches=SimpleNamespace(create=create),
+        models=SimpleNamespace(generate_content=generate_content)
+    )
+
+    client.generate_content("a", system_instruction="long instruction")
+    client.generate_content("b", system_instruction="long instruction")
+    client.generate_content("c", system_instruction="short")
+    client.generate_content("d", system_instruction="short")
+
+    assert created == ["long instruction", "short"]
+    assert configs[1]["cached_content"] == "cachedContents/1"
+    assert "system_instruction" not in configs[1]
+    assert configs[3]["system_instruction"] == "short"
+
+
+def test_code_requests_share_one_cached_instruction():
+    """Test code prompts carry only the spec, so all code requests reuse one context cache."""
+    from types import SimpleNamespace
+
+    from evomind.llm.gemini_client import CODE_SYSTEM_INSTRUCTION, GeminiClient
+
+    created, prompts = [], []
+
+    def create(model, config):
+        created.append(config["system_instruction"])
+        return SimpleNamespace(name="cachedContents/code")
+
+    def generate_content(model, contents, config):
+        prompts.append(contents)
+        return SimpleNamespace(text="def f(args):\n    return {}")
+
+    client = GeminiClient(api_key="test", context_cache=True)
+    client.client = SimpleNamespace(
+        caches=SimpleNamespace(create=create),
+        models=SimpleNamespace(generate_content=generate_content)
+    )
+
+    client.generate_code("Add numbers", "add", {})
+    client.generate_code("Parse dates", "parse_dates", {}, {"timeout": 5})
+
+    assert created == [CODE_SYSTEM_INSTRUCTION]
+    assert all("Only use safe built-in modules" not in prompt for prompt in prompts)
+    assert "Must complete within 5 seconds" in prompts[1]
+
+
+def test_code_batches_fit_output_token_limit():
+    """Test batched code requests never ask for more tokens than the model allows."""
+    import re
+    from types import SimpleNamespace
+
+    from evomind.llm.gemini_client import GeminiClient
+
+    limits = []
+
+    def generate_content(model, contents, config):
+        limits.append(config["max_output_tokens"])
+        count = len(re.findall(r"^Function \d+:", contents, re.MULTILINE))
+        return SimpleNamespace(text="".join(
+            f"<<<FUNC {i}>>>def f{i}(args):\n    return {{}}<<<END {i}>>>" for i in range(1, count + 1)
+        ))
+
+    client = GeminiClient(api_key="test", model="gemini-2.0-flash", max_tokens=4096)
+    client.client = SimpleNamespace(models=SimpleNamespace(generate_content=generate_content))
+
+    specs = [{"name": f"f{i}", "description": "noop", "io_spec": {}} for i in range(5)]
+    codes = client.generate_code_batch(specs)
+
+    assert len(codes) == 5
+    assert limits == [8192, 8192, 4096]
+
+    client.max_tokens = 10000
+    limits.clear()
+    client.generate_code_batch(specs[:2])
+    assert limits == [8192, 8192]
+
+
+def test_clean_code_response():
+    """Test fences and leading prose are stripped from code responses."""
+    from evomind.llm.gemini_client import GeminiClient
+
+    clean = GeminiClient._clean_code_response
+
+    assert clean(None, "```python\ndef f():\n    pass\n```") == "def f():\n    pass"
+    assert clean(None, "```\nHere you go:\nimport math\ndef f(): pass\n```\n") == "import math\ndef f(): pass"
+    assert clean(None, "Sure!\n@cache\ndef f(): pass") == "@cache\ndef f(): pass"
+    assert clean(None, "  no code here  ") == "no code here"
+
+
+def test_parse_plan_extracts_json():
+    """Test plans are parsed from fenced or prose-wrapped responses."""
+    from evomind.llm.gemini_client import GeminiClient, _extract_json
+
+    assert _extract_json('Plan: {"a": "}{", "b": {"c": 1}} trailing') == '{"a": "}{", "b": {"c": 1}}'
+    assert _extract_json("no json") is None
+
+    client = GeminiClient(api_key="test")
+    assert client._parse_plan("t", '```json\n{"intent": "sum"}\n```')["intent"] == "sum"
+    assert client._parse_plan("t", 'Here is the plan: {"intent": "sum"}')["intent"] == "sum"
+    assert client._parse_plan("t", "not json")["confidence"] == 0.5
+
+
+def test_clients_shared_per_api_key():
+    """Test instances with the same API key reuse one genai client."""
+    from evomind.llm.gemini_client import GeminiClient
+
+    first = GeminiClient(api_key="shared-key")
+    second = GeminiClient(api_key="shared-key", model="other-model")
+
+    assert first.client is second.client
+    assert GeminiClient(api_key="other-key").client is not first.client
+
+
+def test_batching_client_groups_concurrent_requests():
+    """Test concurrent requests are sent as batches and demultiplexed."""
+    import asyncio
+
+    from evomind.llm.batching import BatchingGeminiClient
+
+    class FakeClient:
+        def __init__(self):
+            self.batches = []
+
+        async def generate_code_batch_async(self, specs, batch_size):
+            self.batches.append([spec["name"] for spec in specs])
+            return [f"def {spec['name']}(): pass" for spec in specs]
+
+        async def _generate_spec_code_async(self, spec):
+            self.batches.append([spec["name"]])
+            return f"def {spec['name']}(): pass"
+
+    async def run():
+        fake = FakeClient()
+        batcher = BatchingGeminiClient(fake, max_batch=3, max_wait_ms=50)
+        codes = await asyncio.gather(*(batcher.generate_code({"name": f"f{i}"}) for i in range(4)))
+        await batcher.aclose()
+        return fake.batches, codes
+
+    batches, codes = asyncio.run(run())
+
+    assert batches == [["f0", "f1", "f2"], ["f3"]]
+    assert codes == [f"def f{i}(): pass" for i in range(4)]
+
+
+def test_batching_client_close_answers_pending_requests():
+    """Test closing the batcher dispatches requests still waiting for a batch."""
+    import asyncio
+
+    from evomind.llm.batching import BatchingGeminiClient
+
+    class FakeClient:
+        async def _generate_spec_code_async(self, spec):
+            return f"def {spec['name']}(): pass"
+
+        async def generate_code_batch_async(self, specs, batch_size):
+            return [f"def {spec['name']}(): pass" for spec in specs]
+
+    async def run():
+        batcher = BatchingGeminiClient(FakeClient(), max_batch=3, max_wait_ms=500)
+        pending = [asyncio.ensure_future(batcher.generate_code({"name": f"f{i}"})) for i in range(2)]
+        await asyncio.sleep(0.01)
+        await batcher.aclose()
+        return await asyncio.wait_for(asyncio.gather(*pending), 1)
+
+    assert asyncio.run(run()) == ["def f0(): pass", "def f1(): pass"]
+
+
+def test_single_flight_coalesces_identical_requests():
+    """Test concurrent identical deterministic requests make one API call."""
+    import asyncio
+    from types import SimpleNamespace
+
+    from evomind.llm.gemini_client import GeminiClient
+
+    calls = []
+
+    async def generate_content(model, contents, config):
+        calls.append(contents)
+        await asyncio.sleep(0.01)
+        return SimpleNamespace(text=f"re: {contents}")
+
+    client = GeminiClient(api_key="test")
+    client.client = SimpleNamespace(aio=SimpleNamespace(models=SimpleNamespace(generate_content=generate_content)))
+
+    async def run():
+        return await asyncio.gather(
+            client.generate_content_async("same", temperature=0.1),
+            client.generate_content_async("same", temperature=0.1),
+            client.generate_content_async("same", temperature=0.9),
+        )
+
+    assert asyncio.run(run()) == ["re: same"] * 3
+    assert len(calls) == 2
+    assert client._inflight == {}
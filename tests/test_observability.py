@@ -0,0 +1,146 @@
+"""Tests for observability."""
+
+from evomind.observability.metrics import MetricsCollector
+
+
+def test_histogram_summary():
+    """Test histogram summaries report counts and percentiles."""
+    metrics = MetricsCollector()
+    for value in range(1, 201):
+        metrics.record_histogram("latency_ms", float(value))
+
+    summary = metrics.get_metrics()["histograms"]["latency_ms"]
+
+    assert summary["count"] == 200
+    assert summary["sum"] == sum(range(1, 201))
+    assert (summary["min"], summary["max"]) == (1.0, 200.0)
+    assert (summary["p50"], summary["p95"], summary["p99"]) == (101.0, 191.0, 199.0)
+
+
+def test_histogram_reservoir_is_bounded():
+    """Test histograms keep a bounded sample but exact aggregates."""
+    metrics = MetricsCollector(max_histogram_samples=50)
+    for value in range(1000):
+        metrics.record_histogram("latency_ms", float(value))
+
+    summary = metrics.get_metrics()["histograms"]["latency_ms"]
+
+    assert len(metrics._histograms["latency_ms"]) == 50
+    assert summary["count"] == 1000
+    assert summary["max"] == 999.0
+
+
+def test_counters_merge_across_threads():
+    """Test counters and histograms recorded on other threads are merged."""
+    import threading
+
+    metrics = MetricsCollector()
+
+    def emit():
+        for _ in range(500):
+            metrics.increment_counter("events_total")
+            metrics.record_histogram("latency_ms", 1.0)
+
+    threads = [threading.Thread(target=emit) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    metrics.increment_counter("events_total")
+
+    snapshot = metrics.get_metrics()
+
+    assert snapshot["counters"]["events_total"] == 2001
+    assert snapshot["histograms"]["latency_ms"]["count"] == 2000
+    assert metrics.get_metrics()["counters"]["events_total"] == 2001
+
+
+def test_structured_formatter_extra_fields():
+    """Test extra fields are emitted and unserializable values stringified."""
+    import json
+    import logging
+
+    from evomind.observability.logging import StructuredFormatter
+
+    record = logging.LogRecord("evomind.test", logging.INFO, __file__, 1, "ran %s", ("tool",), None)
+    record.tool_id = "t1"
+    record.path = object()
+
+    entry = json.loads(StructuredFormatter().format(record))
+
+    assert entry["message"] == "ran tool"
+    assert entry["tool_id"] == "t1"
+    assert isinstance(entry["path"], str)
+    assert entry["timestamp"].endswith("+00:00")
+    assert "args" not in entry
+
+
+def test_queue_logging_keeps_exception_info():
+    """Test queued records are formatted on the listener with their tracebacks."""
+    import io
+    import json
+    import logging
+
+    from evomind.observability import logging as evomind_logging
+
+    stream = io.StringIO()
+    target = logging.StreamHandler(stream)
+    target.setFormatter(evomind_logging.StructuredFormatter())
+
+    handler = evomind_logging._start_queue_logging([target])
+    logger = logging.getLogger("evomind.test.queue")
+    logger.addHandler(handler)
+    logger.propagate = False
+    try:
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logger.error("failed %s", "step", exc_info=True)
+    finally:
+        logger.removeHandler(handler)
+        evomind_logging._stop_queue_logging()
+
+    entry = json.loads(stream.getvalue())
+    assert entry["message"] == "failed step"
+    assert "ValueError: boom" in entry["exception"]
+
+
+def test_setup_logging_twice_and_after_fork(tmp_path):
+    """Test repeated setup keeps logging and forked children get a listener."""
+    import logging
+    import multiprocessing
+
+    from evomind.observability import logging as evomind_logging
+
+    log_file = tmp_path / "evomind.log"
+    root = logging.getLogger()
+    saved = root.handlers[:], root.level
+    try:
+        evomind_logging.setup_logging("INFO", log_file=str(log_file))
+        logging.getLogger("evomind.test").warning("first")
+        evomind_logging.setup_logging("INFO", log_file=str(log_file))
+        logging.getLogger("evomind.test").warning("second")
+
+        if "fork" in multiprocessing.get_all_start_methods():
+            child = multiprocessing.get_context("fork").Process(target=_log_in_child)
+            child.start()
+            child.join(10)
+            assert child.exitcode == 0
+        evomind_logging._stop_queue_logging()
+    finally:
+        root.handlers[:], level = saved
+        root.setLevel(level)
+
+    output = log_file.read_text()
+    assert "first" in output and "second" in output
+    if "fork" in multiprocessing.get_all_start_methods():
+        assert "from child" in output
+
+
+def _log_in_child():
+    import logging
+
+    from evomind.observability import logging as evomind_logging
+
+    logging.getLogger("evomind.test").warning("from child")
+    evomind_logging._stop_queue_logging()
@@ -1,5 +1,7 @@
 """Tests for planners."""
 
+import pytest
+
 from evomind.agent.planner import ReActPlanner, ToTPlanner, ReflexionMemory
 
 
@@ -63,3 +65,106 @@ def test_reflexion_should_reflect():
     # Should not reflect on success
     feedback = [{"category": "success"}]
     assert memory.should_reflect(feedback) is False
+
+
+def test_reflexion_should_reflect_on_state():
+    """Test reflexion decision uses agent state failure count."""
+    from evomind.agent.state import AgentState
+
+    memory = ReflexionMemory()
+    state = AgentState()
+
+    assert memory.should_reflect(state) is False
+
+    state.add_feedback("bad_result", {})
+    assert memory.should_reflect(state) is True
+
+
+def test_react_planner_cached_plans_are_independent():
+    """Test cached rule-based plans are not shared between callers."""
+    planner = ReActPlanner()
+    context = {"request": {"task": "cached task"}, "relevant_history": []}
+
+    first = planner.plan(context)
+    first["actions"].append({"type": "extra"})
+    second = planner.plan(context)
+
+    assert planner._rule_based_plan.cache_info().hits == 1
+    assert len(second["actions"]) == 2
+
+
+def test_reflexion_memory_is_bounded():
+    """Test Reflexion memory keeps only the most recent episodes."""
+    memory = ReflexionMemory(max_episodes=3)
+
+    for i in range(5):
+        memory.add(task=f"task {i}", outcome="failure", feedback={})
+
+    assert len(memory.episodes) == 3
+    assert [e.task for e in memory.get_relevant("task", limit=2)] == ["task 3", "task 4"]
+
+
+def test_scoring_helpers():
+    """Test candidate scoring helpers."""
+    from evomind.agent._scoring import argmax_f64, as_matrix, as_vector, score_candidates
+
+    scores = score_candidates(as_matrix([[1.0, 0.0], [1.0, 2.0], [1.0, 1.0]]), as_vector([0.5, 0.1]))
+
+    assert [round(float(s), 6) for s in scores] == [0.5, 0.7, 0.6]
+    assert int(argmax_f64(scores)) == 1
+
+
+def test_plan_defaults_are_read_only():
+    """Test plans share read-only io_spec and success criteria defaults."""
+    planner = ToTPlanner()
+    context = {"request": {"task": "shared task"}}
+
+    first = planner.plan(context)
+    second = planner.plan(context)
+
+    assert first["io_spec"] is second["io_spec"]
+    assert first["intent"] is second["intent"]
+    with pytest.raises(TypeError):
+        first["success_criteria"]["has_result"] = False
+
+
+def test_reflexion_should_replan():
+    """Test only plan-level failures trigger re-planning."""
+    memory = ReflexionMemory()
+
+    assert memory.should_replan(["tool_creation_failed", "bad_result"]) is True
+    assert memory.should_replan(["execution_error", "bad_result"]) is False
+
+
+def test_tot_scores_computed_once_per_breadth(monkeypatch):
+    """Test ToT candidate scoring runs again only when the breadth changes."""
+    from evomind.agent import planner as planner_module
+
+    calls = []
+    score = planner_module.score_candidates
+    monkeypatch.setattr(planner_module, "score_candidates", lambda *a: calls.append(a) or score(*a))
+    planner = ToTPlanner(breadth=3)
+    context = {"request": {"task": "complex task"}}
+
+    first = planner.plan(context)
+    planner.plan(context)
+    planner.breadth = 4
+    wider = planner.plan(context)
+
+    assert len(calls) == 2
+    assert first["explored_paths"] == 3
+    assert wider["explored_paths"] == 4
+    assert wider["actions"] == [{"type": "decompose", "variant": 3}, {"type": "execute_steps", "parallel": False}]
+
+
+def test_reflexion_relevant_episodes_ranked_by_similarity():
+    """Test relevant episodes share words with the task, falling back to recency."""
+    memory = ReflexionMemory(max_episodes=4)
+    for task in ["parse json data", "sort numbers", "parse csv data", "draw a chart", "resize images"]:
+        memory.add(task=task, outcome="failure", feedback={})
+
+    # "parse json data" was evicted with its words
+    assert [e.task for e in memory.get_relevant("parse data files", limit=2)] == ["parse csv data", "resize images"]
+    assert [e.task for e in memory.get_relevant("chart", limit=1)] == ["draw a chart"]
+    assert [e.task for e in memory.get_relevant("unrelated", limit=2)] == ["draw a chart", "resize images"]
+    assert memory.get_relevant("parse", limit=0) == []
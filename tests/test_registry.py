@@ -3,17 +3,13 @@
 from evomind.registry.tool_registry import ToolRegistry, ToolMetadata
 
 
-def test_registry_initialization():
+def test_registry_initialization(registry):
     """Test registry initialization."""
-    registry = ToolRegistry()
-    
     assert registry is not None
 
 
-def test_register_tool():
+def test_register_tool(registry):
     """Test tool registration."""
-    registry = ToolRegistry()
-    
     artifact = {
         "code": "def test(): pass",
         "type": "python_function"
@@ -30,10 +26,8 @@ def test_register_tool():
     assert "test_tool" in tool_id
 
 
-def test_search_tools():
+def test_search_tools(registry):
     """Test tool search."""
-    registry = ToolRegistry()
-    
     # Register a tool
     artifact = {"code": "def parse_json(): pass"}
     metadata = {
@@ -48,10 +42,8 @@ def test_search_tools():
     assert len(results) >= 0
 
 
-def test_get_tool():
+def test_get_tool(registry):
     """Test getting a specific tool."""
-    registry = ToolRegistry()
-    
     # Register
     artifact = {"code": "def test(): pass"}
     metadata = {"name": "test_tool", "description": "Test"}
@@ -78,10 +70,8 @@ def test_tool_metadata():
     assert meta.version == "0.1.0"
 
 
-def test_update_stats():
+def test_update_stats(registry):
     """Test updating tool statistics."""
-    registry = ToolRegistry()
-    
     artifact = {"code": "def test(): pass"}
     metadata = {"name": "test_tool", "description": "Test"}
     tool_id = registry.register(artifact, metadata, "0.1.0")
@@ -93,10 +83,8 @@ def test_update_stats():
     assert tool["metadata"]["usage_count"] == 1
 
 
-def test_deprecate_tool():
+def test_deprecate_tool(registry):
     """Test tool deprecation."""
-    registry = ToolRegistry()
-    
     artifact = {"code": "def test(): pass"}
     metadata = {"name": "test_tool", "description": "Test"}
     tool_id = registry.register(artifact, metadata, "0.1.0")
@@ -108,3 +96,184 @@ def test_deprecate_tool():
     
     tool = registry.get(tool_id)
     assert tool["metadata"]["deprecated"] is True
+
+
+def test_search_index(tmp_path):
+    """Test indexed search matches substrings and skips deprecated tools."""
+    registry = ToolRegistry(storage_path=tmp_path)
+    json_id = registry.register({"code": ""}, {"name": "json_parser", "description": "Parse JSON data"}, "0.1.0")
+    csv_id = registry.register(
+        {"code": ""}, {"name": "csv_reader", "description": "Read CSV", "tags": ["parsing"]}, "0.1.0"
+    )
+
+    assert [r["id"] for r in registry.search("pars")] == [json_id, csv_id]
+    assert [r["id"] for r in registry.search("JSON")] == [json_id]
+    assert registry.search("xml") == []
+
+    registry.deprecate(json_id)
+    assert [r["id"] for r in registry.search("pars")] == [csv_id]
+    registry.flush()
+
+    reloaded = ToolRegistry(storage_path=tmp_path)
+    assert [r["id"] for r in reloaded.search("csv")] == [csv_id]
+
+
+def test_sqlite_persistence(tmp_path):
+    """Test tools and stats survive a reload and legacy JSON is imported."""
+    import json
+
+    legacy = ToolMetadata(id="old_tool_0.1.0", name="old_tool", version="0.1.0", description="Legacy")
+    legacy_dir = tmp_path / legacy.id
+    legacy_dir.mkdir()
+    (legacy_dir / "metadata.json").write_text(json.dumps(legacy.to_dict()))
+    (legacy_dir / "artifact.json").write_text(json.dumps({"code": "def old(): pass"}))
+
+    registry = ToolRegistry(storage_path=tmp_path)
+    assert registry.get(legacy.id)["code"] == "def old(): pass"
+
+    tool_id = registry.register({"code": "def f(): pass", "code_obj": object()}, {"name": "f"}, "0.1.0")
+    registry.update_stats(tool_id, success=False)
+    registry.close()
+
+    reloaded = ToolRegistry(storage_path=tmp_path)
+    tool = reloaded.get(tool_id)
+    assert tool["metadata"]["usage_count"] == 1
+    assert tool["metadata"]["success_rate"] < 1.0
+    assert "code_obj" not in tool["artifact"]
+    assert (tmp_path / "registry.db").exists()
+
+
+def test_update_stats_batched(tmp_path):
+    """Test stats updates are written in one batch on flush."""
+    registry = ToolRegistry(storage_path=tmp_path, flush_interval=60)
+    tool_id = registry.register({"code": ""}, {"name": "f"}, "0.1.0")
+    registry.flush()
+
+    for _ in range(3):
+        registry.update_stats(tool_id, success=True)
+
+    assert ToolRegistry(storage_path=tmp_path).get(tool_id)["metadata"]["usage_count"] == 0
+
+    registry.flush()
+    assert ToolRegistry(storage_path=tmp_path).get(tool_id)["metadata"]["usage_count"] == 3
+
+
+def test_tool_metadata_round_trip():
+    """Test metadata converts to and from dicts over its declared fields."""
+    import sys
+
+    meta = ToolMetadata(id="t_0.1.0", name="t", version="0.1.0", description="Test", tags=["x"])
+    data = meta.to_dict()
+
+    assert list(data)[:4] == ["id", "name", "version", "description"]
+    assert ToolMetadata.from_dict({**data, "unknown": 1}) == meta
+    if sys.version_info >= (3, 10):
+        assert not hasattr(meta, "__dict__")
+
+
+def test_write_behind(tmp_path):
+    """Test queued writes from several threads are persisted by flush."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    registry = ToolRegistry(storage_path=tmp_path)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        list(pool.map(lambda i: registry.register({"code": ""}, {"name": f"tool{i}"}, "0.1.0"), range(20)))
+
+    registry.flush()
+    assert len(ToolRegistry(storage_path=tmp_path).list_all()) == 20
+
+    registry.close()
+    registry.close()
+
+
+def test_artifact_blobs_deduplicated(tmp_path):
+    """Test identical artifacts share one compressed blob and one in-memory dict."""
+    import sqlite3
+
+    registry = ToolRegistry(storage_path=tmp_path)
+    artifact = {"code": "def f():\n    return 1\n" * 50, "type": "python_function"}
+    registry.register(artifact, {"name": "f"}, "0.1.0")
+    registry.register(dict(artifact), {"name": "f"}, "0.2.0")
+    registry.register({"code": "def g(): pass"}, {"name": "g"}, "0.1.0")
+    assert registry.get("f_0.2.0")["artifact"] is registry.get("f_0.1.0")["artifact"]
+    registry.close()
+
+    db = sqlite3.connect(str(tmp_path / "registry.db"))
+    assert db.execute("SELECT COUNT(*) FROM blobs").fetchone()[0] == 2
+    (size,) = db.execute("SELECT MAX(LENGTH(data)) FROM blobs").fetchone()
+    assert size < len(artifact["code"])
+    db.close()
+
+    assert ToolRegistry(storage_path=tmp_path).get("f_0.2.0")["code"] == artifact["code"]
+
+
+def test_artifacts_loaded_lazily(tmp_path):
+    """Test stored artifacts are read on first access and then cached."""
+    registry = ToolRegistry(storage_path=tmp_path)
+    tool_id = registry.register({"code": "def f(): pass"}, {"name": "f"}, "0.1.0")
+    registry.close()
+
+    reloaded = ToolRegistry(storage_path=tmp_path)
+    assert not reloaded.artifacts._cache
+
+    assert reloaded.get(tool_id)["code"] == "def f(): pass"
+    assert reloaded.search("f")[0]["artifact"] is reloaded.get(tool_id)["artifact"]
+    assert reloaded.artifacts.get("missing", {}) == {}
+
+
+def test_legacy_import_skips_broken_tools(tmp_path):
+    """Test legacy JSON tools are imported together and broken ones skipped."""
+    import json
+
+    for i in range(5):
+        meta = ToolMetadata(id=f"tool{i}_0.1.0", name=f"tool{i}", version="0.1.0", description="Legacy")
+        (tmp_path / meta.id).mkdir()
+        (tmp_path / meta.id / "metadata.json").write_text(json.dumps(meta.to_dict()))
+    (tmp_path / "broken").mkdir()
+    (tmp_path / "broken" / "metadata.json").write_text("{not json")
+
+    registry = ToolRegistry(storage_path=tmp_path)
+
+    assert sorted(t["id"] for t in registry.list_all()) == [f"tool{i}_0.1.0" for i in range(5)]
+    assert registry.get("tool3_0.1.0")["artifact"] == {}
+
+
+def test_search_ranks_top_results_in_registration_order(tmp_path):
+    """Test search keeps the best scores and breaks ties by registration order."""
+    registry = ToolRegistry(storage_path=tmp_path)
+    ids = [
+        registry.register({"code": ""}, {"name": f"tool{i}", "description": "x"}, "0.1.0")
+        for i in range(5)
+    ]
+    named = registry.register({"code": ""}, {"name": "x_tool", "description": "x"}, "0.1.0")
+
+    assert [r["id"] for r in registry.search("x", limit=3)] == [named, ids[0], ids[1]]
+    registry.deprecate(ids[0])
+    assert [r["id"] for r in registry.search("x", limit=3)] == [named, ids[1], ids[2]]
+    registry.close()
+
+
+def test_loaded_metadata_shares_repeated_strings(tmp_path):
+    """Test tools loaded from storage share owner and version strings."""
+    registry = ToolRegistry(storage_path=tmp_path)
+    for name in ("a", "b"):
+        registry.register({"code": ""}, {"name": name, "description": ""}, "0.1.0")
+    registry.close()
+
+    first, second = ToolRegistry(storage_path=tmp_path).tools.values()
+
+    assert first.version is second.version
+    assert first.owner is second.owner
+
+
+def test_reset(tmp_path):
+    """Test reset removes tools from memory and storage."""
+    registry = ToolRegistry(storage_path=tmp_path)
+    registry.register({"code": ""}, {"name": "json_parser", "description": "Parse JSON data"}, "0.1.0")
+    registry.reset()
+
+    assert registry.list_all() == []
+    assert registry.search("json") == []
+    registry.close()
+
+    assert ToolRegistry(storage_path=tmp_path).list_all() == []
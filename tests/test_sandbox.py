@@ -1,13 +1,13 @@
 """Tests for sandbox executor."""
 
+import sys
+
 from evomind.sandbox.executor import SandboxExecutor
 from evomind.sandbox.policies import SandboxPolicy, ResourcePolicy, SecurityPolicy
 
 
-def test_sandbox_initialization():
+def test_sandbox_initialization(executor):
     """Test sandbox executor initialization."""
-    executor = SandboxExecutor()
-    
     assert executor is not None
 
 
@@ -33,10 +33,8 @@ def test_security_policy():
     assert policy.filesystem_readonly is True
 
 
-def test_execute_simple_tool():
+def test_execute_simple_tool(executor):
     """Test executing a simple tool."""
-    executor = SandboxExecutor()
-    
     tool = {
         "tool_id": "test_tool",
         "code": """
@@ -62,3 +60,261 @@ def test_sandbox_policy_combination():
     
     assert policy.resource.cpu_time_limit == 5
     assert policy.security.network_enabled is False
+    if sys.version_info >= (3, 10):
+        assert not hasattr(policy, "__dict__")
+        assert not hasattr(policy.resource, "__dict__")
+        assert not hasattr(policy.security, "__dict__")
+
+
+def test_worker_pool_reuses_workers(tmp_path):
+    """Test executions share a persistent worker that is replaced on timeout."""
+    executor = SandboxExecutor(work_dir=tmp_path)
+    tool = {"code": "def double(args):\n    print('called')\n    return args['x'] * 2\n"}
+
+    first = executor.execute(tool, {"x": 2})
+    [idle] = executor._pool._idle.values()
+    worker = idle[0]
+    second = executor.execute(tool, {"x": 3})
+
+    assert (first["result"], second["result"]) == (4, 6)
+    assert second["stdout"] == "called\n"
+    assert idle == [worker]
+    assert worker.uses == 2
+    assert len(worker.known_code) == 1
+
+    other = executor.execute({"code": "def triple(args):\n    return args['x'] * 3\n"}, {"x": 3})
+    assert other["result"] == 9
+    assert executor.execute(tool, {"x": 5})["result"] == 10
+    assert len(worker.known_code) == 2
+
+    policy = SandboxPolicy(resource=ResourcePolicy(wall_time_limit=1))
+    timed_out = executor.execute({"code": "def spin(args):\n    while True:\n        pass\n"}, {}, policy)
+    assert timed_out["status"] == "timeout"
+    assert worker.process.poll() is not None
+
+    one_shot = SandboxPolicy(security=SecurityPolicy(reuse_workers=False))
+    assert executor.execute(tool, {"x": 1}, one_shot)["status"] == "success"
+    executor.close()
+
+
+def test_worker_exit_detected_while_stdout_held(tmp_path):
+    """Test a worker dying while a grandchild keeps stdout open is not a timeout."""
+    import os
+
+    if not hasattr(os, "pidfd_open"):
+        return
+
+    executor = SandboxExecutor(work_dir=tmp_path)
+    code = (
+        "def leave(args):\n"
+        "    import os, subprocess, sys\n"
+        "    subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(5)'], stdout=sys.__stdout__)\n"
+        "    os._exit(1)\n"
+    )
+    policy = SandboxPolicy(resource=ResourcePolicy(wall_time_limit=4))
+
+    result = executor.execute({"code": code}, {}, policy)
+
+    assert result["status"] == "error"
+    assert "exited with code 1" in result["error"]
+    executor.close()
+
+
+def test_worker_protocol_survives_raw_fd_writes(tmp_path):
+    """Test tools writing straight to fd 1 on a pooled worker do not break its framing."""
+    import time
+
+    executor = SandboxExecutor(work_dir=tmp_path)
+    code = (
+        "import os, subprocess, sys\n"
+        "def raw(args):\n"
+        "    os.write(1, b'raw')\n"
+        "    subprocess.run([sys.executable, '-c', 'print(1)'])\n"
+        "    return 1\n"
+    )
+    policy = SandboxPolicy(resource=ResourcePolicy(wall_time_limit=10))
+
+    start = time.monotonic()
+    results = [executor.execute({"code": code}, {}, policy) for _ in range(2)]
+
+    assert [r["status"] for r in results] == ["success", "success"]
+    assert [r["result"] for r in results] == [1, 1]
+    assert time.monotonic() - start < 5
+    executor.close()
+
+
+def test_one_shot_runner_reads_args_from_stdin(tmp_path):
+    """Test the one-shot path passes arguments to the runner over stdin."""
+    executor = SandboxExecutor(work_dir=tmp_path, pool_size=0)
+    args = {"text": "'''\"\\n" * 1000}
+
+    result = executor.execute({"code": "def echo(args):\n    return args['text']\n"}, args)
+
+    assert result == {"status": "success", "result": args["text"]}
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_worker_handles_payloads_larger_than_pipe_buffer(tmp_path):
+    """Test framed worker messages above 64 KiB arrive intact."""
+    executor = SandboxExecutor(work_dir=tmp_path)
+    text = "x" * (1 << 20)
+
+    result = executor.execute({"code": "def echo(args):\n    return args['text'] * 2\n"}, {"text": text})
+
+    assert result["result"] == text * 2
+    executor.close()
+
+
+def test_workers_preload_allowed_imports(tmp_path):
+    """Test workers import the policy's allowed modules before serving."""
+    executor = SandboxExecutor(work_dir=tmp_path)
+    policy = SandboxPolicy(security=SecurityPolicy(allow_imports={"json", "decimal"}))
+    code = "def loaded(args):\n    import sys\n    return 'decimal' in sys.modules\n"
+
+    assert executor.execute({"code": code}, {}, policy)["result"] is True
+    assert list(executor._pool._idle) == [(512, ("decimal", "json"))]
+    executor.close()
+
+
+def test_stale_work_dir_entries_are_swept(tmp_path):
+    """Test startup removes leftovers older than an hour and keeps recent ones."""
+    import os
+    import time
+
+    stale, recent = tmp_path / "tmpstale", tmp_path / "worker_recent"
+    stale.mkdir()
+    (stale / "out.txt").write_text("left behind")
+    recent.mkdir()
+    old = time.time() - 2 * 3600
+    os.utime(stale, (old, old))
+
+    SandboxExecutor(work_dir=tmp_path, pool_size=0)
+
+    assert list(tmp_path.iterdir()) == [recent]
+
+
+def test_unclosed_executor_stops_workers(tmp_path):
+    """Test pooled workers and their directories go away with the executor."""
+    import gc
+
+    executor = SandboxExecutor(work_dir=tmp_path)
+    executor.execute({"code": "def ok(args):\n    return 1\n"}, {})
+    [[worker]] = executor._pool._idle.values()
+    del executor
+    gc.collect()
+
+    assert worker.process.poll() is not None
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_worker_loads_tool_code_once(tmp_path):
+    """Test workers reuse a tool's function instead of re-executing its code."""
+    executor = SandboxExecutor(work_dir=tmp_path, pool_size=1)
+    # Loading bumps a counter that outlives the tool's namespace
+    code = "import sys\nsys.loads = getattr(sys, 'loads', 0) + 1\ndef count(args):\n    return sys.loads\n"
+    tool = {"code": code}
+
+    results = [executor.execute(tool, {})["result"] for _ in range(3)]
+
+    assert results == [1, 1, 1]
+    executor.close()
+
+
+def test_tool_entrypoint_is_called(tmp_path):
+    """Test the artifact's entrypoint is called rather than the first callable."""
+    code = "def helper(args):\n    return 'helper'\n\ndef run(args):\n    return 'run'\n"
+    tool = {"artifact": {"code": code, "entrypoint": "run"}}
+
+    pooled = SandboxExecutor(work_dir=tmp_path)
+    one_shot = SandboxExecutor(work_dir=tmp_path, pool_size=0)
+
+    assert pooled.execute(tool, {})["result"] == "run"
+    assert one_shot.execute(tool, {})["result"] == "run"
+    assert pooled.execute({"code": code}, {})["result"] == "helper"
+    pooled.close()
+
+
+def test_one_shot_runner_applies_cpu_limit(tmp_path):
+    """Test the one-shot runner limits its own CPU time."""
+    executor = SandboxExecutor(work_dir=tmp_path, pool_size=0)
+    policy = SandboxPolicy(resource=ResourcePolicy(cpu_time_limit=1, wall_time_limit=20))
+
+    result = executor.execute({"code": "def spin(args):\n    while True:\n        pass\n"}, {}, policy)
+
+    assert result["status"] == "error"
+    # Killed by a signal once the limit is reached
+    assert result["error"].startswith("Process exited with code -")
+
+
+def test_ipc_round_trips_json_edge_cases(tmp_path):
+    """Test non-string keys and big integers survive the runner boundary."""
+    executor = SandboxExecutor(work_dir=tmp_path)
+    code = "def echo(args):\n    return {1: args['big'] * 2, 'text': args['text']}\n"
+
+    result = executor.execute({"code": code}, {"big": 2 ** 70, "text": "héllo"})
+
+    assert result["result"] == {"1": 2 ** 71, "text": "héllo"}
+    executor.close()
+
+
+def test_one_shot_result_line_follows_raw_output(tmp_path):
+    """Test output written straight to fd 1 is kept apart from the result."""
+    executor = SandboxExecutor(work_dir=tmp_path, pool_size=0)
+    code = "import os\ndef raw(args):\n    os.write(1, b'RESULT bogus\\nraw\\n')\n    return 'done'\n"
+
+    result = executor.execute({"code": code}, {})
+
+    assert result["status"] == "success"
+    assert result["result"] == "done"
+    assert result["stdout"] == "RESULT bogus\nraw\n"
+
+
+def test_one_shot_result_after_unterminated_output(tmp_path):
+    """Test the result is found after fd 1 output without a trailing newline."""
+    executor = SandboxExecutor(work_dir=tmp_path, pool_size=0)
+    code = "import os\ndef raw(args):\n    os.write(1, b'raw')\n    return 1\n"
+
+    result = executor.execute({"code": code}, {})
+
+    assert result["status"] == "success"
+    assert result["result"] == 1
+    assert result["stdout"] == "raw"
+
+
+def test_execute_async_runs_concurrently(tmp_path):
+    """Test one-shot executions overlap on one event loop."""
+    import asyncio
+    import time
+
+    executor = SandboxExecutor(work_dir=tmp_path, pool_size=0)
+    tool = {"code": "import time\ndef nap(args):\n    time.sleep(0.5)\n    return args['n']\n"}
+
+    async def run_all():
+        return await asyncio.gather(*(executor.execute_async(tool, {"n": n}) for n in range(4)))
+
+    started = time.monotonic()
+    results = asyncio.run(run_all())
+
+    assert [r["result"] for r in results] == [0, 1, 2, 3]
+    assert time.monotonic() - started < 2.0
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_execute_async_uses_worker_pool(tmp_path):
+    """Test pooled async executions return worker results."""
+    import asyncio
+
+    executor = SandboxExecutor(work_dir=tmp_path)
+    tool = {"code": "def double(args):\n    return args['x'] * 2\n"}
+
+    assert asyncio.run(executor.execute_async(tool, {"x": 21}))["result"] == 42
+    executor.close()
+
+
+def test_tools_compiled_with_optimizations(tmp_path):
+    """Test sandboxed tools are compiled like packaged artifacts, without docstrings."""
+    code = 'def documented(args):\n    """Doc."""\n    return documented.__doc__\n'
+
+    for executor in (SandboxExecutor(work_dir=tmp_path), SandboxExecutor(work_dir=tmp_path, pool_size=0)):
+        assert executor.execute({"code": code}, {})["result"] is None
+        executor.close()
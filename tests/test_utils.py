@@ -0,0 +1,124 @@
+"""Tests for utilities."""
+
+import pytest
+
+from evomind.utils.config import Config
+from evomind.utils.retry import CircuitBreaker, RetryPolicy
+from evomind.utils.validators import InputValidator
+
+
+def test_retry_policy_delays():
+    """Test delays grow exponentially, cap at max_delay and jitter within 25%."""
+    policy = RetryPolicy(max_attempts=4, initial_delay=1.0, max_delay=5.0, jitter=False)
+
+    assert [policy.get_delay(i) for i in range(6)] == [1.0, 2.0, 4.0, 5.0, 5.0, 5.0]
+
+    jittered = RetryPolicy(max_attempts=4, initial_delay=1.0)
+    for _ in range(100):
+        assert 1.5 <= jittered.get_delay(1) <= 2.5
+
+
+def test_config_from_env(monkeypatch):
+    """Test environment variables override defaults and secrets stay out of to_dict."""
+    monkeypatch.setenv("EVOMIND_MAX_RETRIES", "7")
+    monkeypatch.setenv("EVOMIND_LOG_STRUCTURED", "True")
+    monkeypatch.delenv("EVOMIND_LLM_API_KEY", raising=False)
+    monkeypatch.setenv("GEMINI_API_KEY", "secret")
+
+    config = Config.from_env()
+
+    assert config.max_retries == 7
+    assert config.log_structured is True
+    assert config.llm_api_key == "secret"
+    assert config.api_port == 8000
+
+    data = config.to_dict()
+    assert "llm_api_key" not in data
+    assert data["max_retries"] == 7
+    assert data["registry_path"] is None
+
+
+def test_sanitize_output_redacts_nested_secrets():
+    """Test secrets are redacted at any depth without touching the input."""
+    data = {"user": "ann", "auth": {"note": "My PASSWORD is x", "depth": {"s": "top Secret"}}, "n": 1}
+
+    sanitized = InputValidator.sanitize_output(data)
+
+    assert sanitized == {"user": "ann", "auth": {"note": "[REDACTED]", "depth": {"s": "[REDACTED]"}}, "n": 1}
+    assert data["auth"]["note"] == "My PASSWORD is x"
+
+    deep = current = {}
+    for _ in range(5000):
+        current["next"] = current = {}
+    current["leak"] = "secret"
+    assert InputValidator.sanitize_output(deep) is not deep
+
+
+def test_sanitize_output_copies_cycles():
+    """Test self-referencing dicts are copied with the same structure."""
+    data = {"token": "secret value"}
+    data["self"] = data
+
+    sanitized = InputValidator.sanitize_output(data)
+
+    assert sanitized["token"] == "[REDACTED]"
+    assert sanitized["self"] is sanitized
+    assert data["token"] == "secret value"
+
+
+def test_validate_size_counts_nested_data():
+    """Test the size check sees the contents of containers."""
+    data = {"blob": ["x" * (1 << 20)] * 3}
+
+    assert InputValidator.validate_size(data, max_size_mb=4)
+    assert not InputValidator.validate_size(data, max_size_mb=2)
+
+
+def test_validate_size_accepts_non_json_keys():
+    """Test keys JSON cannot encode are measured instead of raising."""
+    assert InputValidator.validate_size({(1, 2): "a"})
+    assert not InputValidator.validate_size({(1, 2): "x" * (3 << 20)}, max_size_mb=2)
+
+
+def test_circuit_breaker_ignores_wall_clock(monkeypatch):
+    """Test the breaker times recovery on the monotonic clock."""
+    import time
+
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=60.0)
+    with pytest.raises(ValueError):
+        breaker.call(lambda: (_ for _ in ()).throw(ValueError("boom")))
+    assert breaker.state == "open"
+
+    # A wall clock jump does not reopen the breaker early
+    monkeypatch.setattr(time, "time", lambda: 1e12)
+    with pytest.raises(Exception, match="open"):
+        breaker.call(lambda: 1)
+
+    breaker.last_failure_time -= 61.0
+    assert breaker.call(lambda: 1) == 1
+    assert breaker.state == "closed"
+
+
+def test_config_from_file(tmp_path):
+    """Test configs load from YAML and JSON files."""
+    yaml_path = tmp_path / "config.yaml"
+    yaml_path.write_text("max_retries: 5\nlog_level: DEBUG\n")
+    json_path = tmp_path / "config.json"
+    json_path.write_text('{"api_port": 9000}')
+
+    assert Config.from_file(str(yaml_path)).max_retries == 5
+    assert Config.from_file(str(json_path)).api_port == 9000
+
+
+def test_serialization_round_trip(monkeypatch):
+    """Test both JSON encoders give the same compact bytes."""
+    from evomind.utils import serialization
+
+    value = {"b": [1, 2.5, None], "a": "é"}
+    encoded = serialization.dumps(value, sort_keys=True)
+    assert serialization.loads(serialization.dumps({"big": 2 ** 70})) == {"big": 2 ** 70}
+
+    monkeypatch.setattr(serialization, "ORJSON_AVAILABLE", False)
+    assert serialization.dumps(value, sort_keys=True) == encoded
+    assert serialization.loads(encoded) == value
+    assert serialization.loads(serialization.dumps(value, indent=True)) == value
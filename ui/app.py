@@ -2,6 +2,7 @@
 
 import streamlit as st
 import os
+from itertools import islice
 from pathlib import Path
 import sys
 
@@ -9,10 +10,32 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from evomind.agent.controller import AgentController
-from evomind.llm.gemini_client import GeminiClient
 from evomind.codegen.generator import CodeGenerator
 from evomind.agent.planner import ReActPlanner
 from evomind.utils.config import Config
+from evomind.utils.serialization import dumps
+
+# History entries rendered in full on each rerun; older ones load on request
+HISTORY_PAGE_SIZE = 20
+
+# Most recent tasks and chat messages kept in the session
+HISTORY_LIMIT = 100
+CONVERSATION_LIMIT = 100
+
+
+def to_pretty_json(value):
+    """Pretty-printed JSON of a value, computed once and stored with history entries."""
+    return dumps(value, indent=True, default=str).decode()
+
+
+def render_history_item(number, item):
+    """Render one history entry from its precomputed JSON."""
+    with st.expander(f"Task {number}: {item['task'][:50]}..."):
+        st.write("**Task:**", item['task'])
+        st.write("**Status:**", item['result'].get('status', 'unknown'))
+        # st.code shows the stored text without walking the result again
+        st.code(item.get('result_json') or to_pretty_json(item['result']), language='json')
+
 
 # Page config
 st.set_page_config(
@@ -77,6 +100,9 @@ def initialize_agent(use_llm: bool, api_key: str = None):
     """Initialize the agent with optional LLM."""
     try:
         if use_llm:
+            # Only load the Gemini client when LLM mode is switched on
+            from evomind.llm.gemini_client import GeminiClient
+
             if api_key:
                 os.environ['GEMINI_API_KEY'] = api_key
             st.session_state.llm_client = GeminiClient()
@@ -197,8 +223,10 @@ def main():
                             # Add to history
                             st.session_state.history.append({
                                 "task": task_input,
-                                "result": result
+                                "result": result,
+                                "result_json": to_pretty_json(result)
                             })
+                            del st.session_state.history[:-HISTORY_LIMIT]
                             
                             # Display result
                             if result.get("status") == "success":
@@ -286,6 +314,7 @@ def main():
                                 "role": "assistant",
                                 "content": response
                             })
+                            del st.session_state.conversation[:-CONVERSATION_LIMIT]
                         except Exception as e:
                             st.error(f"Error: {e}")
     
@@ -368,11 +397,19 @@ def main():
         if not st.session_state.history:
             st.info("No execution history yet")
         else:
-            for i, item in enumerate(reversed(st.session_state.history)):
-                with st.expander(f"Task {len(st.session_state.history) - i}: {item['task'][:50]}..."):
-                    st.write("**Task:**", item['task'])
-                    st.write("**Status:**", item['result'].get('status', 'unknown'))
-                    st.json(item['result'])
+            history = st.session_state.history
+            total = len(history)
+
+            # Streamlit reruns the script on every interaction, so only the
+            # latest page is rendered unless older entries are asked for
+            newest = islice(reversed(history), HISTORY_PAGE_SIZE)
+            for i, item in enumerate(newest):
+                render_history_item(total - i, item)
+
+            older = total - HISTORY_PAGE_SIZE
+            if older > 0 and st.checkbox(f"Show {older} older tasks"):
+                for i, item in enumerate(islice(reversed(history), HISTORY_PAGE_SIZE, None)):
+                    render_history_item(older - i, item)
 
 if __name__ == "__main__":
     main()